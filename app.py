@@ -4,28 +4,54 @@ Natalies Rezept-Tagebuch - Backend API
 Python Flask Server with SQLAlchemy ORM (PostgreSQL/SQLite)
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, stream_with_context
+import click
 from flask_cors import CORS
 import os
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 import uuid
-import requests
-import shutil
 import json
-import re
-import subprocess
 
 # Import SQLAlchemy models and config
-from models import db, User, Recipe, Todo, DiaryEntry
-from config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, SQLALCHEMY_ENGINE_OPTIONS, UPLOAD_FOLDER, TESTING_MODE
+from models import db, User, Recipe, RecipeIngredient, RecipeStats, Todo, DiaryEntry
+from serializers import (
+    USER, RECIPE, RECIPE_DETAIL, RECIPE_SUMMARY, TODO, DIARY_ENTRY,
+    RECIPE_STATS_JOIN, RECIPE_AVG_RATING
+)
+from json_provider import FastJSONProvider
+from compression import init_compression
+from conditional import conditional_get, recipes_fingerprint, diary_fingerprint, todos_fingerprint
+from cache import cached, invalidate, init_cache
+from metrics import init_metrics, metrics_available, render_metrics
+from db_pool import engine_options, init_db_pool
+from db_routing import init_db_routing, replica_read
+from query_profiler import init_query_profiler
+from sampling_profiler import init_profiler
+from media_fetcher import init_media_fetcher
+from background_jobs import init_background_jobs
+from ingredients import normalize_name, parse_ingredients
+from notes_parser import parse_notes
+from stats import load_dashboard, install_stats_triggers, rebuild_stats, init_stats
+from build_info import load_build_info, get_app_version
+from config_registry import get_config, validate_configs
+from data_transfer import export_stream, import_archive, ImportArchiveError, EXPORT_MIMETYPES
+from config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, UPLOAD_FOLDER, TESTING_MODE, BULK_MAX_ITEMS, PROFILER_DIR
 
 app = Flask(__name__, static_folder='.', static_url_path='')
+app.json = FastJSONProvider(app)
 CORS(app)
+init_compression(app)
+init_cache(app)
+init_metrics(app)
+init_query_profiler(app)
+init_profiler(app)
 
 # Configure SQLAlchemy
 app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = SQLALCHEMY_TRACK_MODIFICATIONS
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = SQLALCHEMY_ENGINE_OPTIONS
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+init_db_pool(app)
+init_db_routing(app)
 
 # Initialize SQLAlchemy
 db.init_app(app)
@@ -33,6 +59,21 @@ db.init_app(app)
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Job records in the database (polls may hit any worker)
+init_background_jobs(app)
+
+# Image downloads of imported recipes (after the recipe is committed)
+init_media_fetcher(app)
+
+# Fold statistics counter deltas in the background
+init_stats(app)
+
+# Resolve version/build info once per worker (git fallback forks only here)
+load_build_info()
+
+# Fail fast on broken import configs instead of mid-import
+validate_configs()
+
 if TESTING_MODE:
     print("🧪 TESTING MODE: Using test database")
 
@@ -42,6 +83,7 @@ def init_db():
     with app.app_context():
         # Create all tables
         db.create_all()
+        install_stats_triggers()
 
         # Seed initial users if none exist
         if User.query.count() == 0:
@@ -88,20 +130,31 @@ def init_db():
 def index():
     return send_from_directory('.', 'index.html')
 
+@cached('config')
+def load_recipe_format_config():
+    """Raw bytes of the recipe format config (served unchanged)"""
+    config_path = os.path.join(os.path.dirname(__file__), 'config/shared/recipe-format-config.json')
+    with open(config_path, 'rb') as f:
+        return f.read()
+
 @app.route('/api/recipe-format-config.json')
 def recipe_format_config():
-    return send_from_directory('config/shared', 'recipe-format-config.json')
+    return app.response_class(load_recipe_format_config(), mimetype='application/json')
 
 # ============================================================================
 # User API Endpoints
 # ============================================================================
 
+@cached('users')
+def load_users():
+    users = USER.query().order_by(User.created_at.asc()).all()
+    return USER.many(users)
+
 @app.route('/api/users', methods=['GET'])
 def get_users():
     """Get all users (for profile selection)"""
     try:
-        users = User.query.order_by(User.created_at.asc()).all()
-        return jsonify([user.to_dict() for user in users]), 200
+        return jsonify(load_users()), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -130,6 +183,7 @@ def create_user():
         )
         db.session.add(user)
         db.session.commit()
+        invalidate('users')
 
         return jsonify(user.to_dict()), 201
     except Exception as e:
@@ -164,6 +218,7 @@ def update_user(user_id):
             user.avatar_color = data['avatar_color']
 
         db.session.commit()
+        invalidate('users', 'recipes', 'stats')
         return jsonify(user.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -188,35 +243,160 @@ def delete_user(user_id):
 
         db.session.delete(user)
         db.session.commit()
+        invalidate('users')
         return jsonify({'message': 'User deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# ============================================================================
+# Bulk Writes (offline sync, meal-planning tools)
+# ============================================================================
+# One request, one user lookup, one multi-row INSERT ... RETURNING, one commit.
+# Invalid items are reported per index and skipped; the valid ones are inserted.
+
+def _bulk_items(key):
+    """Item list from {"<key>": [...]} (or a bare list) -> (items, error_response)"""
+    data = request.get_json(silent=True)
+    items = data.get(key) if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': f'{key} must be a non-empty list'}), 400)
+    if len(items) > BULK_MAX_ITEMS:
+        return None, (jsonify({'error': f'At most {BULK_MAX_ITEMS} {key} per request'}), 400)
+    return items, None
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_optional(value, *types):
+    return value is None or (isinstance(value, types) and not isinstance(value, bool))
+
+def _existing_ids(model, ids):
+    """Subset of ids present in model's table (single IN query)"""
+    if not ids:
+        return set()
+    return {row_id for (row_id,) in db.session.query(model.id).filter(model.id.in_(ids))}
+
+def _bulk_response(created, errors):
+    """201 all created, 207 partially created, 400 nothing created"""
+    status = 400 if not created else (207 if errors else 201)
+    return jsonify({'created': created, 'errors': errors}), status
+
 # ============================================================================
 # Recipe API Endpoints
 # ============================================================================
 
+# ?sort= options for the recipe list (recipe_stats, see stats.py)
+RECIPE_SORTS = {
+    'most_cooked': (db.func.coalesce(RecipeStats.cook_count, 0).desc(),),
+    'top_rated': (RECIPE_AVG_RATING.desc().nulls_last(), db.func.coalesce(RecipeStats.rating_count, 0).desc()),
+    'recently_cooked': (RecipeStats.last_cooked.desc().nulls_last(),),
+}
+
+@cached('recipes')
+def load_recipes(search=None, view=None, sort=None):
+    """
+    All recipes with user info, newest first (optional title/notes search)
+
+    view='summary' omits the long notes text (cards/dropdowns only need title,
+    image and metadata) and adds cook_count / avg_rating / last_cooked.
+    sort: one of RECIPE_SORTS, ties newest first.
+    """
+    serializer = RECIPE_SUMMARY if view == 'summary' else RECIPE
+    query = serializer.query()
+    if sort and RECIPE_STATS_JOIN not in serializer.joins:
+        query = query.outerjoin(*RECIPE_STATS_JOIN)
+
+    if search:
+        search_term = f'%{search}%'
+        query = query.filter(
+            db.or_(
+                Recipe.title.ilike(search_term),
+                Recipe.notes.ilike(search_term)
+            )
+        )
+
+    recipes = query.order_by(*RECIPE_SORTS.get(sort, ()), Recipe.created_at.desc()).all()
+    return serializer.many(recipes)
+
 @app.route('/api/recipes', methods=['GET'])
+@replica_read
+@conditional_get(recipes_fingerprint)
 def get_recipes():
     """Get all recipes (including user info)"""
     try:
         # Optional: Search by title or notes
         search = request.args.get('search')
+        view = request.args.get('view')
+        sort = request.args.get('sort')
+        if sort and sort not in RECIPE_SORTS:
+            return jsonify({'error': f"sort must be one of: {', '.join(RECIPE_SORTS)}"}), 400
+        return jsonify(load_recipes(search, view, sort))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        query = Recipe.query
+@app.route('/api/recipes/by-ingredients', methods=['GET'])
+@replica_read
+def get_recipes_by_ingredients():
+    """
+    "What can I cook?" - rank recipes by how many of the given ingredients they use
 
-        if search:
-            search_term = f'%{search}%'
-            query = query.filter(
-                db.or_(
-                    Recipe.title.ilike(search_term),
-                    Recipe.notes.ilike(search_term)
-                )
-            )
+    Query: ?ingredients=mehl,eier,milch&limit=20
 
-        recipes = query.order_by(Recipe.created_at.desc()).all()
-        return jsonify([recipe.to_dict() for recipe in recipes])
+    Answered from recipe_ingredients via the (name, recipe_id) index: candidates
+    are the recipes containing any of the names, ranked by matched count, then by
+    fewest missing ingredients.
+    """
+    try:
+        names = sorted({
+            normalize_name(name) for name in request.args.get('ingredients', '').split(',')
+        } - {''})
+        if not names:
+            return jsonify({'error': 'ingredients is required (comma-separated)'}), 400
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+
+        candidates = db.session.query(RecipeIngredient.recipe_id).filter(
+            RecipeIngredient.name.in_(names)
+        )
+        matched = db.func.count(db.distinct(
+            db.case((RecipeIngredient.name.in_(names), RecipeIngredient.name))
+        ))
+        total = db.func.count(db.distinct(RecipeIngredient.name))
+
+        ranking = db.session.query(RecipeIngredient.recipe_id, matched, total).filter(
+            RecipeIngredient.recipe_id.in_(candidates)
+        ).group_by(RecipeIngredient.recipe_id).order_by(
+            matched.desc(), (total - matched).asc(), RecipeIngredient.recipe_id.desc()
+        ).limit(limit).all()
+
+        if not ranking:
+            return jsonify([])
+
+        recipe_ids = [recipe_id for recipe_id, _, _ in ranking]
+        matched_names = {}
+        for recipe_id, name in db.session.query(RecipeIngredient.recipe_id, RecipeIngredient.name).filter(
+            RecipeIngredient.name.in_(names),
+            RecipeIngredient.recipe_id.in_(recipe_ids)
+        ).distinct():
+            matched_names.setdefault(recipe_id, []).append(name)
+
+        recipes = {
+            recipe['id']: recipe
+            for recipe in RECIPE_SUMMARY.many(RECIPE_SUMMARY.query().filter(Recipe.id.in_(recipe_ids)))
+        }
+
+        result = []
+        for recipe_id, matched_count, total_count in ranking:
+            recipe = recipes.get(recipe_id)
+            if recipe is None:
+                continue
+            recipe['matched_ingredients'] = sorted(matched_names.get(recipe_id, []))
+            recipe['matched'] = matched_count
+            recipe['missing'] = total_count - matched_count
+            recipe['coverage'] = round(matched_count / len(names), 3)
+            result.append(recipe)
+
+        return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -247,8 +427,87 @@ def create_recipe():
         )
         db.session.add(recipe)
         db.session.commit()
+        invalidate('recipes', 'stats')
 
-        return jsonify(recipe.to_dict()), 201
+        return jsonify(RECIPE_DETAIL.get(Recipe.id, recipe.id)), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recipes/bulk', methods=['POST'])
+def create_recipes_bulk():
+    """
+    Create many recipes in one transaction
+
+    Request Body:
+        {"recipes": [{"title": "...", "user_id": 1, "notes": "...", ...}, ...]}
+
+    Returns:
+        {"created": [{"index": 0, "id": 42}, ...], "errors": [{"index": 3, "error": "..."}]}
+    """
+    items, error_response = _bulk_items('recipes')
+    if error_response:
+        return error_response
+
+    try:
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'error': 'Item must be an object'})
+            elif not _is_int(item.get('user_id')):
+                errors.append({'index': index, 'error': 'user_id is required'})
+            elif not isinstance(item.get('title'), str) or not item['title'].strip():
+                errors.append({'index': index, 'error': 'title is required'})
+            elif not all(_is_optional(item.get(field), str) for field in ('image', 'notes')):
+                errors.append({'index': index, 'error': 'image and notes must be strings'})
+            elif not _is_optional(item.get('duration'), int, float) or not _is_optional(item.get('rating'), int):
+                errors.append({'index': index, 'error': 'duration/rating must be numbers'})
+            else:
+                valid.append((index, item))
+
+        users = _existing_ids(User, {item['user_id'] for _, item in valid})
+        rows = []
+        indexes = []
+        for index, item in valid:
+            if item['user_id'] not in users:
+                errors.append({'index': index, 'error': 'User not found'})
+                continue
+            # Bulk INSERT bypasses the Recipe.notes validator - parse explicitly
+            parsed = parse_notes(item.get('notes'))
+            rows.append({
+                'title': item['title'],
+                'image': item.get('image'),
+                'notes': item.get('notes'),
+                'duration': item.get('duration'),
+                'rating': item.get('rating'),
+                'user_id': item['user_id'],
+                'notes_steps': parsed['steps'] if parsed else None,
+                'notes_ingredients': parsed['ingredients'] if parsed else None,
+                'notes_metadata': parsed['metadata'] if parsed else None,
+            })
+            indexes.append(index)
+
+        created = []
+        if rows:
+            ids = db.session.scalars(
+                db.insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True), rows
+            ).all()
+
+            ingredient_rows = [
+                {'recipe_id': recipe_id, 'position': position, **ingredient}
+                for recipe_id, row in zip(ids, rows)
+                for position, ingredient in enumerate(parse_ingredients(row['notes_ingredients']))
+            ]
+            if ingredient_rows:
+                db.session.execute(db.insert(RecipeIngredient), ingredient_rows)
+
+            db.session.commit()
+            invalidate('recipes', 'stats')
+            created = [{'index': index, 'id': recipe_id} for index, recipe_id in zip(indexes, ids)]
+
+        errors.sort(key=lambda error: error['index'])
+        return _bulk_response(created, errors)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -257,10 +516,10 @@ def create_recipe():
 def get_recipe(recipe_id):
     """Get a single recipe"""
     try:
-        recipe = Recipe.query.get(recipe_id)
+        recipe = RECIPE_DETAIL.get(Recipe.id, recipe_id)
         if not recipe:
             return jsonify({'error': 'Recipe not found'}), 404
-        return jsonify(recipe.to_dict())
+        return jsonify(recipe)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -296,7 +555,8 @@ def update_recipe(recipe_id):
         recipe.updated_at = datetime.utcnow()
 
         db.session.commit()
-        return jsonify(recipe.to_dict())
+        invalidate('recipes', 'stats')
+        return jsonify(RECIPE_DETAIL.get(Recipe.id, recipe.id))
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -332,6 +592,7 @@ def delete_recipe(recipe_id):
 
         db.session.delete(recipe)
         db.session.commit()
+        invalidate('recipes', 'stats')
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
@@ -361,17 +622,16 @@ def get_image(filename):
     """Get an image"""
     return send_from_directory(UPLOAD_FOLDER, filename)
 
+@cached('stats')
+def load_stats():
+    return load_dashboard()
+
 @app.route('/api/stats', methods=['GET'])
+@replica_read
 def get_stats():
-    """Get statistics"""
+    """Get statistics (precomputed counters, see stats.py)"""
     try:
-        total = Recipe.query.count()
-        with_images = Recipe.query.filter(Recipe.image.isnot(None)).count()
-
-        return jsonify({
-            'total_recipes': total,
-            'recipes_with_images': with_images
-        })
+        return jsonify(load_stats())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -380,11 +640,12 @@ def get_stats():
 # ============================================================================
 
 @app.route('/api/todos', methods=['GET'])
+@conditional_get(todos_fingerprint)
 def get_todos():
     """Get all TODOs, grouped by priority"""
     try:
-        todos = Todo.query.order_by(Todo.priority.asc(), Todo.id.asc()).all()
-        return jsonify([todo.to_dict() for todo in todos])
+        todos = TODO.query().order_by(Todo.priority.asc(), Todo.id.asc()).all()
+        return jsonify(TODO.many(todos))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -456,6 +717,8 @@ def delete_todo(todo_id):
 # ============================================================================
 
 @app.route('/api/diary', methods=['GET'])
+@replica_read
+@conditional_get(diary_fingerprint)
 def get_diary_entries():
     """Get diary entries for current user"""
     try:
@@ -463,15 +726,15 @@ def get_diary_entries():
         user_id = request.args.get('user_id', type=int)
         search = request.args.get('search')
 
-        query = DiaryEntry.query
+        # Recipe is already LEFT JOINed for recipe_title/recipe_image
+        query = DIARY_ENTRY.query()
 
         # Filter by user_id (required)
         if user_id:
-            query = query.filter_by(user_id=user_id)
+            query = query.filter(DiaryEntry.user_id == user_id)
 
         if search:
             search_term = f'%{search}%'
-            query = query.join(Recipe, DiaryEntry.recipe_id == Recipe.id, isouter=True)
             query = query.filter(
                 db.or_(
                     DiaryEntry.dish_name.ilike(search_term),
@@ -481,32 +744,7 @@ def get_diary_entries():
             )
 
         entries = query.order_by(DiaryEntry.date.desc(), DiaryEntry.created_at.desc()).all()
-
-        # Convert to dict and parse images JSON
-        result = []
-        for entry in entries:
-            entry_dict = entry.to_dict()
-
-            # Add recipe info
-            if entry.recipe:
-                entry_dict['recipe_title'] = entry.recipe.title
-                entry_dict['recipe_image'] = entry.recipe.image
-            else:
-                entry_dict['recipe_title'] = None
-                entry_dict['recipe_image'] = None
-
-            # Parse images JSON
-            if entry_dict['images']:
-                try:
-                    entry_dict['images'] = json.loads(entry_dict['images'])
-                except:
-                    entry_dict['images'] = []
-            else:
-                entry_dict['images'] = []
-
-            result.append(entry_dict)
-
-        return jsonify(result)
+        return jsonify(DIARY_ENTRY.many(entries))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -530,26 +768,83 @@ def create_diary_entry():
         )
         db.session.add(entry)
         db.session.commit()
+        invalidate('stats')
 
         # Return entry with recipe data
-        entry_dict = entry.to_dict()
-        if entry.recipe:
-            entry_dict['recipe_title'] = entry.recipe.title
-            entry_dict['recipe_image'] = entry.recipe.image
-        else:
-            entry_dict['recipe_title'] = None
-            entry_dict['recipe_image'] = None
-
-        # Parse images JSON
-        if entry_dict['images']:
+        return jsonify(DIARY_ENTRY.get(DiaryEntry.id, entry.id)), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/diary/bulk', methods=['POST'])
+def create_diary_entries_bulk():
+    """
+    Create many diary entries in one transaction
+
+    Request Body:
+        {"entries": [{"date": "2026-10-19", "user_id": 1, "recipe_id": 5, "dish_name": "...", ...}, ...]}
+
+    Returns:
+        {"created": [{"index": 0, "id": 42}, ...], "errors": [{"index": 3, "error": "..."}]}
+    """
+    items, error_response = _bulk_items('entries')
+    if error_response:
+        return error_response
+
+    try:
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'error': 'Item must be an object'})
+                continue
             try:
-                entry_dict['images'] = json.loads(entry_dict['images'])
-            except:
-                entry_dict['images'] = []
-        else:
-            entry_dict['images'] = []
+                entry_date = datetime.fromisoformat(item['date']).date()
+            except (KeyError, TypeError, ValueError):
+                errors.append({'index': index, 'error': 'date is required (YYYY-MM-DD)'})
+                continue
+            if not all(_is_optional(item.get(field), int) for field in ('user_id', 'recipe_id', 'rating')):
+                errors.append({'index': index, 'error': 'user_id/recipe_id/rating must be integers'})
+            elif not all(_is_optional(item.get(field), str) for field in ('dish_name', 'notes')):
+                errors.append({'index': index, 'error': 'dish_name and notes must be strings'})
+            elif not isinstance(item.get('images', []), list):
+                errors.append({'index': index, 'error': 'images must be a list'})
+            else:
+                valid.append((index, item, entry_date))
+
+        users = _existing_ids(User, {item['user_id'] for _, item, _ in valid if item.get('user_id')})
+        recipes = _existing_ids(Recipe, {item['recipe_id'] for _, item, _ in valid if item.get('recipe_id')})
+        rows = []
+        indexes = []
+        for index, item, entry_date in valid:
+            if item.get('user_id') and item['user_id'] not in users:
+                errors.append({'index': index, 'error': 'User not found'})
+                continue
+            if item.get('recipe_id') and item['recipe_id'] not in recipes:
+                errors.append({'index': index, 'error': 'Recipe not found'})
+                continue
+            rows.append({
+                'recipe_id': item.get('recipe_id'),
+                'user_id': item.get('user_id'),
+                'date': entry_date,
+                'notes': item.get('notes'),
+                'images': json.dumps(item.get('images', [])),
+                'dish_name': item.get('dish_name'),
+                'rating': item.get('rating'),
+            })
+            indexes.append(index)
 
-        return jsonify(entry_dict), 201
+        created = []
+        if rows:
+            ids = db.session.scalars(
+                db.insert(DiaryEntry).returning(DiaryEntry.id, sort_by_parameter_order=True), rows
+            ).all()
+            db.session.commit()
+            invalidate('stats')
+            created = [{'index': index, 'id': entry_id} for index, entry_id in zip(indexes, ids)]
+
+        errors.sort(key=lambda error: error['index'])
+        return _bulk_response(created, errors)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -558,30 +853,11 @@ def create_diary_entry():
 def get_diary_entry(entry_id):
     """Get a single diary entry"""
     try:
-        entry = DiaryEntry.query.get(entry_id)
+        entry = DIARY_ENTRY.get(DiaryEntry.id, entry_id)
         if not entry:
             return jsonify({'error': 'Entry not found'}), 404
 
-        entry_dict = entry.to_dict()
-
-        # Add recipe info
-        if entry.recipe:
-            entry_dict['recipe_title'] = entry.recipe.title
-            entry_dict['recipe_image'] = entry.recipe.image
-        else:
-            entry_dict['recipe_title'] = None
-            entry_dict['recipe_image'] = None
-
-        # Parse images JSON
-        if entry_dict['images']:
-            try:
-                entry_dict['images'] = json.loads(entry_dict['images'])
-            except:
-                entry_dict['images'] = []
-        else:
-            entry_dict['images'] = []
-
-        return jsonify(entry_dict)
+        return jsonify(entry)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -612,26 +888,10 @@ def update_diary_entry(entry_id):
         entry.updated_at = datetime.utcnow()
 
         db.session.commit()
+        invalidate('stats')
 
         # Return updated entry with recipe data
-        entry_dict = entry.to_dict()
-        if entry.recipe:
-            entry_dict['recipe_title'] = entry.recipe.title
-            entry_dict['recipe_image'] = entry.recipe.image
-        else:
-            entry_dict['recipe_title'] = None
-            entry_dict['recipe_image'] = None
-
-        # Parse images JSON
-        if entry_dict['images']:
-            try:
-                entry_dict['images'] = json.loads(entry_dict['images'])
-            except:
-                entry_dict['images'] = []
-        else:
-            entry_dict['images'] = []
-
-        return jsonify(entry_dict)
+        return jsonify(DIARY_ENTRY.get(DiaryEntry.id, entry.id))
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -657,6 +917,7 @@ def delete_diary_entry(entry_id):
 
         db.session.delete(entry)
         db.session.commit()
+        invalidate('stats')
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
@@ -668,31 +929,24 @@ def delete_diary_entry(entry_id):
 
 @app.route('/api/version')
 def get_version():
-    """Get current app version (from Git tag or env var)"""
-    version = os.environ.get('APP_VERSION', None)
-
-    # If no ENV var, try to read from Git
-    if not version:
-        try:
-            result = subprocess.run(
-                ['git', 'describe', '--tags', '--exact-match'],
-                cwd='/app',
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-        except:
-            pass
-
-    # Fallback
-    if not version:
-        version = "unknown"
-
-    return jsonify({'version': version})
+    """Get current app version (resolved once at startup, see build_info.py)"""
+    return jsonify({'version': get_app_version()})
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint (all gunicorn workers, see metrics.py)"""
+    if not metrics_available():
+        return jsonify({'error': 'Metrics disabled'}), 503
+    body, content_type = render_metrics()
+    return app.response_class(body, content_type=content_type)
+
+@app.route('/api/build-info')
+def get_build_info():
+    """Version, git SHA, build time and dependency versions (no subprocess at request time)"""
+    return jsonify(load_build_info())
 
 @app.route('/api/search')
+@replica_read
 def global_search():
     """Global search across recipes, diary and TODOs"""
     try:
@@ -794,380 +1048,123 @@ def global_search():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# ============================================================================
-# TheMealDB Daily Import
-# ============================================================================
-
-THEMEALDB_API = 'https://www.themealdb.com/api/json/v1/1'
-THEMEALDB_CONFIG_FILE = 'config/shared/themealdb-config.json'
-DEEPL_API_KEY = os.getenv('DEEPL_API_KEY', '')
-DEEPL_API_URL = 'https://api-free.deepl.com/v2/translate'
-
-def load_themealdb_config():
-    """Load TheMealDB import configuration"""
-    try:
-        config_path = os.path.join(os.path.dirname(__file__), THEMEALDB_CONFIG_FILE)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            return config['themealdb_import_config']
-    except Exception as e:
-        print(f"Warning: Could not load TheMealDB config: {e}")
-        # Return default config
-        return {
-            'api_base_url': THEMEALDB_API,
-            'default_strategy': 'random',
-            'strategies': {
-                'random': {
-                    'endpoint': 'random.php',
-                    'requires_parameter': False
-                }
-            }
-        }
-
-def fetch_recipe_from_themealdb(strategy='random', value=None):
+@app.route('/api/export')
+def export_data():
     """
-    Fetch recipe from TheMealDB using specified strategy
+    Stream recipes + diary entries as NDJSON or ZIP (with images)
 
-    Args:
-        strategy: Import strategy (random, by_category, by_area, by_ingredient, etc.)
-        value: Value for the strategy filter (e.g., "Italian" for by_area)
+    Query Parameters:
+        user_id: Only this user's data (default: everything)
+        format: ndjson (default) | zip
 
-    Returns:
-        dict: Recipe data from TheMealDB or None if error
+    Rows are read through server-side cursors and written out as they arrive,
+    so memory stays flat regardless of history size. For very large backups
+    use `flask --app app export-data` (not bound by the gunicorn timeout).
     """
-    config = load_themealdb_config()
-    api_base = config.get('api_base_url', THEMEALDB_API)
-
-    # Get strategy config
-    strategies = config.get('strategies', {})
-    strategy_config = strategies.get(strategy)
-
-    if not strategy_config:
-        print(f"Warning: Unknown strategy '{strategy}', falling back to random")
-        strategy = 'random'
-        strategy_config = strategies.get('random', {
-            'endpoint': 'random.php',
-            'requires_parameter': False
-        })
-
-    endpoint = strategy_config.get('endpoint')
-    requires_param = strategy_config.get('requires_parameter', False)
-
-    # Build URL
-    url = f"{api_base}/{endpoint}"
+    user_id = request.args.get('user_id', type=int)
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_MIMETYPES)}"}), 400
+    if user_id and not db.session.get(User, user_id):
+        return jsonify({'error': 'User not found'}), 404
+
+    filename = f"rezept-tagebuch-{user_id or 'all'}-{date.today().isoformat()}.{fmt}"
+    return app.response_class(
+        stream_with_context(export_stream(user_id, fmt)),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/api/import', methods=['POST'])
+def import_data():
+    """
+    Import an export archive (NDJSON or ZIP from /api/export)
 
-    if requires_param:
-        param_key = strategy_config.get('parameter_key')
+    Body: multipart field "file", or the raw archive with
+    Content-Type application/x-ndjson / application/zip.
 
-        # If no value provided, use default or random from available values
-        if not value:
-            default_values = strategy_config.get('default_values', [])
-            available_values = strategy_config.get('available_values', [])
+    Query Parameters:
+        user_id: Assign all imported data to this user (default: match users by email)
 
-            if default_values:
-                import random
-                value = random.choice(default_values)
-            elif available_values:
-                import random
-                value = random.choice(available_values)
-            else:
-                print(f"Error: Strategy '{strategy}' requires a value but none provided")
-                return None
+    Returns:
+        Counters: recipes, diary_entries, ingredients, images_written, images_deduplicated, ...
+    """
+    target_user_id = request.args.get('user_id', type=int)
+    if target_user_id and not db.session.get(User, target_user_id):
+        return jsonify({'error': 'User not found'}), 404
 
-        url = f"{url}?{param_key}={value}"
-        print(f"🔍 TheMealDB Import: strategy={strategy}, {param_key}={value}")
+    upload = request.files.get('file')
+    if upload:
+        source, fmt = upload.stream, None
     else:
-        print(f"🔍 TheMealDB Import: strategy={strategy}")
+        source, fmt = request.stream, 'zip' if request.mimetype == 'application/zip' else 'ndjson'
 
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data.get('meals'):
-            print(f"No recipes found for {strategy}={value}")
-            return None
-
-        # For filter endpoints, we get a list - pick random one and fetch full details
-        meals = data['meals']
-
-        # If we got abbreviated results (from filter.php), fetch full recipe details
-        if 'strInstructions' not in meals[0]:
-            import random
-            selected_meal = random.choice(meals)
-            meal_id = selected_meal['idMeal']
-
-            print(f"📖 Fetching full recipe details for ID {meal_id}")
-            detail_url = f"{api_base}/lookup.php?i={meal_id}"
-            detail_response = requests.get(detail_url, timeout=10)
-            detail_response.raise_for_status()
-            detail_data = detail_response.json()
-
-            if detail_data.get('meals'):
-                return detail_data['meals'][0]
-            else:
-                return None
-        else:
-            # Already have full recipe (from random.php or search.php)
-            return meals[0]
-
+        result = import_archive(source, target_user_id, fmt)
+    except ImportArchiveError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"Error fetching from TheMealDB: {e}")
-        return None
-
-def translate_to_german(text):
-    """Translate text from English to German using DeepL API (single text)"""
-    if not DEEPL_API_KEY:
-        print("Warning: No DeepL API key configured, skipping translation")
-        return text
-
-    if not text or text.strip() == '':
-        return text
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
-    try:
-        response = requests.post(DEEPL_API_URL, data={
-            'auth_key': DEEPL_API_KEY,
-            'text': text,
-            'source_lang': 'EN',
-            'target_lang': 'DE'
-        }, timeout=10)
-
-        response.raise_for_status()
-        result = response.json()
-
-        if 'translations' in result and len(result['translations']) > 0:
-            return result['translations'][0]['text']
-        else:
-            print(f"DeepL translation failed: {result}")
-            return text
+    invalidate('users', 'recipes', 'stats')
+    return jsonify(result), 201
 
-    except Exception as e:
-        print(f"DeepL translation error: {e}")
-        return text  # Fallback to original text
+# ============================================================================
+# TheMealDB Daily Import
+# ============================================================================
 
-def translate_batch_to_german(texts):
+def enqueue_import(job_type, params, worker, message):
     """
-    Translate multiple texts in one DeepL API call (OPTIMIZED)
+    Run an import as background job instead of inside the web worker
 
-    Args:
-        texts: List of strings to translate
-
-    Returns:
-        List of translated strings (same order as input)
-        Falls back to original texts on error
+    ?wait=N blocks up to N seconds (max JOB_MAX_WAIT_SECONDS) for the
+    result: finished jobs answer like the former synchronous endpoint
+    (plus job_id), everything else with 202 and the poll_url.
     """
-    if not DEEPL_API_KEY:
-        print("Warning: No DeepL API key configured, skipping translation")
-        return texts
-
-    if not texts:
-        return []
-
-    # Filter out empty texts but remember positions
-    filtered_texts = []
-    text_indices = []
-    for i, text in enumerate(texts):
-        if text and text.strip():
-            filtered_texts.append(text)
-            text_indices.append(i)
-
-    if not filtered_texts:
-        return texts
+    job_id = create_job(job_type, params)
+    run_job_in_background(job_id, worker, app.app_context())
+    job = wait_for_job(job_id, parse_wait(request.args.get('wait')))
+    status, payload = job_response(job, message)
+    return jsonify(payload), status
 
-    try:
-        # Build request data - DeepL accepts multiple 'text' parameters
-        data = {
-            'auth_key': DEEPL_API_KEY,
-            'source_lang': 'EN',
-            'target_lang': 'DE'
-        }
-
-        # Add each text as separate 'text' parameter
-        request_data = []
-        for key, value in data.items():
-            request_data.append((key, value))
-        for text in filtered_texts:
-            request_data.append(('text', text))
-
-        # Batch translation with longer timeout (more data)
-        response = requests.post(DEEPL_API_URL, data=request_data, timeout=30)
-        response.raise_for_status()
-        result = response.json()
-
-        if 'translations' in result and len(result['translations']) == len(filtered_texts):
-            # Reconstruct results with original positions
-            translated = list(texts)  # Start with original
-            for i, translation in enumerate(result['translations']):
-                original_index = text_indices[i]
-                translated[original_index] = translation['text']
-            return translated
-        else:
-            print(f"DeepL batch translation failed: {result}")
-            return texts  # Fallback to original
-
-    except Exception as e:
-        print(f"DeepL batch translation error: {e}")
-        return texts  # Fallback to original
 
 @app.route('/api/recipes/daily-import', methods=['POST'])
 def daily_recipe_import():
     """
-    Import a recipe from TheMealDB with configurable strategy
+    Import a recipe from TheMealDB with configurable strategy (background job)
 
     Query Parameters:
         strategy (str): Import strategy (random, by_category, by_area, by_ingredient, etc.)
         value (str): Value for the strategy (e.g., "Italian" for by_area)
+        wait (int): Seconds to wait for the result (optional, see enqueue_import)
 
     Examples:
         POST /api/recipes/daily-import
         POST /api/recipes/daily-import?strategy=random
-        POST /api/recipes/daily-import?strategy=by_category&value=Vegetarian
+        POST /api/recipes/daily-import?strategy=by_category&value=Vegetarian&wait=60
         POST /api/recipes/daily-import?strategy=by_area&value=Italian
         POST /api/recipes/daily-import?strategy=by_ingredient&value=chicken
+
+    Returns:
+        202 {"job_id": "uuid", "status": "pending", "poll_url": "/api/jobs/<id>"}
+        or with wait: the import result (200), rejection (400), nothing found (404)
     """
     try:
-        # Get import strategy from query parameters
-        config = load_themealdb_config()
-        strategy = request.args.get('strategy', config.get('default_strategy', 'random'))
-        value = request.args.get('value', None)
-
-        # 1. Fetch recipe from TheMealDB using configured strategy
-        meal = fetch_recipe_from_themealdb(strategy=strategy, value=value)
-
-        if not meal:
-            return jsonify({'error': 'No recipe found for the given criteria'}), 404
-
-        # 1a. Validate category: Only allow meat-free recipes
-        category = meal.get('strCategory', '')
-        MEAT_FREE_CATEGORIES = ['Vegetarian', 'Vegan', 'Dessert', 'Breakfast', 'Pasta', 'Side', 'Starter', 'Miscellaneous']
-        MEAT_CATEGORIES = ['Beef', 'Chicken', 'Lamb', 'Pork', 'Goat', 'Seafood']
-
-        if category in MEAT_CATEGORIES:
-            print(f"⚠️ Import rejected: Category '{category}' contains meat/seafood")
-            return jsonify({
-                'error': f'Recipe category "{category}" contains meat/seafood. Only vegetarian recipes allowed.',
-                'rejected_category': category,
-                'rejected_title': meal.get('strMeal')
-            }), 400
-
-        # 2. Parse recipe data in ENGLISH first (before translation)
-        original_title = meal.get('strMeal', 'Imported Recipe')
-        original_instructions = meal.get('strInstructions', '')
-
-        # Parse ingredients in English
-        ingredients_en = []
-        for i in range(1, 21):
-            ingredient = meal.get(f'strIngredient{i}', '').strip()
-            measure = meal.get(f'strMeasure{i}', '').strip()
-            if ingredient:
-                ing_en = f"{measure} {ingredient}".strip()
-                ingredients_en.append(ing_en)
-
-        # 3. BATCH TRANSLATE everything in ONE API call (OPTIMIZED!)
-        # Build list: [title, instructions, ingredient1, ingredient2, ...]
-        texts_to_translate = [original_title, original_instructions] + ingredients_en
-
-        print(f"🌐 Translating {len(texts_to_translate)} texts in 1 batch API call...")
-        translations = translate_batch_to_german(texts_to_translate)
-
-        # Parse translations
-        translated_title = translations[0]
-        translated_instructions = translations[1]
-        ingredients_de = translations[2:] if len(translations) > 2 else []
-
-        # 4. Format instructions into SCHRITT structure for parser
-        instruction_text = translated_instructions.replace('\r\n', '\n').strip()
-
-        # Check if already formatted (contains "SCHRITT X" or "Step X")
-        has_steps = bool(re.search(r'(SCHRITT\s+\d+|Step\s+\d+)', instruction_text, re.IGNORECASE))
-
-        if has_steps:
-            # Already formatted - just use as-is
-            formatted_instructions = instruction_text
-        else:
-            # Not formatted - split by newlines and add SCHRITT markers
-            instruction_lines = instruction_text.split('\n')
-            formatted_steps = []
-            step_num = 1
-            for line in instruction_lines:
-                line = line.strip()
-                if line:  # Skip empty lines
-                    formatted_steps.append(f"SCHRITT {step_num}\n\n{line}")
-                    step_num += 1
-            formatted_instructions = "\n\n".join(formatted_steps)
-
-        # 5. Download image (can be parallel but kept here for simplicity)
-        image_url = meal.get('strMealThumb')
-        image_filename = None
-
-        if image_url:
-            try:
-                img_response = requests.get(image_url, timeout=10, stream=True)
-                img_response.raise_for_status()
-
-                # Generate unique filename
-                image_filename = f"{uuid.uuid4()}.jpg"
-                image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-
-                # Save image
-                with open(image_path, 'wb') as f:
-                    shutil.copyfileobj(img_response.raw, f)
-            except Exception as e:
-                print(f"Image download failed: {e}")
-                image_filename = None
-
-        # 6. Build notes with structured SCHRITT format
-        notes = formatted_instructions + "\n\n"
-        if ingredients_de:
-            notes += "Zutaten:\n" + "\n".join(f"- {ing}" for ing in ingredients_de)
-
-        # Add source info (bilingual)
-        area = meal.get('strArea', 'N/A')
-        notes += f"\n\n─────────────────────────"
-        notes += f"\n🌍 Quelle: TheMealDB"
-        notes += f"\n📖 Original: {original_title}"
-        notes += f"\n🏷️ Kategorie: {category}"
-        notes += f"\n🌎 Region: {area}"
-        notes += f"\n🤖 Übersetzt mit DeepL"
-
-        # 7. Save to database
-        # Get import user ID
-        import_user = User.query.filter_by(email='import@seaser.local').first()
-        import_user_id = import_user.id if import_user else 1
-
-        recipe = Recipe(
-            title=translated_title,
-            image=image_filename,
-            notes=notes,
-            user_id=import_user_id,
-            auto_imported=True
-            # erstellt_am wird automatisch gesetzt durch DB-Default (CURRENT_TIMESTAMP)
-        )
-        db.session.add(recipe)
-        db.session.commit()
-
-        return jsonify({
-            'success': True,
-            'recipe_id': recipe.id,
-            'title': meal.get('strMeal'),
-            'title_de': translated_title,
-            'source': 'TheMealDB',
-            'strategy': strategy,
-            'filter_value': value,
-            'category': category,
-            'area': area,
-            'erstellt_am': recipe.erstellt_am.isoformat() if recipe.erstellt_am else None
-        })
+        config = get_config('themealdb')
+        return enqueue_import('daily_import', {
+            'strategy': request.args.get('strategy', config['default_strategy']),
+            'value': request.args.get('value', None)
+        }, daily_import_worker, 'Daily import job started')
 
     except Exception as e:
-        db.session.rollback()
         print(f"Daily import failed: {e}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/recipes/import-migusto', methods=['POST'])
 def import_recipe_from_migusto():
     """
-    Import a recipe from Migusto URL using intelligent scraping
+    Import a recipe from Migusto URL using intelligent scraping (background job)
 
     Request Body:
         {
@@ -1175,7 +1172,12 @@ def import_recipe_from_migusto():
             "user_id": 1  (optional, defaults to import user)
         }
 
+    Query Parameters:
+        wait (int): Seconds to wait for the result (optional, see enqueue_import)
+
     Returns:
+        202 {"job_id": "uuid", "status": "pending", "poll_url": "/api/jobs/<id>"}
+        or with wait:
         {
             "success": true,
             "recipe_id": 123,
@@ -1185,95 +1187,26 @@ def import_recipe_from_migusto():
         }
     """
     try:
-        from recipe_scraper import scrape_recipe_from_url, format_recipe_for_db
-
-        data = request.json
+        data = request.get_json(silent=True) or {}
         url = data.get('url')
-        user_id = data.get('user_id')
 
         if not url:
             return jsonify({'error': 'URL is required'}), 400
 
-        # 1. Scrape recipe from URL
-        print(f"🔍 Importing recipe from: {url}")
-        scraped_data = scrape_recipe_from_url(url)
-
-        if not scraped_data.get('title'):
-            return jsonify({'error': 'Could not extract recipe from URL'}), 400
-
-        # 2. Format for database
-        formatted_data = format_recipe_for_db(scraped_data, source_url=url)
-
-        # 3. Download image if URL provided
-        image_filename = None
-        image_url = formatted_data.get('image')
-
-        if image_url and image_url.startswith('http'):
-            try:
-                img_response = requests.get(image_url, timeout=10, stream=True)
-                img_response.raise_for_status()
-
-                # Generate unique filename
-                ext = image_url.split('.')[-1].split('?')[0][:4]  # Get extension
-                if ext not in ['jpg', 'jpeg', 'png', 'webp', 'gif']:
-                    ext = 'jpg'
-                image_filename = f"{uuid.uuid4()}.{ext}"
-                image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-
-                # Save image
-                with open(image_path, 'wb') as f:
-                    shutil.copyfileobj(img_response.raw, f)
-
-                print(f"📷 Image downloaded: {image_filename}")
-            except Exception as e:
-                print(f"⚠️ Image download failed: {e}")
-                image_filename = None
-
-        # 4. Get user ID
-        if not user_id:
-            # Use import user
-            import_user = User.query.filter_by(email='import@seaser.local').first()
-            user_id = import_user.id if import_user else 1
-
-        # 5. Save to database
-        recipe = Recipe(
-            title=formatted_data['title'],
-            image=image_filename,
-            notes=formatted_data['notes'],
-            duration=formatted_data.get('duration'),
-            rating=formatted_data.get('rating'),
-            user_id=user_id,
-            auto_imported=True
-        )
-        db.session.add(recipe)
-        db.session.commit()
-
-        print(f"✅ Recipe imported: {recipe.id} - {recipe.title}")
-
-        return jsonify({
-            'success': True,
-            'recipe_id': recipe.id,
-            'title': recipe.title,
-            'source': scraped_data.get('source', 'unknown'),
+        return enqueue_import('migusto_url_import', {
             'url': url,
-            'image': image_filename,
-            'duration': recipe.duration,
-            'ingredients_count': len(scraped_data.get('ingredients', [])),
-            'instructions_count': len(scraped_data.get('instructions', []))
-        })
+            'user_id': data.get('user_id')
+        }, migusto_url_import_worker, 'URL import job started')
 
     except Exception as e:
-        db.session.rollback()
         print(f"URL import failed: {e}")
-        import traceback
-        traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/recipes/import-migusto-batch', methods=['POST'])
 def import_migusto_batch():
     """
-    Batch import recipes from Migusto overview page with filters
+    Batch import recipes from Migusto overview page with filters (background job)
 
     Request Body:
         {
@@ -1283,7 +1216,12 @@ def import_migusto_batch():
             "user_id": 1  // optional
         }
 
+    Query Parameters:
+        wait (int): Seconds to wait for the result (optional, see enqueue_import)
+
     Returns:
+        202 {"job_id": "uuid", "status": "pending", "poll_url": "/api/jobs/<id>"}
+        or with wait:
         {
             "success": true,
             "imported": 15,
@@ -1293,187 +1231,71 @@ def import_migusto_batch():
         }
     """
     try:
-        from recipe_scraper import scrape_recipe_from_url, format_recipe_for_db
-        import time
+        data = request.get_json(silent=True) or {}
 
-        data = request.json or {}
-
-        # Load Migusto config
-        config_path = os.path.join(os.path.dirname(__file__), 'config/shared/migusto-import-config.json')
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)['migusto_import_config']
-
-        # Get filters
-        filters = data.get('filters')
-        if not filters:
-            # Use preset
-            preset_name = data.get('preset', config['default_preset'])
-            preset = config['presets'].get(preset_name)
-            if not preset:
+        # Unknown presets are a client error - check before enqueuing
+        if not data.get('filters'):
+            config = get_config('migusto')
+            preset_name = data.get('preset') or config['default_preset']
+            if preset_name not in config['presets']:
                 return jsonify({'error': f'Preset {preset_name} not found'}), 400
-            filters = preset['filters']
-
-        # Build overview URL
-        base_url = config['base_url']
-        overview_path = config['overview_path']
-        filter_string = '-'.join(filters)
-        overview_url = f"{base_url}{overview_path}/{filter_string}"
-
-        print(f"🔍 Fetching recipes from: {overview_url}")
-
-        # Fetch overview page
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(overview_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        # Extract recipe links
-        import re
-        pattern = r'href="(/de/rezepte/[a-z0-9-]+)"'
-        matches = re.findall(pattern, response.text)
-        unique_links = list(set(matches))
-
-        max_recipes = data.get('max_recipes', config.get('max_recipes_per_import', 50))
-        recipe_urls = [f"{base_url}{link}" for link in unique_links[:max_recipes]]
-
-        print(f"📋 Found {len(recipe_urls)} recipes to import")
-
-        # Import each recipe
-        user_id = data.get('user_id')
-        if not user_id:
-            import_user = User.query.filter_by(email='import@seaser.local').first()
-            user_id = import_user.id if import_user else 1
 
-        imported_recipes = []
-        failed_recipes = []
-        skipped_recipes = []
-        delay_ms = config.get('delay_between_imports_ms', 2000)
-
-        for i, recipe_url in enumerate(recipe_urls, 1):
-            try:
-                recipe_slug = recipe_url.split('/')[-1]
-
-                # Check if already imported
-                existing = Recipe.query.filter_by(title=recipe_slug).first()
-                if existing:
-                    print(f"⏭️  [{i}/{len(recipe_urls)}] Skipped (exists): {recipe_slug}")
-                    skipped_recipes.append({'url': recipe_url, 'reason': 'already_exists'})
-                    continue
-
-                print(f"🔍 [{i}/{len(recipe_urls)}] Importing: {recipe_slug}")
-
-                # Scrape recipe
-                scraped_data = scrape_recipe_from_url(recipe_url)
-
-                if not scraped_data.get('title'):
-                    failed_recipes.append({'url': recipe_url, 'error': 'no_title'})
-                    continue
-
-                # Format for database
-                formatted_data = format_recipe_for_db(scraped_data, source_url=recipe_url)
-
-                # Download image
-                image_filename = None
-                image_url = formatted_data.get('image')
-                if image_url and image_url.startswith('http'):
-                    try:
-                        img_response = requests.get(image_url, timeout=10, stream=True)
-                        img_response.raise_for_status()
-                        ext = image_url.split('.')[-1].split('?')[0][:4]
-                        if ext not in ['jpg', 'jpeg', 'png', 'webp', 'gif']:
-                            ext = 'jpg'
-                        image_filename = f"{uuid.uuid4()}.{ext}"
-                        image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-                        with open(image_path, 'wb') as f:
-                            shutil.copyfileobj(img_response.raw, f)
-                    except:
-                        pass
-
-                # Save to database
-                recipe = Recipe(
-                    title=formatted_data['title'],
-                    image=image_filename,
-                    notes=formatted_data['notes'],
-                    duration=formatted_data.get('duration'),
-                    rating=formatted_data.get('rating'),
-                    user_id=user_id,
-                    auto_imported=True
-                )
-                db.session.add(recipe)
-                db.session.commit()
-
-                imported_recipes.append({
-                    'id': recipe.id,
-                    'title': recipe.title,
-                    'url': recipe_url
-                })
-
-                print(f"✅ [{i}/{len(recipe_urls)}] Imported: {recipe.title}")
-
-                # Delay zwischen Requests
-                if i < len(recipe_urls):
-                    time.sleep(delay_ms / 1000.0)
-
-            except Exception as e:
-                print(f"❌ [{i}/{len(recipe_urls)}] Failed: {recipe_url} - {e}")
-                failed_recipes.append({'url': recipe_url, 'error': str(e)})
-                db.session.rollback()
-
-        return jsonify({
-            'success': True,
-            'imported': len(imported_recipes),
-            'failed': len(failed_recipes),
-            'skipped': len(skipped_recipes),
-            'total_found': len(recipe_urls),
-            'filters': filters,
-            'overview_url': overview_url,
-            'recipes': imported_recipes,
-            'failed_details': failed_recipes if failed_recipes else None
-        })
+        return enqueue_import('migusto_import', {
+            'preset': data.get('preset'),
+            'filters': data.get('filters'),
+            'max_recipes': data.get('max_recipes'),
+            'user_id': data.get('user_id')
+        }, migusto_import_worker, 'Migusto import job started')
 
     except Exception as e:
         print(f"Batch import failed: {e}")
-        import traceback
-        traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/recipes/cleanup-old-imports', methods=['POST'])
 def cleanup_old_imports():
-    """Delete auto-imported recipes older than 7 days without diary entry"""
-    try:
-        # Find old auto-imported recipes without diary entries
-        cutoff_date = (datetime.now() - timedelta(days=7)).date()
+    """
+    Delete auto-imported recipes older than 7 days without diary entry
 
-        old_recipes = Recipe.query.filter(
-            Recipe.auto_imported == True,
-            Recipe.erstellt_am < cutoff_date
-        ).filter(
-            ~Recipe.diary_entries.any()
-        ).all()
+    Runs as background job (batched deletes, see cleanup_old_imports_worker).
+    With dry_run the counts are returned directly, nothing is deleted.
 
-        deleted_count = 0
+    Request Body / Query params (all optional):
+        days: Minimum age in days (default: 7)
+        batch_size: Recipes per transaction (default: 200)
+        dry_run: true = only count
 
-        for recipe in old_recipes:
-            # Delete image file if exists
-            if recipe.image:
-                image_path = os.path.join(UPLOAD_FOLDER, recipe.image)
-                if os.path.exists(image_path):
-                    os.remove(image_path)
+    Query Parameters:
+        wait (int): Seconds to wait for the result (optional, see enqueue_import)
 
-            # Delete recipe
-            db.session.delete(recipe)
-            deleted_count += 1
+    Returns:
+        dry_run: {"dry_run": true, "would_delete": 12, "with_images": 10, "cutoff_date": "..."}
+        else:    {"job_id": "uuid", "status": "pending", "poll_url": "/api/jobs/<id>"} (202)
+                 or with wait: the cleanup result (200)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            days = int(data.get('days', request.args.get('days', 7)))
+            batch_size = int(data.get('batch_size', request.args.get('batch_size', 200)))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'days and batch_size must be integers'}), 400
+        if days < 0:
+            return jsonify({'error': 'days must not be negative'}), 400
+
+        params = {
+            'days': days,
+            'batch_size': max(1, min(batch_size, 5000)),
+            'dry_run': str(data.get('dry_run', request.args.get('dry_run', 'false'))).lower() in ('1', 'true', 'yes')
+        }
 
-        db.session.commit()
+        if params['dry_run']:
+            # A single aggregate query - cheap enough to answer inline
+            return jsonify(cleanup_old_imports_worker(None, params, app.app_context()))
 
-        return jsonify({
-            'success': True,
-            'deleted_count': deleted_count,
-            'cutoff_date': cutoff_date.isoformat()
-        })
+        return enqueue_import('cleanup_old_imports', params, cleanup_old_imports_worker, 'Cleanup job started')
 
     except Exception as e:
-        db.session.rollback()
         print(f"Cleanup failed: {e}")
         return jsonify({'error': str(e)}), 500
 
@@ -1482,8 +1304,13 @@ def cleanup_old_imports():
 # BACKGROUND JOBS API - Async Import Jobs
 # ============================================================================
 
-from background_jobs import create_job, get_job, run_job_in_background, get_all_jobs
-from import_workers import themealdb_import_worker, migusto_import_worker
+from background_jobs import (
+    create_job, run_job_in_background, get_all_jobs, wait_for_job, parse_wait, job_response, cleanup_old_jobs
+)
+from import_workers import (
+    themealdb_import_worker, migusto_import_worker, cleanup_old_imports_worker,
+    daily_import_worker, migusto_url_import_worker
+)
 
 
 @app.route('/api/jobs/import-themealdb', methods=['POST'])
@@ -1581,6 +1408,9 @@ def get_job_status(job_id):
     """
     Get job status and result
 
+    Query params:
+        wait: Seconds to wait for the job to finish (max JOB_MAX_WAIT_SECONDS, default: 0)
+
     Returns:
         {
             "job_id": "uuid",
@@ -1595,10 +1425,11 @@ def get_job_status(job_id):
             "error": "...",  // only if failed
             "created_at": "2025-11-10T21:00:00",
             "started_at": "2025-11-10T21:00:01",
-            "completed_at": "2025-11-10T21:01:00"  // only if completed/failed
+            "completed_at": "2025-11-10T21:01:00",  // only if completed/failed
+            "profile_url": "/api/profiles/..."  // only with PROFILER_JOBS_ENABLED
         }
     """
-    job = get_job(job_id)
+    job = wait_for_job(job_id, parse_wait(request.args.get('wait')))
 
     if not job:
         return jsonify({'error': 'Job not found'}), 404
@@ -1606,6 +1437,12 @@ def get_job_status(job_id):
     return jsonify(job)
 
 
+@app.route('/api/profiles/<filename>', methods=['GET'])
+def get_profile(filename):
+    """CPU profile written by sampling_profiler.py (speedscope JSON / collapsed stacks)"""
+    return send_from_directory(PROFILER_DIR, filename, as_attachment=True)
+
+
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     """
@@ -1629,6 +1466,104 @@ def list_jobs():
     })
 
 
+# ============================================================================
+# CLI Commands (flask --app app <command>)
+# ============================================================================
+
+@app.cli.command('backfill-parsed-notes')
+def backfill_parsed_notes():
+    """Parse notes of all existing recipes into notes_* columns and recipe_ingredients"""
+    from notes_parser import parse_notes
+    from ingredients import parse_ingredients
+
+    batch_size = 500
+    updated = 0
+    last_id = 0
+
+    while True:
+        rows = db.session.query(Recipe.id, Recipe.notes).filter(
+            Recipe.id > last_id
+        ).order_by(Recipe.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        batch_ids = [recipe_id for recipe_id, _ in rows]
+        db.session.execute(db.delete(RecipeIngredient).where(RecipeIngredient.recipe_id.in_(batch_ids)))
+        ingredient_rows = []
+        recipe_rows = []
+
+        for recipe_id, notes in rows:
+            parsed = parse_notes(notes)
+            for position, ingredient in enumerate(parse_ingredients(parsed['ingredients'] if parsed else [])):
+                ingredient_rows.append({'recipe_id': recipe_id, 'position': position, **ingredient})
+            recipe_rows.append({
+                'recipe_id': recipe_id,
+                'steps': parsed['steps'] if parsed else None,
+                'ingredients': parsed['ingredients'] if parsed else None,
+                'metadata': parsed['metadata'] if parsed else None
+            })
+        # One executemany per batch. Bumps updated_at (onupdate), which also
+        # changes the GET /api/recipes ETag for the re-parsed notes_* fields.
+        db.session.execute(
+            db.update(Recipe.__table__).where(Recipe.id == db.bindparam('recipe_id')).values(
+                notes_steps=db.bindparam('steps'),
+                notes_ingredients=db.bindparam('ingredients'),
+                notes_metadata=db.bindparam('metadata')
+            ),
+            recipe_rows
+        )
+        if ingredient_rows:
+            db.session.execute(db.insert(RecipeIngredient), ingredient_rows)
+        db.session.commit()
+
+        updated += len(rows)
+        last_id = rows[-1][0]
+        print(f"📝 Parsed notes of {updated} recipes...")
+
+    invalidate('recipes', 'stats')
+    print(f"✓ Backfill complete: {updated} recipes")
+
+
+@app.cli.command('export-data')
+@click.option('--user-id', type=int, default=None, help='Only this user (default: everything)')
+@click.option('--format', 'fmt', type=click.Choice(list(EXPORT_MIMETYPES)), default='zip')
+@click.option('--output', type=click.Path(dir_okay=False, writable=True), required=True)
+def export_data_command(user_id, fmt, output):
+    """Write an NDJSON/ZIP export to a file (same format as GET /api/export)"""
+    size = 0
+    with open(output, 'wb') as f:
+        for chunk in export_stream(user_id, fmt):
+            f.write(chunk)
+            size += len(chunk)
+    print(f"✓ Export written: {output} ({size / 1024 / 1024:.1f} MB)")
+
+
+@app.cli.command('import-data')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user-id', type=int, default=None, help='Assign everything to this user (default: match by email)')
+def import_data_command(path, user_id):
+    """Load an NDJSON/ZIP export via COPY (same as POST /api/import)"""
+    with open(path, 'rb') as f:
+        result = import_archive(f, user_id)
+    invalidate('users', 'recipes', 'stats')
+    print(f"✓ Import complete: {result}")
+
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute stats_counters / recipe_stats from recipes and diary_entries"""
+    rebuild_stats()
+    invalidate('stats')
+    print("✓ Statistics rebuilt")
+
+
+@app.cli.command('cleanup-jobs')
+@click.option('--max-age-hours', default=24, show_default=True, help='Delete finished jobs older than this')
+def cleanup_jobs_command(max_age_hours):
+    """Delete finished background jobs from the jobs table"""
+    print(f"✓ Removed {cleanup_old_jobs(max_age_hours)} old jobs")
+
+
 # Server start
 if __name__ == '__main__':
     init_db()
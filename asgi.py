@@ -0,0 +1,362 @@
+"""
+ASGI entry point - async serving mode for high-concurrency deployments
+
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py      (uvicorn workers)
+    uvicorn asgi:app --port 8000                        (local)
+
+The sync app runs one request per gunicorn worker, so an import waiting
+seconds on TheMealDB, DeepL or an image CDN pins a whole worker. Here the
+upstream-bound routes run natively on the event loop - httpx for HTTP,
+async SQLAlchemy (psycopg 3) for the insert - and only occupy a coroutine
+while they wait:
+
+    POST /api/recipes/daily-import
+    POST /api/recipes/import-migusto
+
+Images are not downloaded inline: the recipe is saved with a pending image
+and media_fetcher.py (threads of this worker) fetches and attaches it.
+
+Every other route is served by the unchanged Flask app through a2wsgi on a
+thread pool of ASGI_WSGI_THREADS per worker, so slow imports no longer
+starve the CRUD endpoints. Request/response formats are identical to the
+Flask routes in app.py; the TheMealDB/DeepL logic is shared (themealdb.py).
+Like there, every import is a job (background_jobs.py): the response is 202
+with a poll_url unless ?wait=N sees it finish - here the import runs as a
+task on the event loop instead of a thread.
+
+Load test comparing both modes: scripts/test/loadtest-server-modes.py
+"""
+
+import asyncio
+import time
+from urllib.parse import parse_qs
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import app as flask_app
+from background_jobs import create_job, get_job, start_job, finish_job, parse_wait, job_response
+from cache import invalidate
+from config import SQLALCHEMY_DATABASE_URI, ASGI_WSGI_THREADS, ASGI_HTTP_MAX_CONNECTIONS
+from config_registry import get_config
+from db_pool import PGBOUNCER, engine_options
+from media_fetcher import pending_image, enqueue_image
+from metrics import observe_request
+from models import Recipe, User
+from recipe_scraper import SCRAPER_HEADERS, scrape_recipe_from_url, format_recipe_for_db
+from serializers import dumps, loads
+from themealdb import (
+    DEEPL_API_URL, strategy_url, pick_meal, rejected_category, translation_texts,
+    deepl_form, merge_translations, build_notes
+)
+
+IMPORT_USER_EMAIL = 'import@seaser.local'
+
+flask_asgi = WSGIMiddleware(flask_app, workers=ASGI_WSGI_THREADS)
+
+# Created per worker on lifespan startup (event loop bound)
+_state = {'http': None, 'engine': None}
+
+# Running import tasks - the loop only keeps weak references
+_tasks = set()
+
+
+class HTTPError(Exception):
+    """Error response with JSON payload"""
+
+    def __init__(self, status, payload):
+        super().__init__(payload.get('error'))
+        self.status = status
+        self.payload = payload
+
+
+# ============================================================================
+# Resources
+# ============================================================================
+
+def _async_engine():
+    options = engine_options()
+    if PGBOUNCER:
+        # psycopg 3 prepares repeated statements - breaks PgBouncer transaction pooling
+        options['poolclass'] = NullPool
+        options['connect_args']['prepare_threshold'] = None
+    else:
+        # Async engines need the asyncio-aware queue pool (sizing options stay)
+        options.pop('poolclass')
+    url = SQLALCHEMY_DATABASE_URI.replace('postgresql://', 'postgresql+psycopg://', 1)
+    return create_async_engine(url, **options)
+
+
+async def _startup():
+    limits = httpx.Limits(max_connections=ASGI_HTTP_MAX_CONNECTIONS)
+    _state['http'] = httpx.AsyncClient(limits=limits, follow_redirects=True)
+    _state['engine'] = _async_engine()
+
+
+async def _shutdown():
+    if _state['http'] is not None:
+        await _state['http'].aclose()
+    if _state['engine'] is not None:
+        await _state['engine'].dispose()
+
+
+def _invalidate_sync(*namespaces):
+    with flask_app.app_context():
+        invalidate(*namespaces)
+
+
+# ============================================================================
+# Upstream calls
+# ============================================================================
+
+async def _get_json(url, timeout=10):
+    response = await _state['http'].get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_meal(strategy, value):
+    """Async fetch_recipe_from_themealdb()"""
+    url = strategy_url(strategy, value)
+    if not url:
+        return None
+    try:
+        meal, lookup_url = pick_meal(await _get_json(url))
+        if lookup_url:
+            meal, _ = pick_meal(await _get_json(lookup_url))
+        if not meal:
+            print(f"No recipes found for {strategy}={value}")
+        return meal
+    except Exception as e:
+        print(f"Error fetching from TheMealDB: {e}")
+        return None
+
+
+async def translate_batch(texts):
+    """Async translate_batch_to_german()"""
+    form, positions = deepl_form(texts)
+    if form is None:
+        return list(texts)
+    try:
+        response = await _state['http'].post(DEEPL_API_URL, data=form, timeout=30)
+        response.raise_for_status()
+        return merge_translations(texts, positions, response.json())
+    except Exception as e:
+        print(f"DeepL batch translation error: {e}")
+        return list(texts)
+
+
+async def save_recipe(image_url=None, **fields):
+    """Insert an auto-imported recipe (import user if no user_id), queue its image"""
+    async with AsyncSession(_state['engine'], expire_on_commit=False) as session:
+        if not fields.get('user_id'):
+            import_user_id = await session.scalar(select(User.id).where(User.email == IMPORT_USER_EMAIL))
+            fields['user_id'] = import_user_id or 1
+        recipe = Recipe(auto_imported=True, **pending_image(image_url), **fields)
+        session.add(recipe)
+        await session.commit()
+        await session.refresh(recipe, ['erstellt_am'])
+
+    enqueue_image(recipe.id, image_url)
+    await asyncio.to_thread(_invalidate_sync, 'recipes', 'stats')
+    return recipe
+
+
+# ============================================================================
+# Import jobs
+# ============================================================================
+
+async def _run_job(job_id, coro):
+    # The job store is the (sync) jobs table - keep its queries off the loop
+    await asyncio.to_thread(start_job, job_id)
+    try:
+        result, error = await coro, None
+    except HTTPError as e:
+        # Same contract as the sync workers: error payload + status_code
+        result, error = dict(e.payload, status_code=e.status), None
+    except Exception as e:
+        print(f"❌ Job {job_id} failed: {e}")
+        result, error = None, str(e)
+    await asyncio.to_thread(finish_job, job_id, result, error)
+
+
+async def enqueue_import(job_type, params, coro, query, message):
+    """Async app.enqueue_import() - the import runs as task on this worker's loop"""
+    job_id = await asyncio.to_thread(create_job, job_type, params)
+    task = asyncio.create_task(_run_job(job_id, coro))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+    wait = parse_wait(query.get('wait'))
+    if wait > 0:
+        try:
+            # shield: a timeout ends the wait, not the import
+            await asyncio.wait_for(asyncio.shield(task), wait)
+        except asyncio.TimeoutError:
+            pass
+    return job_response(await asyncio.to_thread(get_job, job_id), message)
+
+
+async def _daily_import(strategy, value):
+    meal = await fetch_meal(strategy, value)
+    if not meal:
+        raise HTTPError(404, {'error': 'No recipe found for the given criteria'})
+
+    category = meal.get('strCategory', '')
+    if rejected_category(meal):
+        print(f"⚠️ Import rejected: Category '{category}' contains meat/seafood")
+        raise HTTPError(400, {
+            'error': f'Recipe category "{category}" contains meat/seafood. Only vegetarian recipes allowed.',
+            'rejected_category': category,
+            'rejected_title': meal.get('strMeal')
+        })
+
+    translations = await translate_batch(translation_texts(meal))
+    translated_title, notes = build_notes(meal, translations)
+
+    recipe = await save_recipe(title=translated_title, notes=notes, image_url=meal.get('strMealThumb'))
+
+    return {
+        'success': True,
+        'recipe_id': recipe.id,
+        'title': meal.get('strMeal'),
+        'title_de': translated_title,
+        'source': 'TheMealDB',
+        'strategy': strategy,
+        'filter_value': value,
+        'category': category,
+        'area': meal.get('strArea', 'N/A'),
+        'erstellt_am': recipe.erstellt_am.isoformat() if recipe.erstellt_am else None,
+        'image_status': recipe.image_status
+    }
+
+
+async def _import_migusto_url(url, user_id):
+    print(f"🔍 Importing recipe from: {url}")
+    response = await _state['http'].get(url, headers=SCRAPER_HEADERS, timeout=15)
+    response.raise_for_status()
+
+    # Parsing is CPU work on a whole page - keep it off the event loop
+    scraped_data = await asyncio.to_thread(scrape_recipe_from_url, url, response.text)
+    if not scraped_data.get('title'):
+        raise HTTPError(400, {'error': 'Could not extract recipe from URL'})
+    formatted_data = format_recipe_for_db(scraped_data, source_url=url)
+
+    recipe = await save_recipe(
+        title=formatted_data['title'],
+        image_url=formatted_data.get('image'),
+        notes=formatted_data['notes'],
+        duration=formatted_data.get('duration'),
+        rating=formatted_data.get('rating'),
+        user_id=user_id
+    )
+    print(f"✅ Recipe imported: {recipe.id} - {recipe.title}")
+
+    return {
+        'success': True,
+        'recipe_id': recipe.id,
+        'title': recipe.title,
+        'source': scraped_data.get('source', 'unknown'),
+        'url': url,
+        'image_status': recipe.image_status,
+        'duration': recipe.duration,
+        'ingredients_count': len(scraped_data.get('ingredients', [])),
+        'instructions_count': len(scraped_data.get('instructions', []))
+    }
+
+
+# ============================================================================
+# Native async routes
+# ============================================================================
+
+async def daily_recipe_import(query, body):
+    """Async POST /api/recipes/daily-import (see app.daily_recipe_import)"""
+    config = get_config('themealdb')
+    strategy = query.get('strategy', config['default_strategy'])
+    value = query.get('value')
+    return await enqueue_import('daily_import', {'strategy': strategy, 'value': value},
+                                _daily_import(strategy, value), query, 'Daily import job started')
+
+
+async def import_recipe_from_migusto(query, body):
+    """Async POST /api/recipes/import-migusto (see app.import_recipe_from_migusto)"""
+    data = loads(body) if body else {}
+    url = data.get('url')
+    if not url:
+        raise HTTPError(400, {'error': 'URL is required'})
+    return await enqueue_import('migusto_url_import', {'url': url, 'user_id': data.get('user_id')},
+                                _import_migusto_url(url, data.get('user_id')), query, 'URL import job started')
+
+
+ROUTES = {
+    ('POST', '/api/recipes/daily-import'): daily_recipe_import,
+    ('POST', '/api/recipes/import-migusto'): import_recipe_from_migusto,
+}
+
+
+# ============================================================================
+# ASGI plumbing
+# ============================================================================
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _send_json(send, status, payload):
+    body = dumps(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _handle(handler, scope, receive, send):
+    start = time.perf_counter()
+    query = {key: values[0] for key, values in parse_qs(scope['query_string'].decode()).items()}
+    try:
+        status, payload = await handler(query, await _read_body(receive))
+    except HTTPError as e:
+        status, payload = e.status, e.payload
+    except Exception as e:
+        print(f"{scope['path']} failed: {e}")
+        status, payload = 500, {'error': str(e)}
+    await _send_json(send, status, payload)
+    observe_request(scope['method'], scope['path'], status, time.perf_counter() - start)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await _startup()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await _shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+
+    handler = ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+    if handler is not None:
+        await _handle(handler, scope, receive, send)
+    else:
+        await flask_asgi(scope, receive, send)
@@ -6,18 +6,39 @@ Provides async job execution for:
 - Migusto batch imports
 
 Jobs run in background threads and can be monitored via job_id.
+Request handlers can wait a bounded time for the result (wait_for_job,
+job_response) instead of blocking a web worker for the whole import.
+
+The job records live in the jobs table (models.Job), not in process memory:
+gunicorn runs several workers and the poll (GET /api/jobs/<id>) lands on
+any of them. The job itself runs in a thread of the worker that created it;
+waiting in that worker is woken up directly, all others poll the table.
+A job whose worker died (crash, max_requests recycle) never finishes - after
+JOB_STALE_AFTER_SECONDS without a result it is marked failed when read.
+
+Usage:
+    init_background_jobs(app)
 """
 
 import threading
 import uuid
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Callable
 
-# Global job storage (in-memory)
-# In production, this could be Redis or database-backed
-_jobs: Dict[str, Dict[str, Any]] = {}
-_jobs_lock = threading.Lock()
+from config import PROFILER_JOBS_ENABLED, JOB_MAX_WAIT_SECONDS, JOB_STALE_AFTER_SECONDS
+from sampling_profiler import ProfileSession, profile_url
+from db_pool import job_connection_role
+from models import db, Job
+from serializers import dumps, loads
+
+# Jobs running in this process - finish_job wakes up their waiters
+_job_done: Dict[str, threading.Event] = {}
+_job_done_lock = threading.Lock()
+_app = None
+
+# Waiting for a job of another worker: re-read the jobs table this often
+POLL_INTERVAL_SECONDS = 0.5
 
 # Job status constants
 STATUS_PENDING = 'pending'
@@ -26,6 +47,83 @@ STATUS_COMPLETED = 'completed'
 STATUS_FAILED = 'failed'
 
 
+def init_background_jobs(app):
+    """Bind the job store to the app's database"""
+    global _app
+    _app = app
+
+
+def _plain(value):
+    """JSON-compatible copy (datetimes/dates as ISO strings, like the API responses)"""
+    return None if value is None else loads(dumps(value))
+
+
+def _write(statement) -> int:
+    """Run an INSERT/UPDATE/DELETE in its own transaction (never the caller's session)"""
+    with _app.app_context():
+        with db.engine.begin() as conn:
+            return conn.execute(statement).rowcount
+
+
+def _read(statement) -> list:
+    with _app.app_context():
+        with db.engine.connect() as conn:
+            return [_to_dict(row) for row in conn.execute(statement).mappings()]
+
+
+def _timestamp(value):
+    return value.isoformat() if value is not None else None
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    return {
+        'job_id': row['id'],
+        'job_type': row['job_type'],
+        'status': row['status'],
+        'params': row['params'],
+        'result': row['result'],
+        'error': row['error'],
+        'created_at': _timestamp(row['created_at']),
+        'started_at': _timestamp(row['started_at']),
+        'completed_at': _timestamp(row['completed_at']),
+        'profile_url': row['profile_url'],
+        'progress': row['progress']
+    }
+
+
+def _update(job_id: str, *criteria, **values) -> int:
+    return _write(db.update(Job).where(Job.id == job_id, *criteria).values(**values))
+
+
+def _expire_stale(*criteria) -> int:
+    """Fail pending/running jobs older than JOB_STALE_AFTER_SECONDS - their worker is gone"""
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+    with _job_done_lock:
+        # Still running in this process - slow, not abandoned
+        running_here = list(_job_done)
+    if running_here:
+        criteria += (Job.id.notin_(running_here),)
+    return _write(db.update(Job).where(
+        Job.status.in_((STATUS_PENDING, STATUS_RUNNING)),
+        db.func.coalesce(Job.started_at, Job.created_at) < cutoff,
+        *criteria
+    ).values(
+        status=STATUS_FAILED,
+        error=f'Job abandoned: no result after {JOB_STALE_AFTER_SECONDS}s (worker stopped)',
+        completed_at=datetime.utcnow()
+    ))
+
+
+def _is_stale(job: Dict[str, Any]) -> bool:
+    if job['status'] not in (STATUS_PENDING, STATUS_RUNNING):
+        return False
+    with _job_done_lock:
+        if job['job_id'] in _job_done:
+            return False
+    since = datetime.fromisoformat(job['started_at'] or job['created_at'])
+    return datetime.utcnow() - since > timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+
+
 def create_job(job_type: str, params: Dict[str, Any]) -> str:
     """
     Create a new background job
@@ -39,23 +137,21 @@ def create_job(job_type: str, params: Dict[str, Any]) -> str:
     """
     job_id = str(uuid.uuid4())
 
-    with _jobs_lock:
-        _jobs[job_id] = {
-            'job_id': job_id,
-            'job_type': job_type,
-            'status': STATUS_PENDING,
-            'params': params,
-            'result': None,
-            'error': None,
-            'created_at': datetime.utcnow().isoformat(),
-            'started_at': None,
-            'completed_at': None,
-            'progress': {
-                'current': 0,
-                'total': 0,
-                'message': 'Job created'
-            }
+    with _job_done_lock:
+        _job_done[job_id] = threading.Event()
+
+    _write(db.insert(Job).values(
+        id=job_id,
+        job_type=job_type,
+        status=STATUS_PENDING,
+        params=_plain(params),
+        created_at=datetime.utcnow(),
+        progress={
+            'current': 0,
+            'total': 0,
+            'message': 'Job created'
         }
+    ))
 
     return job_id
 
@@ -70,19 +166,97 @@ def get_job(job_id: str) -> Dict[str, Any]:
     Returns:
         Job details or None if not found
     """
-    with _jobs_lock:
-        return _jobs.get(job_id)
+    jobs = _read(db.select(Job.__table__).where(Job.id == job_id))
+    if jobs and _is_stale(jobs[0]) and _expire_stale(Job.id == job_id):
+        jobs = _read(db.select(Job.__table__).where(Job.id == job_id))
+    return jobs[0] if jobs else None
 
 
 def update_job_progress(job_id: str, current: int, total: int, message: str):
-    """Update job progress"""
-    with _jobs_lock:
-        if job_id in _jobs:
-            _jobs[job_id]['progress'] = {
-                'current': current,
-                'total': total,
-                'message': message
-            }
+    """Update job progress (no-op for inline runs without a job, job_id None)"""
+    if job_id is None:
+        return
+    _update(job_id, progress={
+        'current': current,
+        'total': total,
+        'message': message
+    })
+
+
+def start_job(job_id: str):
+    """Mark job as running - returns the job record (None if unknown)"""
+    if not _update(job_id, status=STATUS_RUNNING, started_at=datetime.utcnow()):
+        return None
+    return get_job(job_id)
+
+
+def finish_job(job_id: str, result: Any = None, error: str = None):
+    """Store result (or error) and wake up waiting requests"""
+    _update(
+        job_id,
+        status=STATUS_FAILED if error is not None else STATUS_COMPLETED,
+        result=_plain(result),
+        error=error,
+        completed_at=datetime.utcnow()
+    )
+    with _job_done_lock:
+        done = _job_done.pop(job_id, None)
+    if done is not None:
+        done.set()
+
+
+def wait_for_job(job_id: str, timeout: float) -> Dict[str, Any]:
+    """Block until the job is finished or timeout seconds passed - returns the job"""
+    with _job_done_lock:
+        done = _job_done.get(job_id)
+    if done is not None:
+        # Runs in this process
+        if timeout > 0:
+            done.wait(timeout)
+        return get_job(job_id)
+
+    deadline = time.monotonic() + timeout
+    job = get_job(job_id)
+    while job is not None and job['status'] in (STATUS_PENDING, STATUS_RUNNING):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(POLL_INTERVAL_SECONDS, remaining))
+        job = get_job(job_id)
+    return job
+
+
+def parse_wait(value) -> float:
+    """?wait= seconds, capped at JOB_MAX_WAIT_SECONDS (0 if missing/invalid)"""
+    try:
+        return min(max(float(value), 0.0), JOB_MAX_WAIT_SECONDS)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def job_response(job: Dict[str, Any], message: str = None):
+    """
+    (http_status, payload) for an enqueued job
+
+    - completed: the worker result (its status_code, default 200) + job_id
+    - failed: 500 with the error
+    - pending/running: 202 with poll_url
+    """
+    job_id = job['job_id']
+    if job['status'] == STATUS_COMPLETED:
+        payload = dict(job['result'] or {})
+        status = payload.pop('status_code', 200)
+        payload['job_id'] = job_id
+        return status, payload
+    if job['status'] == STATUS_FAILED:
+        return 500, {'error': job['error'], 'job_id': job_id}
+    return 202, {
+        'success': True,
+        'job_id': job_id,
+        'status': job['status'],
+        'message': message or job['progress']['message'],
+        'poll_url': f'/api/jobs/{job_id}'
+    }
 
 
 def run_job_in_background(job_id: str, worker_func: Callable, app_context):
@@ -95,29 +269,43 @@ def run_job_in_background(job_id: str, worker_func: Callable, app_context):
         app_context: Flask app context
     """
     def _worker():
-        with _jobs_lock:
-            if job_id not in _jobs:
-                return
-            _jobs[job_id]['status'] = STATUS_RUNNING
-            _jobs[job_id]['started_at'] = datetime.utcnow().isoformat()
-            params = _jobs[job_id]['params']
+        try:
+            job = start_job(job_id)
+        except Exception as e:
+            print(f"❌ Job {job_id} could not be started: {e}")
+            finish_job(job_id, error=str(e))
+            return
+        if job is None:
+            return
+        params = job['params']
+        job_type = job['job_type']
+
+        # CPU profile of the whole job (see sampling_profiler.py)
+        profile = ProfileSession(f'job-{job_type}-{job_id}').start() if PROFILER_JOBS_ENABLED else None
 
         try:
-            # Execute worker function
-            result = worker_func(job_id, params, app_context)
+            # Execute worker function (DB connections tagged as job, see db_pool.py)
+            with job_connection_role(job_type):
+                result = worker_func(job_id, params, app_context)
+            error = None
+
+        except Exception as e:
+            result, error = None, str(e)
 
-            with _jobs_lock:
-                if job_id in _jobs:
-                    _jobs[job_id]['status'] = STATUS_COMPLETED
-                    _jobs[job_id]['result'] = result
-                    _jobs[job_id]['completed_at'] = datetime.utcnow().isoformat()
+        if profile is not None:
+            try:
+                filename = profile.stop().save()
+            except OSError as e:
+                print(f"⚠️ Could not write job profile: {e}")
+                filename = None
+            _update(job_id, profile_url=profile_url(filename))
 
+        try:
+            finish_job(job_id, result, error)
         except Exception as e:
-            with _jobs_lock:
-                if job_id in _jobs:
-                    _jobs[job_id]['status'] = STATUS_FAILED
-                    _jobs[job_id]['error'] = str(e)
-                    _jobs[job_id]['completed_at'] = datetime.utcnow().isoformat()
+            # e.g. a result the store rejects - record the failure instead
+            print(f"❌ Job {job_id} result could not be stored: {e}")
+            finish_job(job_id, error=str(e))
 
     # Start background thread
     thread = threading.Thread(target=_worker, daemon=True)
@@ -131,20 +319,9 @@ def cleanup_old_jobs(max_age_hours: int = 24):
     Args:
         max_age_hours: Maximum age in hours
     """
-    cutoff = datetime.utcnow().timestamp() - (max_age_hours * 3600)
-
-    with _jobs_lock:
-        to_remove = []
-        for job_id, job in _jobs.items():
-            if job['completed_at']:
-                completed_at = datetime.fromisoformat(job['completed_at']).timestamp()
-                if completed_at < cutoff:
-                    to_remove.append(job_id)
-
-        for job_id in to_remove:
-            del _jobs[job_id]
-
-    return len(to_remove)
+    _expire_stale()
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    return _write(db.delete(Job).where(Job.completed_at < cutoff))
 
 
 def get_all_jobs(limit: int = 50) -> list:
@@ -157,10 +334,5 @@ def get_all_jobs(limit: int = 50) -> list:
     Returns:
         List of jobs, newest first
     """
-    with _jobs_lock:
-        jobs = sorted(
-            _jobs.values(),
-            key=lambda x: x['created_at'],
-            reverse=True
-        )
-        return jobs[:limit]
+    _expire_stale()
+    return _read(db.select(Job.__table__).order_by(Job.created_at.desc()).limit(limit))
@@ -0,0 +1,75 @@
+"""
+Build Information (version, git SHA, build time, dependency versions)
+
+Resolved once per process - load_build_info() runs at app startup, so
+request handlers never fork `git` or scan package metadata.
+
+Sources (first match wins):
+    version:    APP_VERSION env (container build arg) -> git describe --tags --exact-match
+    git_sha:    GIT_SHA env (container build arg)     -> git rev-parse HEAD
+    build_time: BUILD_TIME env (container build arg)
+"""
+
+import os
+import platform
+import re
+import subprocess
+from functools import lru_cache
+from importlib import metadata
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+REQUIREMENTS_FILE = os.path.join(APP_DIR, 'requirements.txt')
+
+
+def _git(*args):
+    """Run a git command in the app directory (None if git/repo is unavailable)"""
+    try:
+        result = subprocess.run(
+            ['git', *args],
+            cwd=APP_DIR,
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+    except Exception:
+        pass
+    return None
+
+
+def _dependency_versions():
+    """Installed versions of the packages listed in requirements.txt"""
+    try:
+        with open(REQUIREMENTS_FILE, 'r', encoding='utf-8') as f:
+            names = [
+                re.split(r'[<>=!~\[;\s]', line.strip(), maxsplit=1)[0]
+                for line in f
+                if line.strip() and not line.startswith(('#', '-'))
+            ]
+    except OSError:
+        names = []
+
+    versions = {}
+    for name in names:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+@lru_cache(maxsize=None)
+def load_build_info():
+    """Version, git SHA, build time and dependency versions (cached for the process lifetime)"""
+    return {
+        'version': os.environ.get('APP_VERSION') or _git('describe', '--tags', '--exact-match') or 'unknown',
+        'git_sha': os.environ.get('GIT_SHA') or _git('rev-parse', 'HEAD'),
+        'build_time': os.environ.get('BUILD_TIME') or None,
+        'python': platform.python_version(),
+        'dependencies': _dependency_versions(),
+    }
+
+
+def get_app_version():
+    return load_build_info()['version']
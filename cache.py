@@ -0,0 +1,157 @@
+"""
+Process-local read-through cache with write invalidation
+
+Hot, rarely changing reads (recipe catalog, stats, users, format config)
+are cached per gunicorn worker with a TTL. Write paths call invalidate()
+with the affected namespaces.
+
+Cross-process coherence (optional, CACHE_NOTIFY_ENABLED):
+invalidate() also sends a PostgreSQL NOTIFY on CACHE_NOTIFY_CHANNEL. Every
+worker runs a LISTEN thread that clears the same namespaces locally. While
+the listener is not connected, the cache is bypassed so a worker never
+serves data another worker has already changed.
+
+Views decorated with conditional_get() additionally key their cache entries
+by the request ETag, so a cached body can never be paired with a newer ETag.
+
+Values read from a read replica (db_routing.py) are cached separately and
+for at most DB_REPLICA_MAX_LAG_SECONDS - they may miss a write whose
+invalidation already happened.
+
+Usage:
+    @cached('recipes')
+    def load_recipes(search): ...
+
+    invalidate('recipes', 'stats')
+"""
+
+import os
+import select
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_request_context
+
+from config import (
+    CACHE_ENABLED, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES,
+    CACHE_NOTIFY_ENABLED, CACHE_NOTIFY_CHANNEL, SQLALCHEMY_DATABASE_URI, DB_REPLICA_MAX_LAG_SECONDS
+)
+from db_routing import reading_from_replica
+
+_cache = {}  # namespace -> {key: (expires_at, value)}
+_cache_lock = threading.Lock()
+
+_listener_started = False
+_listener_connected = threading.Event()
+
+
+def _usable():
+    if not CACHE_ENABLED:
+        return False
+    # Without a working invalidation channel other workers' writes are invisible
+    return not CACHE_NOTIFY_ENABLED or _listener_connected.is_set()
+
+
+def cached(namespace, ttl=None):
+    """Decorator: cache the function result per (namespace, args, request ETag)"""
+    ttl = ttl or CACHE_TTL_SECONDS
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _usable():
+                return func(*args, **kwargs)
+
+            etag = g.get('etag') if has_request_context() else None
+            replica = reading_from_replica()
+            key = (args, tuple(sorted(kwargs.items())), etag, replica)
+            now = time.monotonic()
+            expires_in = min(ttl, DB_REPLICA_MAX_LAG_SECONDS) if replica else ttl
+
+            with _cache_lock:
+                entry = _cache.get(namespace, {}).get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+            value = func(*args, **kwargs)
+
+            with _cache_lock:
+                entries = _cache.setdefault(namespace, {})
+                if len(entries) >= CACHE_MAX_ENTRIES:
+                    entries.clear()
+                entries[key] = (now + expires_in, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def _clear_local(namespaces):
+    with _cache_lock:
+        if namespaces is None:
+            _cache.clear()
+        else:
+            for namespace in namespaces:
+                _cache.pop(namespace, None)
+
+
+def invalidate(*namespaces):
+    """Drop cached entries in this worker and notify all other workers"""
+    _clear_local(namespaces)
+
+    if CACHE_NOTIFY_ENABLED:
+        try:
+            from models import db
+            payload = f"{os.getpid()}:{','.join(namespaces)}"
+            with db.engine.connect() as conn:
+                conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+                conn.execute(db.text('SELECT pg_notify(:channel, :payload)'),
+                             {'channel': CACHE_NOTIFY_CHANNEL, 'payload': payload})
+        except Exception as e:
+            print(f"⚠️ Cache invalidation NOTIFY failed: {e}")
+
+
+def _listen_forever():
+    """Background thread: LISTEN for invalidations from other workers"""
+    import psycopg2
+
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(SQLALCHEMY_DATABASE_URI)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{CACHE_NOTIFY_CHANNEL}"')
+
+            # Notifications may have been missed while disconnected
+            _clear_local(None)
+            _listener_connected.set()
+
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    pid, _, namespaces = notify.payload.partition(':')
+                    if pid != str(os.getpid()):
+                        _clear_local([ns for ns in namespaces.split(',') if ns])
+        except Exception as e:
+            _listener_connected.clear()
+            print(f"⚠️ Cache listener disconnected: {e} - retrying in 5s")
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+def init_cache(app):
+    """Start the invalidation listener thread (once per process)"""
+    global _listener_started
+    if not CACHE_ENABLED or not CACHE_NOTIFY_ENABLED or _listener_started:
+        return
+    _listener_started = True
+    threading.Thread(target=_listen_forever, name='cache-listener', daemon=True).start()
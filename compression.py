@@ -0,0 +1,140 @@
+"""
+Response Compression for JSON API payloads
+
+Negotiates Content-Encoding from the Accept-Encoding request header:
+- br   (Brotli, only if the optional 'brotli' package is installed)
+- gzip (stdlib zlib)
+
+Only JSON responses above COMPRESSION_MIN_SIZE are compressed. Responses
+above COMPRESSION_STREAM_THRESHOLD and streamed responses (generators) are
+compressed chunk by chunk, so no second full copy of the body is built and
+the first bytes go out before the whole payload is compressed.
+
+Usage:
+    from compression import init_compression
+    init_compression(app)
+"""
+
+import zlib
+
+from flask import request
+
+from config import (
+    COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, COMPRESSION_LEVEL,
+    COMPRESSION_BROTLI_QUALITY, COMPRESSION_STREAM_THRESHOLD
+)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson'}
+CHUNK_SIZE = 64 * 1024
+
+
+class _GzipCompressor:
+    def __init__(self):
+        # wbits=31: zlib stream with gzip header/trailer
+        self._obj = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._obj.compress(data)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def process(self, data):
+        return self._obj.process(data)
+
+    def finish(self):
+        return self._obj.finish()
+
+
+_COMPRESSORS = {'gzip': _GzipCompressor}
+if brotli is not None:
+    _COMPRESSORS['br'] = _BrotliCompressor
+
+
+def choose_encoding():
+    """Pick the best supported encoding the client accepts (None if none)"""
+    accept = request.accept_encodings
+    best, best_quality = None, 0
+    # Preference order on equal quality: br before gzip
+    for encoding in ('br', 'gzip'):
+        if encoding not in _COMPRESSORS:
+            continue
+        quality = accept.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compress_stream(chunks, compressor):
+    """Generator: compress an iterable of byte chunks"""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _split(data):
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start:start + CHUNK_SIZE]
+
+
+def compress_response(response):
+    """after_request hook: compress eligible responses in place"""
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if (request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    encoding = choose_encoding()
+    if not encoding:
+        return response
+
+    compressor = _COMPRESSORS[encoding]()
+
+    if response.is_streamed:
+        # Generator response (e.g. NDJSON export): size unknown, always compress
+        response.response = _compress_stream(response.response, compressor)
+        response.headers.pop('Content-Length', None)
+    else:
+        size = response.content_length or 0
+        if size < COMPRESSION_MIN_SIZE:
+            return response
+
+        if size >= COMPRESSION_STREAM_THRESHOLD:
+            response.response = _compress_stream(_split(response.get_data()), compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.process(response.get_data()) + compressor.finish())
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    """Register the compression hook on the Flask app"""
+    if COMPRESSION_ENABLED:
+        app.after_request(compress_response)
@@ -0,0 +1,112 @@
+"""
+Conditional GET support (weak ETags + If-None-Match -> 304)
+
+The ETag is derived from a cheap aggregate fingerprint (row count,
+max(updated_at), max(id)) instead of hashing the serialized payload, so an
+unchanged view costs one small aggregate query and no serialization.
+
+Usage:
+    @app.route('/api/todos')
+    @conditional_get(todos_fingerprint)
+    def get_todos(): ...
+
+The fingerprint function receives the view arguments and returns any
+JSON-serializable value that changes whenever the response would change.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+
+import serializers
+from models import db, User, Recipe, Todo, DiaryEntry
+
+
+def make_etag(parts):
+    """Hash fingerprint parts into a short ETag value"""
+    return hashlib.blake2b(serializers.dumps(parts), digest_size=16).hexdigest()
+
+
+def conditional_get(fingerprint):
+    """Decorator: weak ETag for GET views, 304 Not Modified on If-None-Match match"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                etag = make_etag([request.path, fingerprint(*args, **kwargs)])
+            except Exception as e:
+                # Never fail the request because of the ETag - serve it uncached
+                print(f"⚠️ ETag fingerprint failed: {e}")
+                db.session.rollback()
+                return view(*args, **kwargs)
+
+            # Read by cache.cached() so cached bodies always match their ETag
+            g.etag = etag
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # Cache, but always revalidate (cheap thanks to the ETag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# Fingerprints
+# ============================================================================
+
+def _table_state(model, *criteria):
+    """(count, max(updated_at), max(id)) - catches inserts, updates and deletes"""
+    query = db.session.query(
+        db.func.count(model.id),
+        db.func.max(model.updated_at),
+        db.func.max(model.id)
+    )
+    if criteria:
+        query = query.filter(*criteria)
+    return list(query.one())
+
+
+def _users_state():
+    """users has no updated_at - the table is tiny, so fingerprint the displayed columns"""
+    return [list(row) for row in db.session.query(User.id, User.name, User.avatar_color).order_by(User.id)]
+
+
+def recipes_fingerprint():
+    """GET /api/recipes (recipes + embedded user name/email/color, diary aggregates)"""
+    view = request.args.get('view')
+    sort = request.args.get('sort')
+    return [
+        request.args.get('search'),
+        view,
+        sort,
+        _table_state(Recipe),
+        _users_state(),
+        # cook_count / avg_rating / last_cooked follow diary writes
+        _table_state(DiaryEntry) if view == 'summary' or sort else None,
+    ]
+
+
+def diary_fingerprint():
+    """GET /api/diary?user_id= (entries + embedded recipe title/image)"""
+    user_id = request.args.get('user_id', type=int)
+    criteria = [DiaryEntry.user_id == user_id] if user_id else []
+    return [
+        user_id,
+        request.args.get('search'),
+        _table_state(DiaryEntry, *criteria),
+        _table_state(Recipe),
+    ]
+
+
+def todos_fingerprint():
+    """GET /api/todos"""
+    return _table_state(Todo)
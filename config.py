@@ -44,10 +44,78 @@ def get_database_url():
 # SQLAlchemy Configuration
 SQLALCHEMY_DATABASE_URI = get_database_url()
 SQLALCHEMY_TRACK_MODIFICATIONS = False
-SQLALCHEMY_ENGINE_OPTIONS = {
-    'pool_pre_ping': True,  # Verify connections before using
-    'pool_recycle': 300,    # Recycle connections after 5 minutes
-}
+
+# Connection Pool Configuration (see db_pool.py, engine options built there)
+# One pool per gunicorn worker, shared with its background job threads:
+# 4 workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay below max_connections
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'queue')                      # queue | pgbouncer (NullPool)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '5'))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))              # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))            # Seconds
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() == 'true'  # Extra round-trip per checkout
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))        # Web requests (0 = off)
+DB_JOB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_JOB_STATEMENT_TIMEOUT_MS', '0'))    # Background jobs (0 = off)
+DB_APPLICATION_NAME = os.environ.get('DB_APPLICATION_NAME', 'rezept-tagebuch')
+
+# Read Replicas (see db_routing.py) - comma-separated PostgreSQL URLs, empty = primary only
+DB_REPLICA_URLS = [url.strip() for url in os.environ.get('DB_REPLICA_URLS', '').split(',') if url.strip()]
+DB_REPLICA_MAX_LAG_SECONDS = int(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', '5'))
+DB_REPLICA_CHECK_INTERVAL = int(os.environ.get('DB_REPLICA_CHECK_INTERVAL', '5'))       # Seconds between lag checks
+DB_READ_YOUR_WRITES_SECONDS = int(os.environ.get('DB_READ_YOUR_WRITES_SECONDS', '10'))  # Primary-only after a write
+
+# Response Compression Configuration (see compression.py)
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))                  # Bytes
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', '6'))                           # gzip 1-9
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))         # brotli 0-11
+COMPRESSION_STREAM_THRESHOLD = int(os.environ.get('COMPRESSION_STREAM_THRESHOLD', '262144'))  # Bytes
+
+# Read-Through Cache Configuration (see cache.py)
+CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', '300'))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '64'))  # per namespace
+# Cross-worker invalidation via PostgreSQL LISTEN/NOTIFY
+CACHE_NOTIFY_ENABLED = os.environ.get('CACHE_NOTIFY_ENABLED', 'true').lower() == 'true'
+CACHE_NOTIFY_CHANNEL = os.environ.get('CACHE_NOTIFY_CHANNEL', 'rezept_cache_invalidate')
+
+# Prometheus Metrics (see metrics.py, multiprocess dir set in gunicorn.conf.py)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+# SQL Query Profiler / N+1 detector (see query_profiler.py) - opt-in, logs every request
+QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', 'false').lower() == 'true'
+QUERY_PROFILER_REPEAT_THRESHOLD = int(os.environ.get('QUERY_PROFILER_REPEAT_THRESHOLD', '5'))  # same statement per request
+
+# Sampling CPU Profiler (see sampling_profiler.py) - opt-in
+PROFILER_REQUESTS_ENABLED = os.environ.get('PROFILER_REQUESTS_ENABLED', 'false').lower() == 'true'
+PROFILER_JOBS_ENABLED = os.environ.get('PROFILER_JOBS_ENABLED', 'false').lower() == 'true'
+PROFILER_DIR = os.environ.get('PROFILER_DIR', '/tmp/rezept-profiles')
+PROFILER_FORMAT = os.environ.get('PROFILER_FORMAT', 'speedscope')                    # speedscope | collapsed
+PROFILER_INTERVAL_MS = int(os.environ.get('PROFILER_INTERVAL_MS', '10'))
+PROFILER_SLOW_REQUEST_MS = int(os.environ.get('PROFILER_SLOW_REQUEST_MS', '1000'))   # write request profiles above
+PROFILER_MAX_FILES = int(os.environ.get('PROFILER_MAX_FILES', '200'))
+
+# ASGI serving mode (see asgi.py, SERVER_MODE in gunicorn.conf.py)
+ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', '16'))                  # Threads for the Flask routes
+ASGI_HTTP_MAX_CONNECTIONS = int(os.environ.get('ASGI_HTTP_MAX_CONNECTIONS', '100'))  # Upstream connections per worker
+
+# Import endpoints enqueue jobs - ?wait= blocks at most this long (below GUNICORN_TIMEOUT)
+JOB_MAX_WAIT_SECONDS = int(os.environ.get('JOB_MAX_WAIT_SECONDS', '60'))
+# Jobs still pending/running after this long count as abandoned (worker died) -> failed
+JOB_STALE_AFTER_SECONDS = int(os.environ.get('JOB_STALE_AFTER_SECONDS', str(2 * 60 * 60)))
+
+# Media fetch stage for imported recipe images (see media_fetcher.py)
+MEDIA_FETCH_WORKERS = int(os.environ.get('MEDIA_FETCH_WORKERS', '4'))                  # Downloader threads per process
+MEDIA_FETCH_MAX_ATTEMPTS = int(os.environ.get('MEDIA_FETCH_MAX_ATTEMPTS', '5'))
+MEDIA_FETCH_BACKOFF_SECONDS = float(os.environ.get('MEDIA_FETCH_BACKOFF_SECONDS', '2'))  # Doubled per retry
+MEDIA_MAX_IMAGE_BYTES = int(os.environ.get('MEDIA_MAX_IMAGE_BYTES', str(10 * 1024 * 1024)))
+MEDIA_MAX_IMAGE_SIZE = int(os.environ.get('MEDIA_MAX_IMAGE_SIZE', '1600'))              # px, longest side
+
+# Statistics counter deltas are folded into stats_counters this often (see stats.py, 0 = only on rebuild)
+STATS_FOLD_INTERVAL = int(os.environ.get('STATS_FOLD_INTERVAL', '60'))
+
+# Bulk write endpoints (/api/recipes/bulk, /api/diary/bulk)
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', '500'))
 
 # Upload Folder Configuration
 if TESTING_MODE:
@@ -0,0 +1,212 @@
+"""
+Import Config Registry (parsed once, reloaded on mtime change)
+
+The JSON import configs in config/shared/ are parsed and schema-checked once
+and then served from memory. Every get() costs a single stat(); the file is
+only re-read when its mtime changes, so edits take effect without a restart.
+
+    validate_configs()               # app startup: bad config -> ConfigError
+    get_config('themealdb')          # -> dict under "themealdb_import_config"
+    get_config('migusto')            # -> dict under "migusto_import_config"
+    get_config('recipe_format')      # -> dict under "patterns" (notes_parser.py)
+
+A config that breaks after startup (edited in place) is reported and the last
+valid version keeps being served, so a running import never fails halfway.
+Returned dicts are shared between requests - treat them as read-only.
+"""
+
+import json
+import os
+import re
+import threading
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config/shared')
+
+
+class ConfigError(Exception):
+    """Config file missing, not valid JSON or not matching its schema"""
+
+
+# ============================================================================
+# Schemas
+# ============================================================================
+# type -> isinstance check, [schema] -> list of items, {key: schema} -> object.
+# Keys ending in "?" are optional, "*" matches every key of the object.
+
+THEMEALDB_SCHEMA = {
+    'api_base_url': str,
+    'default_strategy': str,
+    'enabled_strategies?': [str],
+    'strategies': {
+        '*': {
+            'endpoint': str,
+            'requires_parameter': bool,
+            'parameter_key?': str,
+            'available_values?': [str],
+            'default_values?': [str],
+        }
+    },
+}
+
+MIGUSTO_SCHEMA = {
+    'base_url': str,
+    'overview_path': str,
+    'default_preset': str,
+    'presets': {
+        '*': {
+            'name': str,
+            'filters': [str],
+        }
+    },
+    'max_recipes_per_import?': int,
+    'delay_between_imports_ms?': int,
+}
+
+RECIPE_FORMAT_SCHEMA = {
+    'steps?': {
+        'regex?': str,
+    },
+    'metadata?': {
+        'patterns?': [str],
+    },
+}
+
+
+def _check_themealdb(config):
+    if config['default_strategy'] not in config['strategies']:
+        raise ConfigError(f"default_strategy '{config['default_strategy']}' is not defined in strategies")
+    for name, strategy in config['strategies'].items():
+        if strategy['requires_parameter'] and 'parameter_key' not in strategy:
+            raise ConfigError(f"strategies.{name}: requires_parameter without parameter_key")
+
+
+def _check_migusto(config):
+    if config['default_preset'] not in config['presets']:
+        raise ConfigError(f"default_preset '{config['default_preset']}' is not defined in presets")
+
+
+def _check_recipe_format(config):
+    regexes = [('steps.regex', config.get('steps', {}).get('regex'))]
+    regexes += [(f"metadata.patterns[{i}]", pattern)
+                for i, pattern in enumerate(config.get('metadata', {}).get('patterns', []))]
+    for path, pattern in regexes:
+        if pattern is None:
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ConfigError(f"{path}: invalid regex: {e}") from e
+
+
+def validate_schema(value, schema, path='$'):
+    """Raise ConfigError if value does not match schema"""
+    if isinstance(schema, type):
+        # bool is an int subclass - don't accept true/false for numbers
+        if not isinstance(value, schema) or (schema is int and isinstance(value, bool)):
+            raise ConfigError(f"{path}: expected {schema.__name__}, got {type(value).__name__}")
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            raise ConfigError(f"{path}: expected list, got {type(value).__name__}")
+        for i, item in enumerate(value):
+            validate_schema(item, schema[0], f"{path}[{i}]")
+    else:
+        if not isinstance(value, dict):
+            raise ConfigError(f"{path}: expected object, got {type(value).__name__}")
+        for key, sub_schema in schema.items():
+            if key == '*':
+                for name, item in value.items():
+                    validate_schema(item, sub_schema, f"{path}.{name}")
+                continue
+            name = key.rstrip('?')
+            if name in value:
+                validate_schema(value[name], sub_schema, f"{path}.{name}")
+            elif not key.endswith('?'):
+                raise ConfigError(f"{path}: missing required key '{name}'")
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+class ConfigRegistry:
+    """Named JSON configs, cached per process and keyed by file mtime"""
+
+    def __init__(self):
+        self._sources = {}
+        self._entries = {}  # name -> (mtime_ns, config)
+        self._lock = threading.Lock()
+
+    def register(self, name, filename, root_key, schema, check=None):
+        self._sources[name] = (os.path.join(CONFIG_DIR, filename), root_key, schema, check)
+
+    def _load(self, name):
+        path, root_key, schema, check = self._sources[name]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"{os.path.basename(path)}: {e}") from e
+        if not isinstance(data, dict) or root_key not in data:
+            raise ConfigError(f"{os.path.basename(path)}: missing top-level key '{root_key}'")
+        config = data[root_key]
+        try:
+            validate_schema(config, schema, root_key)
+            if check:
+                check(config)
+        except ConfigError as e:
+            raise ConfigError(f"{os.path.basename(path)}: {e}") from e
+        return config
+
+    def get(self, name):
+        """Parsed config; re-read only if the file's mtime changed"""
+        path = self._sources[name][0]
+        entry = self._entries.get(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            if entry:
+                return entry[1]
+            raise ConfigError(f"{os.path.basename(path)}: {e}") from e
+
+        if entry and entry[0] == mtime:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry and entry[0] == mtime:
+                return entry[1]
+            try:
+                config = self._load(name)
+            except ConfigError as e:
+                if not entry:
+                    raise
+                print(f"⚠️ Config reload failed, keeping previous version: {e}")
+                # Remember the broken mtime so it isn't re-parsed on every call
+                self._entries[name] = (mtime, entry[1])
+                return entry[1]
+            self._entries[name] = (mtime, config)
+            if entry:
+                print(f"🔄 Config reloaded: {os.path.basename(path)}")
+            return config
+
+    def validate_all(self):
+        """Load every registered config (raises ConfigError on the first bad one)"""
+        for name in self._sources:
+            self.get(name)
+
+
+registry = ConfigRegistry()
+registry.register('themealdb', 'themealdb-config.json', 'themealdb_import_config',
+                  THEMEALDB_SCHEMA, _check_themealdb)
+registry.register('migusto', 'migusto-import-config.json', 'migusto_import_config',
+                  MIGUSTO_SCHEMA, _check_migusto)
+registry.register('recipe_format', 'recipe-format-config.json', 'patterns',
+                  RECIPE_FORMAT_SCHEMA, _check_recipe_format)
+
+
+def get_config(name):
+    return registry.get(name)
+
+
+def validate_configs():
+    registry.validate_all()
@@ -0,0 +1,535 @@
+"""
+Data Export / Import (NDJSON / ZIP with images)
+
+Streams recipes and diary entries of one user (or of everyone) in constant
+memory: rows come from server-side cursors (yield_per) and are written out
+one line at a time; images are copied into the ZIP in chunks.
+
+Archive format (one JSON object per line):
+    {"type": "meta", "format": "rezept-tagebuch-export", "version": 1, ...}
+    {"type": "user", "id": 1, "email": "...", ...}
+    {"type": "recipe", "id": 17, "user_id": 1, "title": "...", ...}
+    {"type": "diary", "id": 5, "recipe_id": 17, "images": [...], ...}
+
+ZIP: data.ndjson + images/<filename> (recipe and diary images)
+
+Ids are the ids of the source database. The importer reads the archive as a
+stream and loads it through PostgreSQL COPY in batches of IMPORT_BATCH_SIZE:
+
+- Users are matched by email (or everything goes to one target user)
+- Recipe ids are allocated from the sequence up front (nextval), so recipes,
+  their ingredient rows and diary references are remapped without RETURNING
+- Images are deduplicated by sha256: identical content is stored once, under
+  its original name if that file already holds the same bytes, else as
+  <sha256><ext>
+- One transaction - a failing import leaves neither rows nor new images behind
+- Runs with DB_JOB_STATEMENT_TIMEOUT_MS (SET LOCAL), not the web request limit
+
+Usage:
+    GET /api/export?user_id=1&format=zip
+    POST /api/import?user_id=1   (multipart "file" or raw NDJSON/ZIP body)
+    flask --app app export-data --user-id 1 --format zip --output backup.zip
+    flask --app app import-data backup.zip
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from datetime import datetime
+
+from models import db, User, Recipe, RecipeIngredient, DiaryEntry
+from media_fetcher import IMAGE_PENDING, IMAGE_FETCHING, IMAGE_READY, enqueue_image
+from notes_parser import parse_notes
+from ingredients import parse_ingredients
+from serializers import dumps, loads
+from build_info import get_app_version
+from config import UPLOAD_FOLDER, DB_JOB_STATEMENT_TIMEOUT_MS
+
+EXPORT_FORMAT = 'rezept-tagebuch-export'
+EXPORT_VERSION = 1
+EXPORT_BATCH_SIZE = 500
+DATA_FILE = 'data.ndjson'
+IMAGES_DIR = 'images/'
+CHUNK_SIZE = 64 * 1024
+IMPORT_BATCH_SIZE = 1000
+ZIP_MAGIC = b'PK\x03\x04'
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'zip': 'application/zip',
+}
+
+
+def _stream_rows(table, *criteria):
+    """Rows of table as dicts, fetched EXPORT_BATCH_SIZE at a time (server-side cursor)"""
+    stmt = db.select(table).where(*criteria).order_by(table.c.id)
+    result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for row in result:
+        yield dict(row._mapping)
+
+
+def _image_list(value):
+    """diary_entries.images is a JSON array stored as text"""
+    if not value:
+        return []
+    try:
+        images = loads(value)
+    except ValueError:
+        return []
+    return images if isinstance(images, list) else []
+
+
+def export_records(user_id=None):
+    """All export records in archive order (meta, users, recipes, diary)"""
+    yield {
+        'type': 'meta',
+        'format': EXPORT_FORMAT,
+        'version': EXPORT_VERSION,
+        'app_version': get_app_version(),
+        'exported_at': datetime.utcnow(),
+        'user_id': user_id,
+    }
+
+    users = User.__table__
+    for row in _stream_rows(users, *([users.c.id == user_id] if user_id else [])):
+        yield {'type': 'user', **row}
+
+    recipes = Recipe.__table__
+    for row in _stream_rows(recipes, *([recipes.c.user_id == user_id] if user_id else [])):
+        yield {'type': 'recipe', **row}
+
+    diary = DiaryEntry.__table__
+    for row in _stream_rows(diary, *([diary.c.user_id == user_id] if user_id else [])):
+        row['images'] = _image_list(row['images'])
+        yield {'type': 'diary', **row}
+
+
+def _record_images(record):
+    if record['type'] == 'recipe' and record.get('image'):
+        return [record['image']]
+    if record['type'] == 'diary':
+        return [image for image in record['images'] if isinstance(image, str)]
+    return []
+
+
+def export_ndjson(user_id=None):
+    """Generator: NDJSON lines (bytes)"""
+    for record in export_records(user_id):
+        yield dumps(record) + b'\n'
+
+
+class _ChunkSink:
+    """Write-only file object for ZipFile - collects bytes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def export_zip(user_id=None):
+    """
+    Generator: ZIP archive bytes (data.ndjson + images/)
+
+    ZipFile writes to a non-seekable sink (sizes go into data descriptors),
+    so nothing but the current chunk and the set of image names is held in memory.
+    """
+    sink = _ChunkSink()
+    images = set()
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(DATA_FILE, 'w', force_zip64=True) as data_file:
+            for record in export_records(user_id):
+                images.update(_record_images(record))
+                data_file.write(dumps(record) + b'\n')
+                if sink.size >= CHUNK_SIZE:
+                    yield sink.drain()
+        yield sink.drain()
+
+        for name in sorted(images):
+            # Image names come from the database - never leave the upload folder
+            path = os.path.join(UPLOAD_FOLDER, name)
+            if name != os.path.basename(name) or not os.path.isfile(path):
+                continue
+            info = zipfile.ZipInfo.from_file(path, IMAGES_DIR + name)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, 'rb') as src, archive.open(info, 'w', force_zip64=True) as dst:
+                while chunk := src.read(CHUNK_SIZE):
+                    dst.write(chunk)
+                    if sink.size >= CHUNK_SIZE:
+                        yield sink.drain()
+            yield sink.drain()
+
+    # Central directory is written on close
+    yield sink.drain()
+
+
+def export_stream(user_id=None, fmt='ndjson'):
+    """Generator for the requested format ('ndjson' or 'zip')"""
+    return export_zip(user_id) if fmt == 'zip' else export_ndjson(user_id)
+
+
+# ============================================================================
+# Import
+# ============================================================================
+
+class ImportArchiveError(ValueError):
+    """Archive is not a (supported) export"""
+
+
+def _copy_value(value):
+    """Python value -> COPY text format field"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = dumps(value).decode('utf-8')
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _copy_rows(cursor, table, columns, rows):
+    """COPY rows (dicts) into table - one round trip per batch"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(row.get(column)) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Importer:
+    """State of one import run (id maps, pending batches, counters)"""
+
+    RECIPE_COLUMNS = [column.name for column in Recipe.__table__.columns]
+    INGREDIENT_COLUMNS = ['recipe_id', 'position', 'quantity', 'unit', 'name', 'raw']
+    DIARY_COLUMNS = [column.name for column in DiaryEntry.__table__.columns if column.name != 'id']
+
+    def __init__(self, target_user_id=None, archive=None):
+        self.target_user_id = target_user_id
+        self.archive = archive
+        self.archive_images = {
+            name[len(IMAGES_DIR):] for name in archive.namelist() if name.startswith(IMAGES_DIR)
+        } if archive else set()
+
+        self.user_map = {}
+        self.recipe_map = {}
+        self.image_map = {}
+        self.pending_recipes = []
+        self.pending_diary = []
+        self.written_images = []
+        self.image_fetches = []
+        self.now = datetime.utcnow()
+        self.counts = {
+            'users_created': 0, 'users_matched': 0, 'recipes': 0, 'ingredients': 0,
+            'diary_entries': 0, 'images_written': 0, 'images_deduplicated': 0,
+            'images_missing': 0, 'skipped': 0,
+        }
+
+        # Raw DBAPI cursor on the session's connection (same transaction)
+        self.cursor = db.session.connection().connection.dbapi_connection.cursor()
+        # A large archive runs its COPY/nextval batches inside one request:
+        # use the job timeout instead of DB_STATEMENT_TIMEOUT_MS (ends with the transaction)
+        self.cursor.execute(f'SET LOCAL statement_timeout = {int(DB_JOB_STATEMENT_TIMEOUT_MS)}')
+
+    # ------------------------------------------------------------------ images
+
+    def _store_image(self, name):
+        """Copy images/<name> out of the archive, deduplicated by content hash"""
+        ext = os.path.splitext(name)[1].lower()[:10]
+        tmp_path = os.path.join(UPLOAD_FOLDER, f'.import-{uuid.uuid4().hex}.tmp')
+        digest = hashlib.sha256()
+        with self.archive.open(IMAGES_DIR + name) as src, open(tmp_path, 'wb') as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                dst.write(chunk)
+        digest = digest.hexdigest()
+
+        original_path = os.path.join(UPLOAD_FOLDER, name)
+        if os.path.isfile(original_path) and _file_sha256(original_path) == digest:
+            os.remove(tmp_path)
+            self.counts['images_deduplicated'] += 1
+            return name
+
+        stored_name = digest + ext
+        stored_path = os.path.join(UPLOAD_FOLDER, stored_name)
+        if os.path.exists(stored_path):
+            os.remove(tmp_path)
+            self.counts['images_deduplicated'] += 1
+        else:
+            os.replace(tmp_path, stored_path)
+            self.written_images.append(stored_path)
+            self.counts['images_written'] += 1
+        return stored_name
+
+    def image(self, name):
+        """Target file name for an image referenced by the archive (None if unavailable)"""
+        if not isinstance(name, str) or not name or name != os.path.basename(name):
+            return None
+        if name not in self.image_map:
+            if name in self.archive_images:
+                self.image_map[name] = self._store_image(name)
+            elif os.path.isfile(os.path.join(UPLOAD_FOLDER, name)):
+                # NDJSON-only import into an environment that already has the file
+                self.image_map[name] = name
+            else:
+                self.counts['images_missing'] += 1
+                self.image_map[name] = None
+        return self.image_map[name]
+
+    # ------------------------------------------------------------------ records
+
+    def add_user(self, record):
+        if self.target_user_id:
+            self.user_map[record.get('id')] = self.target_user_id
+            return
+        user = User.query.filter_by(email=record.get('email')).first()
+        if user:
+            self.counts['users_matched'] += 1
+        else:
+            if not record.get('email') or not record.get('name'):
+                self.counts['skipped'] += 1
+                return
+            user = User(email=record['email'], name=record['name'],
+                        avatar_color=record.get('avatar_color') or '#FFB6C1')
+            db.session.add(user)
+            db.session.flush()
+            self.counts['users_created'] += 1
+        self.user_map[record.get('id')] = user.id
+
+    def _map_user(self, user_id):
+        return self.target_user_id or self.user_map.get(user_id)
+
+    def add_recipe(self, record):
+        if not record.get('title'):
+            self.counts['skipped'] += 1
+            return
+        self.pending_recipes.append(record)
+        if len(self.pending_recipes) >= IMPORT_BATCH_SIZE:
+            self.flush_recipes()
+
+    def add_diary(self, record):
+        if not record.get('date'):
+            self.counts['skipped'] += 1
+            return
+        # Diary rows reference recipes - those must be in the database first
+        self.flush_recipes()
+        self.pending_diary.append(record)
+        if len(self.pending_diary) >= IMPORT_BATCH_SIZE:
+            self.flush_diary()
+
+    # ------------------------------------------------------------------ batches
+
+    def flush_recipes(self):
+        if not self.pending_recipes:
+            return
+        records, self.pending_recipes = self.pending_recipes, []
+
+        self.cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence('recipes', 'id')) FROM generate_series(1, %s)",
+            (len(records),)
+        )
+        new_ids = [row[0] for row in self.cursor.fetchall()]
+
+        rows = []
+        ingredient_rows = []
+        for record, new_id in zip(records, new_ids):
+            row = {column: record.get(column) for column in self.RECIPE_COLUMNS}
+            row.update({
+                'id': new_id,
+                'user_id': self._map_user(record.get('user_id')),
+                'image': self.image(record.get('image')),
+                'is_system': bool(record.get('is_system')),
+                'auto_imported': bool(record.get('auto_imported')),
+                'erstellt_am': record.get('erstellt_am') or self.now,
+                'created_at': record.get('created_at') or self.now,
+                'updated_at': record.get('updated_at') or self.now,
+            })
+            self._image_fetch_state(row, new_id)
+            if 'notes_metadata' not in record:
+                # Archive without parsed notes - parse like the Recipe.notes validator
+                parsed = parse_notes(row['notes'])
+                row['notes_steps'] = parsed['steps'] if parsed else None
+                row['notes_ingredients'] = parsed['ingredients'] if parsed else None
+                row['notes_metadata'] = parsed['metadata'] if parsed else None
+
+            for position, ingredient in enumerate(parse_ingredients(row['notes_ingredients'])):
+                ingredient_rows.append({'recipe_id': new_id, 'position': position, **ingredient})
+            self.recipe_map[record.get('id')] = new_id
+            rows.append(row)
+
+        _copy_rows(self.cursor, Recipe.__tablename__, self.RECIPE_COLUMNS, rows)
+        if ingredient_rows:
+            _copy_rows(self.cursor, RecipeIngredient.__tablename__, self.INGREDIENT_COLUMNS, ingredient_rows)
+        self.counts['recipes'] += len(rows)
+        self.counts['ingredients'] += len(ingredient_rows)
+
+    def _image_fetch_state(self, row, recipe_id):
+        """
+        Reset the media fetch columns (COPY bypasses column defaults)
+
+        An image still pending or fetching in the source database was never
+        attached - here it is queued again once the import is committed.
+        """
+        row['image_attempts'] = row['image_attempts'] or 0
+        if row['image_status'] not in (IMAGE_PENDING, IMAGE_FETCHING):
+            return
+        if row['image']:
+            row['image_status'] = IMAGE_READY
+        elif row['image_source_url']:
+            row['image_status'] = IMAGE_PENDING
+            self.image_fetches.append((recipe_id, row['image_source_url'], row['image_attempts'] + 1))
+        else:
+            row['image_status'] = None
+
+    def flush_diary(self):
+        if not self.pending_diary:
+            return
+        records, self.pending_diary = self.pending_diary, []
+
+        rows = []
+        for record in records:
+            images = record.get('images')
+            if isinstance(images, str):
+                images = _image_list(images)
+            row = {column: record.get(column) for column in self.DIARY_COLUMNS}
+            row.update({
+                'recipe_id': self.recipe_map.get(record.get('recipe_id')),
+                'user_id': self._map_user(record.get('user_id')),
+                'images': dumps([image for image in map(self.image, images or []) if image]).decode('utf-8'),
+                'created_at': record.get('created_at') or self.now,
+                'updated_at': record.get('updated_at') or self.now,
+            })
+            rows.append(row)
+
+        _copy_rows(self.cursor, DiaryEntry.__tablename__, self.DIARY_COLUMNS, rows)
+        self.counts['diary_entries'] += len(rows)
+
+    # ------------------------------------------------------------------ run
+
+    def run(self, lines):
+        handlers = {'user': self.add_user, 'recipe': self.add_recipe, 'diary': self.add_diary}
+        seen_meta = False
+        try:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = loads(line)
+                except ValueError:
+                    raise ImportArchiveError(f'Line {number}: invalid JSON')
+                if not isinstance(record, dict):
+                    raise ImportArchiveError(f'Line {number}: expected a JSON object')
+
+                if not seen_meta:
+                    if record.get('type') != 'meta' or record.get('format') != EXPORT_FORMAT:
+                        raise ImportArchiveError('Not a rezept-tagebuch export (missing meta record)')
+                    if not isinstance(record.get('version'), int) or record['version'] > EXPORT_VERSION:
+                        raise ImportArchiveError(f"Unsupported export version: {record.get('version')}")
+                    seen_meta = True
+                    continue
+
+                handler = handlers.get(record.get('type'))
+                if handler:
+                    handler(record)
+                else:
+                    self.counts['skipped'] += 1
+
+            if not seen_meta:
+                raise ImportArchiveError('Archive is empty')
+            self.flush_recipes()
+            self.flush_diary()
+            db.session.commit()
+            # Not before the commit - the fetcher only attaches to committed recipes.
+            # Without fetcher threads (CLI) the next server start resumes them.
+            for recipe_id, image_url, attempt in self.image_fetches:
+                enqueue_image(recipe_id, image_url, attempt)
+        except BaseException:
+            db.session.rollback()
+            for path in self.written_images:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+        finally:
+            self.cursor.close()
+        return self.counts
+
+
+def _spool(fileobj):
+    """Seekable copy of a (possibly non-seekable) stream - ZipFile needs random access"""
+    try:
+        fileobj.seek(0)
+        return fileobj
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        spooled = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        shutil.copyfileobj(fileobj, spooled, CHUNK_SIZE)
+        spooled.seek(0)
+        return spooled
+
+
+def _is_zip(fileobj):
+    try:
+        magic = fileobj.read(len(ZIP_MAGIC))
+        fileobj.seek(0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return magic == ZIP_MAGIC
+
+
+def import_archive(fileobj, target_user_id=None, fmt=None):
+    """
+    Import an export archive from a binary file object
+
+    Args:
+        fileobj: NDJSON or ZIP stream (NDJSON is read line by line, never buffered)
+        target_user_id: Assign everything to this user instead of matching by email
+        fmt: 'ndjson' | 'zip' | None (sniffed if the stream is seekable)
+
+    Returns:
+        dict of counters (recipes, diary_entries, images_written, ...)
+    """
+    if db.engine.dialect.name != 'postgresql':
+        raise ImportArchiveError('Import requires PostgreSQL (COPY)')
+    if fmt is None:
+        fmt = 'zip' if _is_zip(fileobj) else 'ndjson'
+
+    if fmt != 'zip':
+        return _Importer(target_user_id).run(fileobj)
+
+    try:
+        archive = zipfile.ZipFile(_spool(fileobj))
+    except zipfile.BadZipFile:
+        raise ImportArchiveError('Invalid ZIP archive')
+    with archive:
+        if DATA_FILE not in archive.namelist():
+            raise ImportArchiveError(f'{DATA_FILE} missing in archive')
+        with archive.open(DATA_FILE) as data_file:
+            return _Importer(target_user_id, archive).run(data_file)
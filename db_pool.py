@@ -0,0 +1,156 @@
+"""
+Database Connection Pool Configuration
+
+Builds SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings in config.py.
+
+DB_POOL_MODE=queue (default):
+    QueuePool per gunicorn worker (DB_POOL_SIZE + DB_MAX_OVERFLOW), LIFO so
+    idle connections age out via DB_POOL_RECYCLE. No pre-ping by default -
+    it costs a round-trip on every checkout (DB_POOL_PRE_PING=true to enable).
+
+DB_POOL_MODE=pgbouncer:
+    NullPool - PgBouncer (transaction pooling) does the pooling, every checkout
+    opens a cheap connection to it. psycopg2 never uses server-side prepared
+    statements, so nothing else has to be switched off. Session state must not
+    be set on the connection (it would leak to other clients), so set
+    statement_timeout on the database role instead:
+        ALTER ROLE rezepte SET statement_timeout = '30s';
+    LISTEN/NOTIFY (cache.py) needs session pooling.
+
+Connections are tagged for pg_stat_activity:
+    rezept-tagebuch:web:<pid>          request handling, DB_STATEMENT_TIMEOUT_MS
+    rezept-tagebuch:job:<job_type>     background jobs, DB_JOB_STATEMENT_TIMEOUT_MS
+
+The time a checkout waits for a free connection (incl. opening new ones) is
+exported as db_pool_checkout_seconds (see metrics.py).
+
+Usage:
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+    init_db_pool(app)
+
+    with job_connection_role('migusto_import'):
+        ...
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool
+
+from config import (
+    DB_POOL_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS, DB_JOB_STATEMENT_TIMEOUT_MS, DB_APPLICATION_NAME,
+    CACHE_NOTIFY_ENABLED
+)
+from metrics import observe_pool_checkout, track_pool_in_use
+
+PGBOUNCER = DB_POOL_MODE == 'pgbouncer'
+
+_role = threading.local()
+
+
+class _TimedCheckout:
+    """Measures the wait for a connection (pool queue + connect)"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_pool_checkout(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def _web_settings():
+    # Evaluated per worker process (engine is created after gunicorn forks)
+    return f'{DB_APPLICATION_NAME}:web:{os.getpid()}', DB_STATEMENT_TIMEOUT_MS
+
+
+def engine_options():
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured DB_POOL_MODE"""
+    application_name, statement_timeout_ms = _web_settings()
+    connect_args = {'application_name': application_name}
+
+    if PGBOUNCER:
+        return {'poolclass': TimedNullPool, 'connect_args': connect_args}
+
+    connect_args['options'] = f'-c statement_timeout={statement_timeout_ms}'
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'pool_use_lifo': True,
+        'connect_args': connect_args,
+    }
+
+
+@contextmanager
+def job_connection_role(job_type):
+    """Tag connections used by the current thread as background job"""
+    _role.job_type = job_type
+    try:
+        yield
+    finally:
+        _role.job_type = None
+
+
+def _wanted_settings():
+    job_type = getattr(_role, 'job_type', None)
+    if job_type:
+        return f'{DB_APPLICATION_NAME}:job:{job_type}', DB_JOB_STATEMENT_TIMEOUT_MS
+    return _web_settings()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    track_pool_in_use(1)
+    if PGBOUNCER:
+        return
+
+    # Only switch when the connection was last used by another role (web <-> job)
+    wanted = _wanted_settings()
+    current = connection_record.info.get('session_settings', _web_settings())
+    if current == wanted:
+        return
+    application_name, statement_timeout_ms = wanted
+    cursor = dbapi_connection.cursor()
+    cursor.execute(
+        "SELECT set_config('application_name', %s, false), set_config('statement_timeout', %s, false)",
+        (application_name, str(statement_timeout_ms))
+    )
+    cursor.close()
+    dbapi_connection.commit()
+    connection_record.info['session_settings'] = wanted
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    track_pool_in_use(-1)
+
+
+def init_db_pool(app):
+    """Register pool events and log the pool configuration"""
+    for pool_class in (TimedQueuePool, TimedNullPool):
+        if not event.contains(pool_class, 'checkout', _on_checkout):
+            event.listen(pool_class, 'checkout', _on_checkout)
+            event.listen(pool_class, 'checkin', _on_checkin)
+
+    if PGBOUNCER:
+        print("🔌 DB pool: pgbouncer mode (NullPool)")
+        if CACHE_NOTIFY_ENABLED:
+            print("⚠️ CACHE_NOTIFY_ENABLED needs session pooling - LISTEN does not work "
+                  "through PgBouncer transaction pooling")
+    else:
+        print(f"🔌 DB pool: size {DB_POOL_SIZE} + overflow {DB_MAX_OVERFLOW}, "
+              f"timeout {DB_POOL_TIMEOUT}s, statement timeout {DB_STATEMENT_TIMEOUT_MS}ms")
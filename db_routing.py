@@ -0,0 +1,158 @@
+"""
+Read-Replica Routing (optional, DB_REPLICA_URLS)
+
+Heavy read endpoints decorated with @replica_read run their queries on a
+PostgreSQL streaming replica instead of the primary:
+
+    @app.route('/api/recipes', methods=['GET'])
+    @replica_read
+    @conditional_get(recipes_fingerprint)
+    def get_recipes(): ...
+
+Routing happens in RoutingSession.get_bind(), so views and models stay
+unchanged; flushes and everything outside @replica_read use the primary.
+
+The primary is used instead of a replica when:
+- no replica is configured or all are unhealthy
+- a replica lags more than DB_REPLICA_MAX_LAG_SECONDS (checked at most every
+  DB_REPLICA_CHECK_INTERVAL seconds per worker)
+- the client wrote something in the last DB_READ_YOUR_WRITES_SECONDS
+  (read-your-writes: every successful POST/PUT/PATCH/DELETE sets the
+  db_primary_until cookie)
+
+Cached values read from a replica are kept apart from primary ones and
+expire after DB_REPLICA_MAX_LAG_SECONDS (see cache.py).
+
+Usage:
+    db = SQLAlchemy(session_options={'class_': RoutingSession})
+    init_db_routing(app)
+"""
+
+import random
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, text
+
+from config import (
+    DB_REPLICA_URLS, DB_REPLICA_MAX_LAG_SECONDS, DB_REPLICA_CHECK_INTERVAL, DB_READ_YOUR_WRITES_SECONDS
+)
+from db_pool import engine_options
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_COOKIE = 'db_primary_until'
+
+# Replay lag in seconds - 0 when everything received is replayed, NULL if unknown
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    """One replica engine with its last measured lag"""
+
+    def __init__(self, url):
+        self.url = url
+        self.engine = create_engine(url, **engine_options())
+        self.lag = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def host(self):
+        return self.engine.url.host or self.engine.url.database
+
+    def healthy(self):
+        if time.monotonic() - self.checked_at >= DB_REPLICA_CHECK_INTERVAL:
+            self._check()
+        return self.lag is not None and self.lag <= DB_REPLICA_MAX_LAG_SECONDS
+
+    def _check(self):
+        # One check at a time - other threads keep using the last result
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            was_healthy = self.lag is not None and self.lag <= DB_REPLICA_MAX_LAG_SECONDS
+            try:
+                with self.engine.connect() as conn:
+                    lag = conn.execute(LAG_QUERY).scalar()
+                self.lag = float(lag) if lag is not None else None
+            except Exception as e:
+                print(f"⚠️ Replica {self.host} check failed: {e}")
+                self.lag = None
+            self.checked_at = time.monotonic()
+
+            is_healthy = self.lag is not None and self.lag <= DB_REPLICA_MAX_LAG_SECONDS
+            if is_healthy != was_healthy:
+                state = 'in use' if is_healthy else 'skipped'
+                print(f"🔀 Replica {self.host} {state} (lag: {self.lag}s)")
+        finally:
+            self._lock.release()
+
+
+_replicas = []
+
+
+def choose_replica():
+    """Engine of a random healthy replica, None -> use the primary"""
+    healthy = [replica for replica in _replicas if replica.healthy()]
+    return random.choice(healthy).engine if healthy else None
+
+
+def _recent_write():
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_read(view):
+    """Decorator: run the view's queries on a replica when possible"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _replicas or request.method not in SAFE_METHODS or _recent_write():
+            return view(*args, **kwargs)
+        g.db_replica = choose_replica()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g.pop('db_replica', None)
+    return wrapper
+
+
+def reading_from_replica():
+    return has_request_context() and g.get('db_replica') is not None
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session sending @replica_read queries to g.db_replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and reading_from_replica():
+            return g.db_replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _after_request(response):
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        until = time.time() + DB_READ_YOUR_WRITES_SECONDS
+        response.set_cookie(PRIMARY_COOKIE, f'{until:.0f}', max_age=DB_READ_YOUR_WRITES_SECONDS,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+def init_db_routing(app):
+    """Create replica engines and the read-your-writes hook (no-op without replicas)"""
+    if not DB_REPLICA_URLS or _replicas:
+        return
+    _replicas.extend(Replica(url) for url in DB_REPLICA_URLS)
+    app.after_request(_after_request)
+    print(f"🔀 Read replicas: {', '.join(replica.host for replica in _replicas)} "
+          f"(max lag {DB_REPLICA_MAX_LAG_SECONDS}s)")
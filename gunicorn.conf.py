@@ -0,0 +1,49 @@
+"""
+Gunicorn configuration
+
+    gunicorn -c gunicorn.conf.py
+
+- 4 workers for parallel request handling
+- 90s timeout for imports (optimized with batch translation)
+- Logs to stdout/stderr for container logging
+- SERVER_MODE=wsgi (default): sync Flask workers (app:app)
+- SERVER_MODE=asgi: uvicorn workers, upstream-bound import routes run async,
+  all other routes in a thread pool per worker (asgi:app, see asgi.py)
+- Prometheus multiprocess mode: every worker writes its metrics into
+  PROMETHEUS_MULTIPROC_DIR, /metrics merges them (see metrics.py)
+"""
+
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:80')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '90'))
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
+
+if os.environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+    wsgi_app = 'asgi:app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'app:app'
+
+# Must be set before the workers import prometheus_client (inherited via fork)
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus-multiproc')
+
+
+def on_starting(server):
+    """Start with an empty metrics directory (stale files would be merged)"""
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop live gauges (in-progress requests) of a dead worker"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
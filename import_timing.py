@@ -0,0 +1,100 @@
+"""
+Per-Stage Timing for Import Jobs
+
+Splits each imported recipe into stages and reports where the time goes:
+
+    queue_wait   job created -> worker thread started (once per job)
+    overview     Migusto overview page fetch (once per job)
+    fetch        recipe download (TheMealDB API / Migusto HTML)
+    parse        scraping / building notes (incl. the notes parser)
+    translate    DeepL calls (TheMealDB)
+    dedup        already-imported check (Migusto)
+    commit       INSERT + COMMIT
+    throttle     configured delay between Migusto requests
+
+Images are fetched after the commit (media_fetcher.py, job_type
+media_fetch, stages download/resize).
+
+Every stage duration is also observed in the import_stage_duration_seconds
+histogram (see metrics.py), so percentiles are available across jobs too.
+
+Usage:
+    timer = ImportTimer('migusto_import')
+    timer.record('queue_wait', queue_wait_seconds(get_job(job_id)))
+    with timer.stage('fetch'):
+        html = fetch_recipe_html(url)
+    entry['timings_ms'] = timer.finish_item()
+    result['timings'] = timer.summary()
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from metrics import observe_import_stage
+
+PERCENTILES = (50, 90, 95)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-p * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ImportTimer:
+    """Collects stage durations per recipe and per job"""
+
+    def __init__(self, job_type):
+        self.job_type = job_type
+        self.samples = defaultdict(list)  # stage -> [seconds per recipe (or per job)]
+        self.current = {}                 # stage -> seconds for the recipe in progress
+
+    def record(self, stage, seconds):
+        """Job-level stage (queue wait, overview fetch)"""
+        if seconds is None:
+            return
+        self.samples[stage].append(seconds)
+        observe_import_stage(self.job_type, stage, seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage of the current recipe (repeated stages add up)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+            observe_import_stage(self.job_type, name, elapsed)
+
+    def finish_item(self):
+        """Close the current recipe - returns its stage timings in ms"""
+        timings, self.current = self.current, {}
+        for stage, seconds in timings.items():
+            self.samples[stage].append(seconds)
+        return {stage: round(seconds * 1000, 1) for stage, seconds in timings.items()}
+
+    def summary(self):
+        """Per stage: count, total and percentiles in ms"""
+        result = {}
+        for stage, values in self.samples.items():
+            values = sorted(values)
+            stats = {'count': len(values), 'total_ms': round(sum(values) * 1000, 1)}
+            for p in PERCENTILES:
+                stats[f'p{p}_ms'] = round(percentile(values, p) * 1000, 1)
+            stats['max_ms'] = round(values[-1] * 1000, 1)
+            result[stage] = stats
+        return result
+
+
+def queue_wait_seconds(job):
+    """Time between job creation and worker start (None if unknown)"""
+    if not job or not job.get('created_at') or not job.get('started_at'):
+        return None
+    created = datetime.fromisoformat(job['created_at'])
+    started = datetime.fromisoformat(job['started_at'])
+    return max(0.0, (started - created).total_seconds())
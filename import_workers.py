@@ -5,12 +5,181 @@ These functions run in background threads and perform actual import work.
 """
 
 import os
-import uuid
 import time
-import shutil
 import requests
-import json
-from background_jobs import update_job_progress
+from background_jobs import get_job, update_job_progress
+from cache import invalidate
+from config_registry import get_config
+from import_timing import ImportTimer, queue_wait_seconds
+from media_fetcher import pending_image, enqueue_image
+
+
+IMPORT_USER_EMAIL = 'import@seaser.local'
+
+
+def import_user_id():
+    """ID of the import user (1 if missing) - needs an app context"""
+    from models import User
+
+    import_user = User.query.filter_by(email=IMPORT_USER_EMAIL).first()
+    return import_user.id if import_user else 1
+
+
+def daily_import_worker(job_id: str, params: dict, app_context):
+    """
+    Worker function for POST /api/recipes/daily-import (one TheMealDB recipe)
+
+    Params:
+        - strategy: Import strategy (random, by_category, by_area, ...)
+        - value: Value for the strategy filter (optional)
+
+    Rejections (meat/seafood) and empty results complete the job with an
+    error payload and the HTTP status the endpoint answers with (status_code).
+    """
+    from models import db, Recipe
+    from themealdb import (
+        fetch_recipe_from_themealdb, rejected_category, translation_texts, translate_batch_to_german, build_notes
+    )
+
+    strategy = params.get('strategy')
+    value = params.get('value')
+
+    timer = ImportTimer('daily_import')
+    timer.record('queue_wait', queue_wait_seconds(get_job(job_id)))
+
+    update_job_progress(job_id, 0, 1, f'Fetching recipe from TheMealDB ({strategy})...')
+    with timer.stage('fetch'):
+        meal = fetch_recipe_from_themealdb(strategy=strategy, value=value)
+
+    if not meal:
+        return {'error': 'No recipe found for the given criteria', 'status_code': 404}
+
+    # Only allow meat-free recipes
+    category = meal.get('strCategory', '')
+    if rejected_category(meal):
+        print(f"⚠️ Import rejected: Category '{category}' contains meat/seafood")
+        return {
+            'error': f'Recipe category "{category}" contains meat/seafood. Only vegetarian recipes allowed.',
+            'rejected_category': category,
+            'rejected_title': meal.get('strMeal'),
+            'status_code': 400
+        }
+
+    # Title, instructions and ingredients in ONE DeepL call
+    update_job_progress(job_id, 0, 1, f'Translating "{meal.get("strMeal")}"...')
+    with timer.stage('translate'):
+        translations = translate_batch_to_german(translation_texts(meal))
+    with timer.stage('parse'):
+        translated_title, notes = build_notes(meal, translations)
+
+    image_url = meal.get('strMealThumb')
+
+    update_job_progress(job_id, 0, 1, f'Saving "{translated_title}"...')
+    with app_context:
+        try:
+            with timer.stage('commit'):
+                recipe = Recipe(
+                    title=translated_title,
+                    notes=notes,
+                    user_id=import_user_id(),
+                    auto_imported=True,
+                    # Image follows via media_fetcher once the recipe is visible
+                    **pending_image(image_url)
+                    # erstellt_am wird automatisch gesetzt durch DB-Default (CURRENT_TIMESTAMP)
+                )
+                db.session.add(recipe)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        enqueue_image(recipe.id, image_url)
+        invalidate('recipes', 'stats')
+        update_job_progress(job_id, 1, 1, f'Imported: {translated_title}')
+
+        return {
+            'success': True,
+            'recipe_id': recipe.id,
+            'title': meal.get('strMeal'),
+            'title_de': translated_title,
+            'source': 'TheMealDB',
+            'strategy': strategy,
+            'filter_value': value,
+            'category': category,
+            'area': meal.get('strArea', 'N/A'),
+            'erstellt_am': recipe.erstellt_am.isoformat() if recipe.erstellt_am else None,
+            'image_status': recipe.image_status,
+            'timings_ms': timer.finish_item()
+        }
+
+
+def migusto_url_import_worker(job_id: str, params: dict, app_context):
+    """
+    Worker function for POST /api/recipes/import-migusto (one recipe URL)
+
+    Params:
+        - url: Recipe page URL
+        - user_id: User ID (optional, defaults to import user)
+    """
+    from models import db, Recipe
+    from recipe_scraper import fetch_recipe_html, scrape_recipe_from_url, format_recipe_for_db
+
+    url = params['url']
+
+    timer = ImportTimer('migusto_url_import')
+    timer.record('queue_wait', queue_wait_seconds(get_job(job_id)))
+
+    print(f"🔍 Importing recipe from: {url}")
+    update_job_progress(job_id, 0, 1, f'Fetching {url}...')
+    with timer.stage('fetch'):
+        html_content = fetch_recipe_html(url)
+    with timer.stage('parse'):
+        scraped_data = scrape_recipe_from_url(url, html_content=html_content)
+
+    if not scraped_data.get('title'):
+        return {'error': 'Could not extract recipe from URL', 'status_code': 400}
+
+    with timer.stage('parse'):
+        formatted_data = format_recipe_for_db(scraped_data, source_url=url)
+
+    image_url = formatted_data.get('image')
+
+    update_job_progress(job_id, 0, 1, f'Saving "{formatted_data["title"]}"...')
+    with app_context:
+        try:
+            with timer.stage('commit'):
+                recipe = Recipe(
+                    title=formatted_data['title'],
+                    notes=formatted_data['notes'],
+                    duration=formatted_data.get('duration'),
+                    rating=formatted_data.get('rating'),
+                    user_id=params.get('user_id') or import_user_id(),
+                    auto_imported=True,
+                    **pending_image(image_url)
+                )
+                db.session.add(recipe)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        enqueue_image(recipe.id, image_url)
+        invalidate('recipes', 'stats')
+        print(f"✅ Recipe imported: {recipe.id} - {recipe.title}")
+        update_job_progress(job_id, 1, 1, f'Imported: {recipe.title}')
+
+        return {
+            'success': True,
+            'recipe_id': recipe.id,
+            'title': recipe.title,
+            'source': scraped_data.get('source', 'unknown'),
+            'url': url,
+            'image_status': recipe.image_status,
+            'duration': recipe.duration,
+            'ingredients_count': len(scraped_data.get('ingredients', [])),
+            'instructions_count': len(scraped_data.get('instructions', [])),
+            'timings_ms': timer.finish_item()
+        }
 
 
 def themealdb_import_worker(job_id: str, params: dict, app_context):
@@ -20,13 +189,18 @@ def themealdb_import_worker(job_id: str, params: dict, app_context):
     Params:
         - count: Number of recipes to import (default: 2)
         - user_id: User ID (optional)
+
+    Every recipe entry carries its stage timings (timings_ms), the result
+    the per-stage percentiles (timings, see import_timing.py).
     """
     from models import db, Recipe, User
-    from config import UPLOAD_FOLDER
 
     count = params.get('count', 2)
     user_id = params.get('user_id')
 
+    timer = ImportTimer('themealdb_import')
+    timer.record('queue_wait', queue_wait_seconds(get_job(job_id)))
+
     # DeepL API configuration
     DEEPL_API_KEY = os.getenv('DEEPL_API_KEY', '')
     DEEPL_API_URL = 'https://api-free.deepl.com/v2/translate'
@@ -63,96 +237,91 @@ def themealdb_import_worker(job_id: str, params: dict, app_context):
         update_job_progress(job_id, 0, count, 'Starting TheMealDB import...')
 
         for i in range(1, count + 1):
+            entry = None
             try:
                 update_job_progress(job_id, i - 1, count, f'Fetching recipe {i}/{count}...')
 
                 # Fetch random meal
-                response = requests.get('https://www.themealdb.com/api/json/v1/1/random.php', timeout=10)
+                with timer.stage('fetch'):
+                    response = requests.get('https://www.themealdb.com/api/json/v1/1/random.php', timeout=10)
                 if response.status_code != 200:
                     failed_recipes.append({'error': 'Failed to fetch recipe'})
                     continue
 
-                meal = response.json()['meals'][0]
+                with timer.stage('parse'):
+                    meal = response.json()['meals'][0]
                 original_title = meal.get('strMeal', 'Unknown')
                 category = meal.get('strCategory', '')
                 area = meal.get('strArea', '')
 
                 update_job_progress(job_id, i - 1, count, f'Translating "{original_title}"...')
 
-                # Translate title
-                translated_title = translate_to_german(original_title)
-
-                # Translate instructions
-                original_instructions = meal.get('strInstructions', '')
-                translated_instructions = translate_to_german(original_instructions)
-
-                # Get and translate ingredients
-                ingredients_de = []
-                for j in range(1, 21):
-                    ingredient = meal.get(f'strIngredient{j}', '').strip()
-                    measure = meal.get(f'strMeasure{j}', '').strip()
-                    if ingredient:
-                        ing_en = f"{measure} {ingredient}".strip()
-                        ing_de = translate_to_german(ing_en)
-                        ingredients_de.append(ing_de)
-
-                # Download image
-                image_filename = None
+                with timer.stage('translate'):
+                    # Translate title
+                    translated_title = translate_to_german(original_title)
+
+                    # Translate instructions
+                    original_instructions = meal.get('strInstructions', '')
+                    translated_instructions = translate_to_german(original_instructions)
+
+                    # Get and translate ingredients
+                    ingredients_de = []
+                    for j in range(1, 21):
+                        ingredient = meal.get(f'strIngredient{j}', '').strip()
+                        measure = meal.get(f'strMeasure{j}', '').strip()
+                        if ingredient:
+                            ing_en = f"{measure} {ingredient}".strip()
+                            ing_de = translate_to_german(ing_en)
+                            ingredients_de.append(ing_de)
+
+                # Image follows via media_fetcher once the recipe is visible
                 image_url = meal.get('strMealThumb')
-                if image_url:
-                    try:
-                        img_response = requests.get(image_url, timeout=10)
-                        img_response.raise_for_status()
-
-                        image_filename = f"{uuid.uuid4()}.jpg"
-                        image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-
-                        with open(image_path, 'wb') as f:
-                            f.write(img_response.content)
-                    except Exception as e:
-                        print(f"Image download failed: {e}")
-
-                # Build notes with SCHRITT format
-                notes = ""
-
-                # Add instructions as steps
-                if translated_instructions:
-                    instruction_lines = [line.strip() for line in translated_instructions.split('\n') if line.strip()]
-                    for idx, line in enumerate(instruction_lines, 1):
-                        notes += f"SCHRITT {idx}\n\n{line}\n\n"
-
-                # Add ingredients
-                if ingredients_de:
-                    notes += "Zutaten:\n"
-                    for ing in ingredients_de:
-                        notes += f"- {ing}\n"
-
-                # Add footer
-                notes += f"\n─────────────────────────\n"
-                notes += f"🌍 Quelle: TheMealDB\n"
-                notes += f"📖 Original: {original_title}\n"
-                notes += f"🏷️ Kategorie: {category}\n"
-                notes += f"🌎 Region: {area}\n"
-                notes += f"🤖 Übersetzt mit DeepL"
+
+                with timer.stage('parse'):
+                    # Build notes with SCHRITT format
+                    notes = ""
+
+                    # Add instructions as steps
+                    if translated_instructions:
+                        instruction_lines = [line.strip() for line in translated_instructions.split('\n') if line.strip()]
+                        for idx, line in enumerate(instruction_lines, 1):
+                            notes += f"SCHRITT {idx}\n\n{line}\n\n"
+
+                    # Add ingredients
+                    if ingredients_de:
+                        notes += "Zutaten:\n"
+                        for ing in ingredients_de:
+                            notes += f"- {ing}\n"
+
+                    # Add footer
+                    notes += f"\n─────────────────────────\n"
+                    notes += f"🌍 Quelle: TheMealDB\n"
+                    notes += f"📖 Original: {original_title}\n"
+                    notes += f"🏷️ Kategorie: {category}\n"
+                    notes += f"🌎 Region: {area}\n"
+                    notes += f"🤖 Übersetzt mit DeepL"
 
                 # Save to database
                 update_job_progress(job_id, i - 1, count, f'Saving "{translated_title}"...')
 
-                recipe = Recipe(
-                    title=translated_title,
-                    image=image_filename,
-                    notes=notes,
-                    user_id=user_id,
-                    auto_imported=True
-                )
-                db.session.add(recipe)
-                db.session.commit()
-
-                imported_recipes.append({
+                with timer.stage('commit'):
+                    recipe = Recipe(
+                        title=translated_title,
+                        notes=notes,
+                        user_id=user_id,
+                        auto_imported=True,
+                        **pending_image(image_url)
+                    )
+                    db.session.add(recipe)
+                    db.session.commit()
+                enqueue_image(recipe.id, image_url)
+
+                entry = {
                     'id': recipe.id,
                     'title': recipe.title,
                     'original_title': original_title
-                })
+                }
+                imported_recipes.append(entry)
 
                 print(f"✓ [{i}/{count}] Imported: {translated_title}")
 
@@ -161,6 +330,14 @@ def themealdb_import_worker(job_id: str, params: dict, app_context):
                 failed_recipes.append({'error': str(e)})
                 db.session.rollback()
 
+            finally:
+                timings = timer.finish_item()
+                if entry is not None:
+                    entry['timings_ms'] = timings
+
+        if imported_recipes:
+            invalidate('recipes', 'stats')
+
         update_job_progress(job_id, count, count, f'Completed! Imported {len(imported_recipes)}/{count}')
 
         return {
@@ -168,7 +345,8 @@ def themealdb_import_worker(job_id: str, params: dict, app_context):
             'imported': len(imported_recipes),
             'failed': len(failed_recipes),
             'recipes': imported_recipes,
-            'failures': failed_recipes
+            'failures': failed_recipes,
+            'timings': timer.summary()
         }
 
 
@@ -181,21 +359,22 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
         - filters: Custom filters (optional)
         - max_recipes: Maximum recipes to import (default: from config)
         - user_id: User ID (optional)
+
+    Every recipe entry carries its stage timings (timings_ms), the result
+    the per-stage percentiles (timings, see import_timing.py).
     """
     from models import db, Recipe, User
-    from config import UPLOAD_FOLDER
-    from recipe_scraper import scrape_recipe_from_url, format_recipe_for_db
+    from recipe_scraper import fetch_recipe_html, scrape_recipe_from_url, format_recipe_for_db
 
-    # Load Migusto config
-    config_path = os.path.join(os.path.dirname(__file__), 'config/shared/migusto-import-config.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)['migusto_import_config']
+    config = get_config('migusto')
+    timer = ImportTimer('migusto_import')
+    timer.record('queue_wait', queue_wait_seconds(get_job(job_id)))
 
     # Get filters
     filters = params.get('filters')
     if not filters:
         # Use preset
-        preset_name = params.get('preset', config['default_preset'])
+        preset_name = params.get('preset') or config['default_preset']
         preset = config['presets'].get(preset_name)
         if not preset:
             raise ValueError(f'Preset {preset_name} not found')
@@ -211,8 +390,10 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
 
     # Fetch overview page
     headers = {'User-Agent': 'Mozilla/5.0'}
+    overview_start = time.perf_counter()
     response = requests.get(overview_url, headers=headers, timeout=15)
     response.raise_for_status()
+    timer.record('overview', time.perf_counter() - overview_start)
 
     # Extract recipe links
     import re
@@ -220,7 +401,7 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
     matches = re.findall(pattern, response.text)
     unique_links = list(set(matches))
 
-    max_recipes = params.get('max_recipes', config.get('max_recipes_per_import', 50))
+    max_recipes = params.get('max_recipes') or config.get('max_recipes_per_import', 50)
     recipe_urls = [f"{base_url}{link}" for link in unique_links[:max_recipes]]
 
     total_recipes = len(recipe_urls)
@@ -239,11 +420,13 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
         delay_ms = config.get('delay_between_imports_ms', 2000)
 
         for i, recipe_url in enumerate(recipe_urls, 1):
+            entry = None
             try:
                 recipe_slug = recipe_url.split('/')[-1]
 
                 # Check if already imported
-                existing = Recipe.query.filter_by(title=recipe_slug).first()
+                with timer.stage('dedup'):
+                    existing = Recipe.query.filter_by(title=recipe_slug).first()
                 if existing:
                     update_job_progress(job_id, i, total_recipes, f'Skipped (exists): {recipe_slug}')
                     skipped_recipes.append({'url': recipe_url, 'reason': 'already_exists'})
@@ -252,60 +435,60 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
                 update_job_progress(job_id, i, total_recipes, f'Importing: {recipe_slug}')
 
                 # Scrape recipe
-                scraped_data = scrape_recipe_from_url(recipe_url)
+                with timer.stage('fetch'):
+                    html_content = fetch_recipe_html(recipe_url)
+                with timer.stage('parse'):
+                    scraped_data = scrape_recipe_from_url(recipe_url, html_content=html_content)
 
                 if not scraped_data.get('title'):
                     failed_recipes.append({'url': recipe_url, 'error': 'no_title'})
                     continue
 
                 # Format for database
-                formatted_data = format_recipe_for_db(scraped_data, source_url=recipe_url)
+                with timer.stage('parse'):
+                    formatted_data = format_recipe_for_db(scraped_data, source_url=recipe_url)
 
-                # Download image
-                image_filename = None
+                # Save to database - the image follows via media_fetcher
                 image_url = formatted_data.get('image')
-                if image_url and image_url.startswith('http'):
-                    try:
-                        img_response = requests.get(image_url, timeout=10, stream=True)
-                        img_response.raise_for_status()
-                        ext = image_url.split('.')[-1].split('?')[0][:4]
-                        if ext not in ['jpg', 'jpeg', 'png', 'webp', 'gif']:
-                            ext = 'jpg'
-                        image_filename = f"{uuid.uuid4()}.{ext}"
-                        image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-                        with open(image_path, 'wb') as f:
-                            shutil.copyfileobj(img_response.raw, f)
-                    except:
-                        pass
-
-                # Save to database
-                recipe = Recipe(
-                    title=formatted_data['title'],
-                    image=image_filename,
-                    notes=formatted_data['notes'],
-                    duration=formatted_data.get('duration'),
-                    rating=formatted_data.get('rating'),
-                    user_id=user_id,
-                    auto_imported=True
-                )
-                db.session.add(recipe)
-                db.session.commit()
-
-                imported_recipes.append({
+                with timer.stage('commit'):
+                    recipe = Recipe(
+                        title=formatted_data['title'],
+                        notes=formatted_data['notes'],
+                        duration=formatted_data.get('duration'),
+                        rating=formatted_data.get('rating'),
+                        user_id=user_id,
+                        auto_imported=True,
+                        **pending_image(image_url)
+                    )
+                    db.session.add(recipe)
+                    db.session.commit()
+                enqueue_image(recipe.id, image_url)
+
+                entry = {
                     'id': recipe.id,
                     'title': recipe.title,
                     'url': recipe_url
-                })
+                }
+                imported_recipes.append(entry)
 
                 # Delay between requests
                 if i < len(recipe_urls):
-                    time.sleep(delay_ms / 1000.0)
+                    with timer.stage('throttle'):
+                        time.sleep(delay_ms / 1000.0)
 
             except Exception as e:
                 print(f"❌ [{i}/{total_recipes}] Failed: {recipe_url} - {e}")
                 failed_recipes.append({'url': recipe_url, 'error': str(e)})
                 db.session.rollback()
 
+            finally:
+                timings = timer.finish_item()
+                if entry is not None:
+                    entry['timings_ms'] = timings
+
+        if imported_recipes:
+            invalidate('recipes', 'stats')
+
         update_job_progress(job_id, total_recipes, total_recipes, f'Completed! Imported {len(imported_recipes)}/{total_recipes}')
 
         return {
@@ -313,7 +496,105 @@ def migusto_import_worker(job_id: str, params: dict, app_context):
             'imported': len(imported_recipes),
             'failed': len(failed_recipes),
             'skipped': len(skipped_recipes),
+            'total_found': total_recipes,
+            'filters': filters,
+            'overview_url': overview_url,
             'recipes': imported_recipes,
             'failures': failed_recipes,
-            'skips': skipped_recipes
+            'skips': skipped_recipes,
+            'timings': timer.summary()
+        }
+
+
+def cleanup_old_imports_worker(job_id: str, params: dict, app_context):
+    """
+    Worker function for deleting old auto-imported recipes
+
+    Deletes in small batches (DELETE ... RETURNING image), each in its own
+    short transaction, so a large purge never holds long locks on recipes.
+    Image files are removed only after the batch is committed.
+
+    Params:
+        - days: Minimum age in days (default: 7)
+        - batch_size: Recipes per transaction (default: 200)
+        - dry_run: Only count, delete nothing (default: False)
+    """
+    from datetime import datetime, timedelta
+    from models import db, Recipe, DiaryEntry
+    from config import UPLOAD_FOLDER
+
+    days = params.get('days', 7)
+    batch_size = params.get('batch_size', 200)
+    dry_run = params.get('dry_run', False)
+    cutoff_date = (datetime.now() - timedelta(days=days)).date()
+
+    # Old auto-imported recipes nobody has cooked (no diary entry)
+    criteria = (
+        Recipe.auto_imported == True,
+        Recipe.erstellt_am < cutoff_date,
+        ~db.exists().where(DiaryEntry.recipe_id == Recipe.id),
+    )
+
+    with app_context:
+        total, with_images = db.session.query(
+            db.func.count(Recipe.id),
+            db.func.count(Recipe.image)
+        ).filter(*criteria).one()
+        db.session.rollback()
+
+        if dry_run:
+            update_job_progress(job_id, 0, total, f'Dry run: {total} recipes would be deleted')
+            return {
+                'success': True,
+                'dry_run': True,
+                'would_delete': total,
+                'with_images': with_images,
+                'cutoff_date': cutoff_date.isoformat()
+            }
+
+        deleted_count = 0
+        removed_images = 0
+        update_job_progress(job_id, 0, total, f'Deleting {total} old imports...')
+
+        while True:
+            # SKIP LOCKED: rows currently touched by other requests are left for the next run
+            batch = db.select(Recipe.id).where(*criteria).order_by(Recipe.id).limit(
+                batch_size
+            ).with_for_update(skip_locked=True)
+
+            rows = db.session.execute(
+                db.delete(Recipe).where(Recipe.id.in_(batch.scalar_subquery())).returning(Recipe.image)
+            ).all()
+            db.session.commit()
+
+            if not rows:
+                break
+
+            deleted_count += len(rows)
+
+            # Files only go once the rows are gone for good
+            for (image,) in rows:
+                if not image:
+                    continue
+                try:
+                    os.remove(os.path.join(UPLOAD_FOLDER, image))
+                    removed_images += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"⚠️ Could not remove image {image}: {e}")
+
+            update_job_progress(job_id, deleted_count, total, f'Deleted {deleted_count}/{total} old imports')
+
+        if deleted_count:
+            invalidate('recipes', 'stats')
+
+        print(f"🧹 Cleanup: deleted {deleted_count} old imports ({removed_images} images)")
+
+        return {
+            'success': True,
+            'dry_run': False,
+            'deleted_count': deleted_count,
+            'removed_images': removed_images,
+            'cutoff_date': cutoff_date.isoformat()
         }
@@ -0,0 +1,121 @@
+"""
+Ingredient Line Parser
+
+Splits ingredient lines ("500g Mehl", "2 EL Olivenöl", "1 Zwiebel, gehackt")
+into quantity, unit and a normalized name. The normalized name is what the
+recipe_ingredients table is indexed by, and search terms go through the same
+normalize_name() so lookups are exact index matches.
+
+Usage:
+    parse_ingredient('1,5 kg Kartoffeln (festkochend)')
+    -> {'quantity': 1.5, 'unit': 'kg', 'name': 'kartoffeln', 'raw': '1,5 kg Kartoffeln (festkochend)'}
+"""
+
+import re
+import unicodedata
+
+# Unit spellings -> canonical unit (lowercase keys)
+UNITS = {
+    'g': 'g', 'gr': 'g', 'gramm': 'g', 'kg': 'kg', 'mg': 'mg',
+    'ml': 'ml', 'cl': 'cl', 'dl': 'dl', 'l': 'l', 'liter': 'l',
+    'el': 'EL', 'essl': 'EL', 'esslöffel': 'EL', 'tbsp': 'EL', 'tbs': 'EL',
+    'tl': 'TL', 'teel': 'TL', 'teelöffel': 'TL', 'tsp': 'TL',
+    'prise': 'Prise', 'prisen': 'Prise', 'pinch': 'Prise',
+    'msp': 'Msp',
+    'stk': 'Stück', 'stück': 'Stück', 'st': 'Stück',
+    'bund': 'Bund', 'bunch': 'Bund',
+    'dose': 'Dose', 'dosen': 'Dose', 'can': 'Dose', 'cans': 'Dose', 'tin': 'Dose',
+    'pck': 'Päckchen', 'pkg': 'Päckchen', 'päckchen': 'Päckchen', 'packung': 'Päckchen',
+    'zehe': 'Zehe', 'zehen': 'Zehe', 'clove': 'Zehe', 'cloves': 'Zehe',
+    'tasse': 'Tasse', 'tassen': 'Tasse', 'cup': 'Tasse', 'cups': 'Tasse',
+    'becher': 'Becher',
+    'scheibe': 'Scheibe', 'scheiben': 'Scheibe', 'slice': 'Scheibe', 'slices': 'Scheibe',
+    'zweig': 'Zweig', 'zweige': 'Zweig', 'sprig': 'Zweig', 'sprigs': 'Zweig',
+    'handvoll': 'Handvoll', 'handful': 'Handvoll',
+    'oz': 'oz', 'lb': 'lb', 'lbs': 'lb',
+}
+
+VULGAR_FRACTIONS = {'½': 0.5, '¼': 0.25, '¾': 0.75, '⅓': 1 / 3, '⅔': 2 / 3, '⅛': 0.125}
+
+# "1", "1,5", "1.5", "1/2", "1 1/2", "½", "1 ½", "1-2" (lower bound is stored)
+QUANTITY = re.compile(
+    r'^(?P<quantity>\d+\s+\d+/\d+|\d+(?:[.,]\d+)?(?:/\d+)?(?:\s*[½¼¾⅓⅔⅛])?|[½¼¾⅓⅔⅛])'
+    r'(?:\s*[-–]\s*\d+(?:[.,]\d+)?)?\s*'
+)
+UNIT = re.compile(r'^(?P<unit>[A-Za-zÄÖÜäöüß]+)\.?(?:\s+|$)')
+BULLET = re.compile(r'^[-•*]\s*')
+PARENTHESES = re.compile(r'\([^)]*\)')
+NON_WORD = re.compile(r'[^\w\s-]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def _to_float(text):
+    if ' ' in text.strip():
+        # Mixed number "1 1/2"
+        return sum(_to_float(part) for part in text.split())
+    text = text.replace(',', '.')
+    fraction = 0.0
+    if text and text[-1] in VULGAR_FRACTIONS:
+        fraction = VULGAR_FRACTIONS[text[-1]]
+        text = text[:-1]
+    if not text:
+        return fraction
+    if '/' in text:
+        numerator, denominator = text.split('/', 1)
+        return float(numerator) / float(denominator) if float(denominator) else None
+    return float(text) + fraction
+
+
+def normalize_name(name):
+    """Canonical lookup key: lowercase, no parentheses/annotations/punctuation"""
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFC', name)
+    name = PARENTHESES.sub(' ', name)
+    # "Zwiebel, fein gehackt" -> "Zwiebel"
+    name = name.split(',')[0]
+    name = NON_WORD.sub(' ', name.lower())
+    return WHITESPACE.sub(' ', name).strip(' -')
+
+
+def parse_ingredient(line):
+    """
+    Split one ingredient line into quantity, unit and normalized name
+
+    Returns:
+        dict with quantity (float|None), unit (str|None), name, raw
+        or None if the line has no name
+    """
+    raw = BULLET.sub('', (line or '').strip())
+    rest = raw
+
+    quantity = None
+    match = QUANTITY.match(rest)
+    if match:
+        try:
+            quantity = _to_float(match.group('quantity'))
+        except ValueError:
+            quantity = None
+        rest = rest[match.end():]
+
+    unit = None
+    match = UNIT.match(rest)
+    if match and match.group('unit').lower() in UNITS and rest[match.end():].strip():
+        unit = UNITS[match.group('unit').lower()]
+        rest = rest[match.end():]
+
+    name = normalize_name(rest)
+    if not name:
+        return None
+
+    return {'quantity': quantity, 'unit': unit, 'name': name[:255], 'raw': raw}
+
+
+def parse_ingredients(lines):
+    """Parse a list of ingredient lines, dropping lines without a name"""
+    parsed = []
+    for line in lines or []:
+        ingredient = parse_ingredient(line)
+        if ingredient:
+            parsed.append(ingredient)
+    return parsed
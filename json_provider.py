@@ -0,0 +1,34 @@
+"""
+Fast JSON provider for the Flask app
+
+Replaces Flask's DefaultJSONProvider (stdlib json, datetimes as HTTP dates)
+for jsonify(), request.get_json() and request.json.
+
+- Encoding via serializers.dumps(): orjson if installed, stdlib json otherwise
+- Native datetime/date handling: naive -> ISO 8601, UTC-aware -> ISO 8601 + 'Z'
+- Response body is built from bytes directly (no bytes -> str -> bytes round trip)
+
+Usage:
+    from json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+"""
+
+from flask.json.provider import JSONProvider
+
+import serializers
+
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider backed by the serializers JSON backend"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        return serializers.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return serializers.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(serializers.dumps(obj) + b'\n', mimetype=self.mimetype)
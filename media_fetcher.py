@@ -0,0 +1,315 @@
+"""
+Media Fetch Stage for imported recipe images
+
+Imports used to download the image before the INSERT, so a slow image CDN
+kept the recipe from appearing at all, and a failed download silently left
+image=None. Now the recipe is committed right away and the image follows:
+
+    recipe = Recipe(title=..., **pending_image(image_url))   # image_status='pending'
+    db.session.add(recipe)
+    db.session.commit()
+    enqueue_image(recipe.id, image_url)
+
+MEDIA_FETCH_WORKERS threads per process download the queued images
+concurrently. A download first claims the recipe (image_status 'pending' ->
+'fetching', a conditional UPDATE), so only one process fetches each image.
+The threads validate the images (HTTP status, size limit MEDIA_MAX_IMAGE_BYTES,
+decodable JPEG/PNG/GIF/WebP), shrink them to MEDIA_MAX_IMAGE_SIZE px on the
+longest side and attach them: image=<file>, image_status='ready'.
+
+Transient errors (timeouts, connection errors, 5xx, 408/429) are retried
+with exponential backoff (MEDIA_FETCH_BACKOFF_SECONDS, doubled per retry)
+up to MEDIA_FETCH_MAX_ATTEMPTS; after that, and on permanent errors (404,
+not an image, too large), image_status becomes 'failed'.
+
+Images whose process died (restart, crash, a CLI command that exited) stay
+'pending' or 'fetching'. Every RESUME_INTERVAL_SECONDS each process claims
+those untouched for CLAIM_TIMEOUT_SECONDS with FOR UPDATE SKIP LOCKED, so
+the gunicorn workers split them instead of each downloading every image.
+The attach only touches recipes this process has claimed, so a download
+that lost its claim is discarded.
+
+Pillow is optional - without it images are recognized by their magic bytes
+and stored unresized.
+
+Usage:
+    init_media_fetcher(app)
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import requests
+
+from cache import invalidate
+from config import (
+    UPLOAD_FOLDER, MEDIA_FETCH_WORKERS, MEDIA_FETCH_MAX_ATTEMPTS, MEDIA_FETCH_BACKOFF_SECONDS,
+    MEDIA_MAX_IMAGE_BYTES, MEDIA_MAX_IMAGE_SIZE
+)
+from metrics import observe_import_stage, observe_media_fetch
+from recipe_scraper import SCRAPER_HEADERS
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+IMAGE_PENDING = 'pending'
+IMAGE_FETCHING = 'fetching'
+IMAGE_READY = 'ready'
+IMAGE_FAILED = 'failed'
+
+CHUNK_SIZE = 64 * 1024
+BACKOFF_MAX_SECONDS = 300
+TRANSIENT_STATUS = (408, 425, 429)
+# Untouched this long = abandoned (downloads time out after 20s, backoff <= 300s)
+CLAIM_TIMEOUT_SECONDS = 600
+RESUME_INTERVAL_SECONDS = 60
+
+# Magic bytes -> file extension (WebP: RIFF....WEBP, see _image_type)
+SIGNATURES = [
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+]
+
+_queue = queue.Queue()
+_app = None
+_started = False
+
+
+class MediaError(Exception):
+    """Image download failed - transient errors are retried"""
+
+    def __init__(self, message, transient=False):
+        super().__init__(message)
+        self.transient = transient
+
+
+# ============================================================================
+# Download, validate, resize
+# ============================================================================
+
+def _image_type(data):
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    for signature, ext in SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return None
+
+
+def process_image(data):
+    """
+    Validate and shrink an image
+
+    Returns:
+        (bytes, extension) - unchanged if it already fits or Pillow is missing
+
+    Raises:
+        MediaError: not a (decodable) image
+    """
+    ext = _image_type(data)
+    if ext is None:
+        raise MediaError('not an image')
+    if Image is None:
+        return data, ext
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image.load()
+            # GIFs keep their animation
+            if ext == 'gif' or max(image.size) <= MEDIA_MAX_IMAGE_SIZE:
+                return data, ext
+
+            image_format = image.format
+            image.thumbnail((MEDIA_MAX_IMAGE_SIZE, MEDIA_MAX_IMAGE_SIZE))
+            output = BytesIO()
+            if image_format == 'JPEG':
+                image.save(output, image_format, quality=85, optimize=True)
+            else:
+                image.save(output, image_format)
+            return output.getvalue(), ext
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise MediaError(f'invalid image: {e}')
+
+
+def download_image(image_url):
+    """
+    Download, validate and store an image in UPLOAD_FOLDER
+
+    Returns:
+        str: filename
+
+    Raises:
+        MediaError: with transient=True if a retry may help
+    """
+    try:
+        response = requests.get(image_url, headers=SCRAPER_HEADERS, timeout=(5, 15), stream=True)
+    except requests.RequestException as e:
+        raise MediaError(str(e), transient=True)
+
+    with response:
+        if response.status_code >= 400:
+            transient = response.status_code >= 500 or response.status_code in TRANSIENT_STATUS
+            raise MediaError(f'HTTP {response.status_code}', transient)
+
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MEDIA_MAX_IMAGE_BYTES:
+            raise MediaError(f'image too large ({content_length} bytes)')
+
+        data = bytearray()
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                data.extend(chunk)
+                if len(data) > MEDIA_MAX_IMAGE_BYTES:
+                    raise MediaError(f'image larger than {MEDIA_MAX_IMAGE_BYTES} bytes')
+        except requests.RequestException as e:
+            raise MediaError(str(e), transient=True)
+
+    resize_start = time.perf_counter()
+    image_data, ext = process_image(bytes(data))
+    observe_import_stage('media_fetch', 'resize', time.perf_counter() - resize_start)
+
+    image_filename = f"{uuid.uuid4()}.{ext}"
+    with open(os.path.join(UPLOAD_FOLDER, image_filename), 'wb') as f:
+        f.write(image_data)
+    return image_filename
+
+
+# ============================================================================
+# Queue
+# ============================================================================
+
+def pending_image(image_url):
+    """Recipe column values for an image that is fetched after the INSERT ({} without URL)"""
+    if not image_url or not image_url.startswith('http'):
+        return {}
+    return {'image_source_url': image_url, 'image_status': IMAGE_PENDING, 'image_attempts': 0}
+
+
+def enqueue_image(recipe_id, image_url, attempt=1):
+    """Queue the image of a committed recipe (see pending_image)"""
+    if recipe_id and image_url and image_url.startswith('http'):
+        _queue.put((recipe_id, image_url, attempt, False))
+
+
+def _update_image(recipe_id, status, **values):
+    """Update a recipe whose image_status is still status - False if it is gone or moved on"""
+    from models import db, Recipe
+
+    with _app.app_context():
+        try:
+            result = db.session.execute(
+                db.update(Recipe)
+                .where(Recipe.id == recipe_id, Recipe.image_status == status)
+                .values(**values)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if result.rowcount and values.get('image_status') in (IMAGE_READY, IMAGE_FAILED):
+            invalidate('recipes', 'stats')
+        return bool(result.rowcount)
+
+
+def _fetch(recipe_id, image_url, attempt, claimed=False):
+    # Attached, failed or claimed by another process meanwhile: nothing to do
+    if not claimed and not _update_image(recipe_id, IMAGE_PENDING, image_status=IMAGE_FETCHING):
+        return
+
+    start = time.perf_counter()
+    try:
+        image_filename = download_image(image_url)
+    except MediaError as e:
+        if e.transient and attempt < MEDIA_FETCH_MAX_ATTEMPTS:
+            delay = min(MEDIA_FETCH_BACKOFF_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+            print(f"⚠️ Image for recipe {recipe_id} failed ({e}), "
+                  f"retry {attempt + 1}/{MEDIA_FETCH_MAX_ATTEMPTS} in {delay:.0f}s")
+            observe_media_fetch('retry')
+            # Released while waiting - the retry claims it again
+            if _update_image(recipe_id, IMAGE_FETCHING, image_status=IMAGE_PENDING, image_attempts=attempt):
+                retry = threading.Timer(delay, enqueue_image, (recipe_id, image_url, attempt + 1))
+                retry.daemon = True
+                retry.start()
+        else:
+            print(f"❌ Image for recipe {recipe_id} failed after {attempt} attempt(s): {e}")
+            observe_media_fetch('failed')
+            _update_image(recipe_id, IMAGE_FETCHING, image_status=IMAGE_FAILED, image_attempts=attempt)
+        return
+    observe_import_stage('media_fetch', 'download', time.perf_counter() - start)
+
+    if _update_image(recipe_id, IMAGE_FETCHING, image=image_filename, image_status=IMAGE_READY,
+                     image_attempts=attempt):
+        observe_media_fetch('ready')
+        print(f"📷 Image attached to recipe {recipe_id}: {image_filename}")
+    else:
+        # Recipe deleted meanwhile or claim taken over after CLAIM_TIMEOUT_SECONDS
+        os.remove(os.path.join(UPLOAD_FOLDER, image_filename))
+
+
+def _worker():
+    while True:
+        recipe_id, image_url, attempt, claimed = _queue.get()
+        try:
+            _fetch(recipe_id, image_url, attempt, claimed)
+        except Exception as e:
+            print(f"❌ Image fetch for recipe {recipe_id} crashed: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _resume_abandoned():
+    """Claim and queue images no process has touched for CLAIM_TIMEOUT_SECONDS"""
+    from models import db, Recipe
+
+    stale = datetime.utcnow() - timedelta(seconds=CLAIM_TIMEOUT_SECONDS)
+    claimable = db.select(Recipe.id).where(
+        Recipe.image_status.in_((IMAGE_PENDING, IMAGE_FETCHING)),
+        Recipe.updated_at < stale
+    ).with_for_update(skip_locked=True)
+
+    with _app.app_context():
+        try:
+            rows = db.session.execute(
+                db.update(Recipe)
+                .where(Recipe.id.in_(claimable.scalar_subquery()))
+                .values(image_status=IMAGE_FETCHING)
+                .returning(Recipe.id, Recipe.image_source_url, Recipe.image_attempts)
+            ).all()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ Could not resume pending images: {e}")
+            return
+
+    for recipe_id, image_url, attempts in rows:
+        _queue.put((recipe_id, image_url, (attempts or 0) + 1, True))
+    if rows:
+        print(f"📷 Resuming {len(rows)} abandoned image(s)")
+
+
+def _resume_forever():
+    # First run after one interval: short-lived CLI processes never claim anything
+    while True:
+        time.sleep(RESUME_INTERVAL_SECONDS)
+        _resume_abandoned()
+
+
+def init_media_fetcher(app):
+    """Start the downloader threads and the resume loop (once per process)"""
+    global _app, _started
+    if _started:
+        return
+    _app = app
+    _started = True
+    for number in range(max(MEDIA_FETCH_WORKERS, 1)):
+        threading.Thread(target=_worker, name=f'media-fetcher-{number}', daemon=True).start()
+    threading.Thread(target=_resume_forever, name='media-fetcher-resume', daemon=True).start()
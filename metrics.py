@@ -0,0 +1,277 @@
+"""
+Prometheus Metrics (per-route latency, status codes, DB and upstream timing)
+
+Collected per request:
+    http_requests_total{method, endpoint, status}
+    http_request_duration_seconds{method, endpoint}        (histogram)
+    http_requests_in_progress{method, endpoint}            (gauge)
+    http_request_db_queries{endpoint}                      (histogram, queries per request)
+    http_request_db_seconds{endpoint}                      (histogram, DB time per request)
+Collected per outbound HTTP call (requests library, also in background jobs):
+    upstream_request_duration_seconds{host, status}        (histogram)
+Collected per connection pool checkout (see db_pool.py):
+    db_pool_checkout_seconds                               (histogram, wait incl. connect)
+    db_pool_connections_in_use                             (gauge)
+Collected per import stage (see import_timing.py):
+    import_stage_duration_seconds{job_type, stage}         (histogram)
+Collected per recipe image download attempt (see media_fetcher.py):
+    media_fetch_total{result}                              (ready / retry / failed)
+
+endpoint is the URL rule ("/api/recipes/<int:recipe_id>"), so label
+cardinality stays bounded.
+
+Gunicorn runs several worker processes. With PROMETHEUS_MULTIPROC_DIR set
+(see gunicorn.conf.py) every worker writes its samples to files in that
+directory and GET /metrics merges all of them, no matter which worker
+answers the scrape.
+
+prometheus_client is optional - without it the hooks are not installed and
+/metrics returns 503.
+
+Usage:
+    from metrics import init_metrics
+    init_metrics(app)
+"""
+
+import os
+import time
+from urllib.parse import urlsplit
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import METRICS_ENABLED
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+    from prometheus_client import multiprocess
+except ImportError:  # optional dependency
+    prometheus_client = None
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+if prometheus_client is not None:
+    HTTP_REQUESTS = Counter(
+        'http_requests_total', 'HTTP requests by route and status',
+        ['method', 'endpoint', 'status']
+    )
+    HTTP_LATENCY = Histogram(
+        'http_request_duration_seconds', 'HTTP request latency by route',
+        ['method', 'endpoint'],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 90)
+    )
+    HTTP_IN_PROGRESS = Gauge(
+        'http_requests_in_progress', 'HTTP requests currently being handled',
+        ['method', 'endpoint'], multiprocess_mode='livesum'
+    )
+    DB_QUERIES = Histogram(
+        'http_request_db_queries', 'SQL statements executed per request',
+        ['endpoint'],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+    )
+    DB_SECONDS = Histogram(
+        'http_request_db_seconds', 'Time spent in SQL statements per request',
+        ['endpoint'],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+    )
+    UPSTREAM_LATENCY = Histogram(
+        'upstream_request_duration_seconds', 'Outbound HTTP call latency by host',
+        ['host', 'status'],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+    )
+    DB_POOL_CHECKOUT = Histogram(
+        'db_pool_checkout_seconds', 'Time to get a connection from the pool (incl. new connects)',
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    )
+    DB_POOL_IN_USE = Gauge(
+        'db_pool_connections_in_use', 'Pooled connections currently checked out',
+        multiprocess_mode='livesum'
+    )
+    IMPORT_STAGE_LATENCY = Histogram(
+        'import_stage_duration_seconds', 'Import job stage duration (per recipe or per job)',
+        ['job_type', 'stage'],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+    )
+    MEDIA_FETCHES = Counter(
+        'media_fetch_total', 'Recipe image download attempts by result',
+        ['result']
+    )
+
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+# ============================================================================
+# Request hooks
+# ============================================================================
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = _endpoint()
+    g.metrics_db_queries = 0
+    g.metrics_db_seconds = 0.0
+    HTTP_IN_PROGRESS.labels(request.method, g.metrics_endpoint).inc()
+
+
+def _after_request(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def observe_request(method, endpoint, status, seconds):
+    """Record a request handled outside Flask (native ASGI routes, see asgi.py)"""
+    if metrics_available():
+        HTTP_LATENCY.labels(method, endpoint).observe(seconds)
+        HTTP_REQUESTS.labels(method, endpoint, str(status)).inc()
+
+
+def _teardown_request(exc):
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    endpoint = g.metrics_endpoint
+    # No after_request on unhandled exceptions
+    status = g.pop('metrics_status', 500)
+
+    HTTP_IN_PROGRESS.labels(request.method, endpoint).dec()
+    HTTP_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - start)
+    HTTP_REQUESTS.labels(request.method, endpoint, str(status)).inc()
+    DB_QUERIES.labels(endpoint).observe(g.metrics_db_queries)
+    DB_SECONDS.labels(endpoint).observe(g.metrics_db_seconds)
+
+
+# ============================================================================
+# SQLAlchemy hooks (all engines, counted only inside requests)
+# ============================================================================
+
+# One cursor hook pair for all consumers (metrics, query_profiler.py)
+_query_observers = []
+
+
+def add_query_observer(observer):
+    """Call observer(statement, seconds) after every SQL statement"""
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Per statement, not per connection: a statement that raises never reaches
+    # after_cursor_execute, and its start time goes away with its context
+    if context is not None:
+        context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, 'query_start', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    for observer in _query_observers:
+        observer(statement, elapsed)
+
+
+def _count_query(statement, seconds):
+    if has_request_context() and 'metrics_db_queries' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_seconds += seconds
+
+
+# ============================================================================
+# Outbound HTTP (requests library)
+# ============================================================================
+
+def _instrument_requests():
+    """Time every requests.Session.send (requests.get/post use it too)"""
+    import requests
+
+    send = requests.Session.send
+    if getattr(send, '_metrics_wrapped', False):
+        return
+
+    def timed_send(self, prepared, **kwargs):
+        host = urlsplit(prepared.url).hostname or 'unknown'
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            response = send(self, prepared, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            UPSTREAM_LATENCY.labels(host, status).observe(time.perf_counter() - start)
+
+    timed_send._metrics_wrapped = True
+    requests.Session.send = timed_send
+
+
+# ============================================================================
+# Connection pool (hooks in db_pool.py)
+# ============================================================================
+
+def observe_pool_checkout(seconds):
+    """Record how long a pool checkout waited (no-op without metrics)"""
+    if metrics_available():
+        DB_POOL_CHECKOUT.observe(seconds)
+
+
+def track_pool_in_use(delta):
+    """+1 on checkout, -1 on checkin (no-op without metrics)"""
+    if metrics_available():
+        DB_POOL_IN_USE.inc(delta)
+
+
+# ============================================================================
+# Background jobs
+# ============================================================================
+
+def observe_import_stage(job_type, stage, seconds):
+    """Record one import stage duration (no-op without metrics)"""
+    if metrics_available():
+        IMPORT_STAGE_LATENCY.labels(job_type, stage).observe(seconds)
+
+
+def observe_media_fetch(result):
+    """Count one image download attempt: ready, retry or failed (no-op without metrics)"""
+    if metrics_available():
+        MEDIA_FETCHES.labels(result).inc()
+
+
+# ============================================================================
+# Exposition
+# ============================================================================
+
+def render_metrics():
+    """(body, content_type) in Prometheus text format - merged across workers if multiprocess"""
+    if MULTIPROC_DIR:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def metrics_available():
+    return METRICS_ENABLED and prometheus_client is not None
+
+
+def init_metrics(app):
+    """Register request/DB/upstream instrumentation on the Flask app"""
+    if not METRICS_ENABLED:
+        return
+    if prometheus_client is None:
+        print("⚠️ prometheus_client not installed - metrics disabled")
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+    add_query_observer(_count_query)
+
+    _instrument_requests()
@@ -0,0 +1,45 @@
+"""Add parsed notes columns to recipes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:00:00.000000
+
+Changes:
+- Add notes_steps, notes_ingredients, notes_metadata (JSONB) to recipes
+- Filled at write time by the server-side notes parser (notes_parser.py)
+- Existing rows: run `flask --app app backfill-parsed-notes` after upgrade
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add structured notes columns to recipes (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    columns = [col['name'] for col in inspector.get_columns('recipes')]
+
+    for column in ('notes_steps', 'notes_ingredients', 'notes_metadata'):
+        if column not in columns:
+            op.add_column('recipes',
+                sa.Column(column, postgresql.JSONB(), nullable=True)
+            )
+
+
+def downgrade() -> None:
+    """
+    Remove structured notes columns from recipes
+    """
+    op.drop_column('recipes', 'notes_metadata')
+    op.drop_column('recipes', 'notes_ingredients')
+    op.drop_column('recipes', 'notes_steps')
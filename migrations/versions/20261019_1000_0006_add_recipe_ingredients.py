@@ -0,0 +1,53 @@
+"""Add normalized recipe_ingredients table
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:00:00.000000
+
+Changes:
+- New table recipe_ingredients (quantity, unit, normalized name per line)
+- Index (name, recipe_id) for "which recipes use X" lookups
+- Filled on write via the Recipe.notes validator (ingredients.py)
+- Existing rows: run `flask --app app backfill-parsed-notes` after upgrade
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create recipe_ingredients (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+
+    if 'recipe_ingredients' not in inspector.get_table_names():
+        op.create_table('recipe_ingredients',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('recipe_id', sa.Integer(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('quantity', sa.Float(), nullable=True),
+            sa.Column('unit', sa.String(length=32), nullable=True),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('raw', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('idx_recipe_ingredients_name_recipe', 'recipe_ingredients', ['name', 'recipe_id'])
+        op.create_index('idx_recipe_ingredients_recipe_id', 'recipe_ingredients', ['recipe_id'])
+
+
+def downgrade() -> None:
+    """
+    Drop recipe_ingredients
+    """
+    op.drop_index('idx_recipe_ingredients_recipe_id', 'recipe_ingredients')
+    op.drop_index('idx_recipe_ingredients_name_recipe', 'recipe_ingredients')
+    op.drop_table('recipe_ingredients')
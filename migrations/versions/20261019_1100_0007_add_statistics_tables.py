@@ -0,0 +1,187 @@
+"""Add precomputed statistics tables maintained by triggers
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 11:00:00.000000
+
+Changes:
+- New table stats_counters (scope, key) -> value
+- New table recipe_stats (cook_count, rating_sum, rating_count per recipe)
+- Trigger functions on recipes / diary_entries keep both tables up to date
+- Initial fill from existing rows
+
+The SQL is a snapshot of stats.py at the time of this revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+SOURCE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION recipe_source(metadata JSONB, auto_imported BOOLEAN) RETURNS TEXT AS $$
+    SELECT COALESCE(NULLIF(metadata->>'source', ''),
+                    CASE WHEN auto_imported THEN 'Import' ELSE 'Eigene' END)
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION stats_bump(p_scope TEXT, p_key TEXT, p_delta BIGINT) RETURNS void AS $$
+BEGIN
+    IF p_delta = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO stats_counters (scope, key, value) VALUES (p_scope, p_key, p_delta)
+    ON CONFLICT (scope, key) DO UPDATE SET value = stats_counters.value + EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+RECIPES_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION stats_recipes_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM stats_bump('recipes', 'total', -1);
+        END IF;
+        IF OLD.image IS NOT NULL THEN
+            PERFORM stats_bump('recipes', 'with_images', -1);
+        END IF;
+        PERFORM stats_bump('recipes_by_user', COALESCE(OLD.user_id::text, 'none'), -1);
+        PERFORM stats_bump('recipes_by_source', recipe_source(OLD.notes_metadata, OLD.auto_imported), -1);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM stats_bump('recipes', 'total', 1);
+        END IF;
+        IF NEW.image IS NOT NULL THEN
+            PERFORM stats_bump('recipes', 'with_images', 1);
+        END IF;
+        PERFORM stats_bump('recipes_by_user', COALESCE(NEW.user_id::text, 'none'), 1);
+        PERFORM stats_bump('recipes_by_source', recipe_source(NEW.notes_metadata, NEW.auto_imported), 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_recipes ON recipes;
+CREATE TRIGGER trg_stats_recipes
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, image, auto_imported, notes_metadata ON recipes
+    FOR EACH ROW EXECUTE FUNCTION stats_recipes_trigger();
+"""
+
+DIARY_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM stats_bump('diary', 'total', -1);
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM stats_bump('diary', 'total', 1);
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(OLD.date, 'YYYY-MM'), -1);
+        IF OLD.recipe_id IS NOT NULL THEN
+            -- Row may already be gone (recipe deleted -> ON DELETE SET NULL)
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(NEW.date, 'YYYY-MM'), 1);
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count;
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_diary ON diary_entries;
+CREATE TRIGGER trg_stats_diary
+    AFTER INSERT OR DELETE OR UPDATE OF date, recipe_id, rating ON diary_entries
+    FOR EACH ROW EXECUTE FUNCTION stats_diary_trigger();
+"""
+
+INITIAL_FILL_SQL = """
+INSERT INTO stats_counters (scope, key, value)
+          SELECT 'recipes', 'total', count(*) FROM recipes
+UNION ALL SELECT 'recipes', 'with_images', count(*) FROM recipes WHERE image IS NOT NULL
+UNION ALL SELECT 'recipes_by_user', COALESCE(user_id::text, 'none'), count(*) FROM recipes GROUP BY 2
+UNION ALL SELECT 'recipes_by_source', recipe_source(notes_metadata, auto_imported), count(*) FROM recipes GROUP BY 2
+UNION ALL SELECT 'diary', 'total', count(*) FROM diary_entries
+UNION ALL SELECT 'diary_by_month', to_char(date, 'YYYY-MM'), count(*) FROM diary_entries GROUP BY 2;
+
+INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count)
+SELECT recipe_id, count(*), COALESCE(sum(rating), 0), count(rating)
+FROM diary_entries
+WHERE recipe_id IS NOT NULL
+GROUP BY recipe_id;
+"""
+
+
+def upgrade() -> None:
+    """
+    Create summary tables, install triggers, fill from existing data
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    existing_tables = inspector.get_table_names()
+
+    if 'stats_counters' not in existing_tables:
+        op.create_table('stats_counters',
+            sa.Column('scope', sa.String(length=64), nullable=False),
+            sa.Column('key', sa.String(length=255), nullable=False),
+            sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('scope', 'key')
+        )
+
+    if 'recipe_stats' not in existing_tables:
+        op.create_table('recipe_stats',
+            sa.Column('recipe_id', sa.Integer(), nullable=False),
+            sa.Column('cook_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('recipe_id')
+        )
+        op.create_index('idx_recipe_stats_cook_count', 'recipe_stats', ['cook_count'])
+
+    op.execute(SOURCE_FUNCTION_SQL)
+    op.execute(RECIPES_TRIGGER_SQL)
+    op.execute(DIARY_TRIGGER_SQL)
+
+    op.execute('DELETE FROM stats_counters')
+    op.execute('DELETE FROM recipe_stats')
+    op.execute(INITIAL_FILL_SQL)
+
+
+def downgrade() -> None:
+    """
+    Remove triggers, functions and summary tables
+    """
+    op.execute('DROP TRIGGER IF EXISTS trg_stats_diary ON diary_entries')
+    op.execute('DROP TRIGGER IF EXISTS trg_stats_recipes ON recipes')
+    op.execute('DROP FUNCTION IF EXISTS stats_diary_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS stats_recipes_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS stats_bump(TEXT, TEXT, BIGINT)')
+    op.execute('DROP FUNCTION IF EXISTS recipe_source(JSONB, BOOLEAN)')
+
+    op.drop_index('idx_recipe_stats_cook_count', 'recipe_stats')
+    op.drop_table('recipe_stats')
+    op.drop_table('stats_counters')
@@ -0,0 +1,137 @@
+"""Add last_cooked to recipe_stats
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 12:00:00.000000
+
+Changes:
+- recipe_stats.last_cooked (DATE) + index, for sort=recently_cooked
+- stats_diary_trigger() maintains last_cooked (snapshot of stats.py)
+- Fill last_cooked from existing diary entries
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+DIARY_TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM stats_bump('diary', 'total', -1);
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM stats_bump('diary', 'total', 1);
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(OLD.date, 'YYYY-MM'), -1);
+        IF OLD.recipe_id IS NOT NULL THEN
+            -- Row may already be gone (recipe deleted -> ON DELETE SET NULL)
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int,
+                last_cooked = CASE
+                    WHEN last_cooked IS DISTINCT FROM OLD.date THEN last_cooked
+                    -- Latest entry removed/moved: index lookup on diary_entries.recipe_id
+                    ELSE (SELECT max(date) FROM diary_entries WHERE recipe_id = OLD.recipe_id)
+                END
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(NEW.date, 'YYYY-MM'), 1);
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count, last_cooked)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int, NEW.date)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count,
+                last_cooked = GREATEST(recipe_stats.last_cooked, EXCLUDED.last_cooked);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_DIARY_TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM stats_bump('diary', 'total', -1);
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM stats_bump('diary', 'total', 1);
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(OLD.date, 'YYYY-MM'), -1);
+        IF OLD.recipe_id IS NOT NULL THEN
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(NEW.date, 'YYYY-MM'), 1);
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count;
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """
+    Add recipe_stats.last_cooked (idempotent) and maintain it in the diary trigger
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    columns = [col['name'] for col in inspector.get_columns('recipe_stats')]
+
+    if 'last_cooked' not in columns:
+        op.add_column('recipe_stats', sa.Column('last_cooked', sa.Date(), nullable=True))
+        op.create_index('idx_recipe_stats_last_cooked', 'recipe_stats', ['last_cooked'])
+
+    op.execute(DIARY_TRIGGER_FUNCTION_SQL)
+
+    op.execute("""
+        UPDATE recipe_stats SET last_cooked = latest.date
+        FROM (
+            SELECT recipe_id, max(date) AS date
+            FROM diary_entries
+            WHERE recipe_id IS NOT NULL
+            GROUP BY recipe_id
+        ) AS latest
+        WHERE recipe_stats.recipe_id = latest.recipe_id
+    """)
+
+
+def downgrade() -> None:
+    """
+    Restore the previous diary trigger function and drop last_cooked
+    """
+    op.execute(PREVIOUS_DIARY_TRIGGER_FUNCTION_SQL)
+    op.drop_index('idx_recipe_stats_last_cooked', 'recipe_stats')
+    op.drop_column('recipe_stats', 'last_cooked')
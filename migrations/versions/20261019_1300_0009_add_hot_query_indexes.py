@@ -0,0 +1,68 @@
+"""Add partial and trigram indexes for hot queries
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 13:00:00.000000
+
+Changes:
+- Partial index recipes(erstellt_am) WHERE auto_imported (cleanup of old imports),
+  replaces the low-selectivity boolean index idx_recipes_auto_imported
+- recipes(created_at) for the newest-first catalog
+- diary_entries(user_id, date, created_at) for the per-user diary list
+- pg_trgm GIN indexes on recipes.title / recipes.notes for ILIKE '%term%' search
+
+Plans are checked by tests/test_query_plans.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create indexes (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    recipe_indexes = [idx['name'] for idx in inspector.get_indexes('recipes')]
+    diary_indexes = [idx['name'] for idx in inspector.get_indexes('diary_entries')]
+
+    if 'idx_recipes_auto_imported_erstellt_am' not in recipe_indexes:
+        op.create_index('idx_recipes_auto_imported_erstellt_am', 'recipes', ['erstellt_am'],
+                        postgresql_where=sa.text('auto_imported'))
+    if 'idx_recipes_auto_imported' in recipe_indexes:
+        op.drop_index('idx_recipes_auto_imported', 'recipes')
+
+    if 'idx_recipes_created_at' not in recipe_indexes:
+        op.create_index('idx_recipes_created_at', 'recipes', ['created_at'])
+
+    if 'idx_diary_entries_user_date' not in diary_indexes:
+        op.create_index('idx_diary_entries_user_date', 'diary_entries',
+                        ['user_id', sa.text('date DESC'), sa.text('created_at DESC')])
+
+    # pg_trgm is a trusted extension (PostgreSQL 13+): the database owner may create it
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    if 'idx_recipes_title_trgm' not in recipe_indexes:
+        op.create_index('idx_recipes_title_trgm', 'recipes', ['title'],
+                        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    if 'idx_recipes_notes_trgm' not in recipe_indexes:
+        op.create_index('idx_recipes_notes_trgm', 'recipes', ['notes'],
+                        postgresql_using='gin', postgresql_ops={'notes': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """
+    Drop the indexes and restore idx_recipes_auto_imported
+    """
+    op.drop_index('idx_recipes_notes_trgm', 'recipes')
+    op.drop_index('idx_recipes_title_trgm', 'recipes')
+    op.drop_index('idx_diary_entries_user_date', 'diary_entries')
+    op.drop_index('idx_recipes_created_at', 'recipes')
+    op.create_index('idx_recipes_auto_imported', 'recipes', ['auto_imported'])
+    op.drop_index('idx_recipes_auto_imported_erstellt_am', 'recipes')
@@ -0,0 +1,51 @@
+"""Add image fetch state to recipes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 14:00:00.000000
+
+Changes:
+- recipes.image_source_url, image_status, image_attempts: imported recipes are
+  committed first, media_fetcher.py downloads and attaches the image afterwards
+- Partial index on image_status = 'pending' (resumed on startup)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add the image fetch columns (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    columns = [col['name'] for col in inspector.get_columns('recipes')]
+    indexes = [idx['name'] for idx in inspector.get_indexes('recipes')]
+
+    if 'image_source_url' not in columns:
+        op.add_column('recipes', sa.Column('image_source_url', sa.Text(), nullable=True))
+    if 'image_status' not in columns:
+        op.add_column('recipes', sa.Column('image_status', sa.Text(), nullable=True))
+    if 'image_attempts' not in columns:
+        op.add_column('recipes', sa.Column('image_attempts', sa.Integer(), nullable=True, server_default='0'))
+
+    if 'idx_recipes_image_pending' not in indexes:
+        op.create_index('idx_recipes_image_pending', 'recipes', ['id'],
+                        postgresql_where=sa.text("image_status = 'pending'"))
+
+
+def downgrade() -> None:
+    """
+    Drop the image fetch columns
+    """
+    op.drop_index('idx_recipes_image_pending', 'recipes')
+    op.drop_column('recipes', 'image_attempts')
+    op.drop_column('recipes', 'image_status')
+    op.drop_column('recipes', 'image_source_url')
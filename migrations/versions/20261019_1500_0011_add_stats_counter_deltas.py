@@ -0,0 +1,318 @@
+"""Move statistics counters to statement-level triggers with append-only deltas
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 15:00:00.000000
+
+Changes:
+- New table stats_counter_deltas (scope, key, value), no unique key
+- recipes / diary_entries: FOR EACH STATEMENT triggers aggregate the transition
+  tables into stats_counter_deltas instead of upserting the shared
+  stats_counters rows per row (every write serialized on ('recipes', 'total'))
+- stats_diary_trigger() only maintains recipe_stats
+- stats_recipes_trigger() / stats_bump() dropped
+
+The SQL is a snapshot of stats.py at the time of this revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+RECIPES_TRIGGER_SQL = """DROP TRIGGER IF EXISTS trg_stats_recipes ON recipes;
+
+CREATE OR REPLACE FUNCTION stats_recipes_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        WITH changes AS (SELECT 1 AS sign, * FROM new_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('recipes', 'total'),
+            ('recipes', CASE WHEN c.image IS NOT NULL THEN 'with_images' END),
+            ('recipes_by_user', COALESCE(c.user_id::text, 'none')),
+            ('recipes_by_source', recipe_source(c.notes_metadata, c.auto_imported))
+        ) AS k(scope, key)
+        WHERE k.key IS NOT NULL
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    ELSIF TG_OP = 'DELETE' THEN
+        WITH changes AS (SELECT -1 AS sign, * FROM old_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('recipes', 'total'),
+            ('recipes', CASE WHEN c.image IS NOT NULL THEN 'with_images' END),
+            ('recipes_by_user', COALESCE(c.user_id::text, 'none')),
+            ('recipes_by_source', recipe_source(c.notes_metadata, c.auto_imported))
+        ) AS k(scope, key)
+        WHERE k.key IS NOT NULL
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    ELSE
+        WITH changes AS (SELECT 1 AS sign, * FROM new_rows UNION ALL SELECT -1 AS sign, * FROM old_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('recipes', 'total'),
+            ('recipes', CASE WHEN c.image IS NOT NULL THEN 'with_images' END),
+            ('recipes_by_user', COALESCE(c.user_id::text, 'none')),
+            ('recipes_by_source', recipe_source(c.notes_metadata, c.auto_imported))
+        ) AS k(scope, key)
+        WHERE k.key IS NOT NULL
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_insert ON recipes;
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_update ON recipes;
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_delete ON recipes;
+CREATE TRIGGER trg_stats_recipes_counters_insert AFTER INSERT ON recipes
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_recipes_counters();
+CREATE TRIGGER trg_stats_recipes_counters_update AFTER UPDATE ON recipes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_recipes_counters();
+CREATE TRIGGER trg_stats_recipes_counters_delete AFTER DELETE ON recipes
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_recipes_counters();
+
+DROP FUNCTION IF EXISTS stats_recipes_trigger();
+"""
+
+DIARY_TRIGGER_SQL = """CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    -- Per recipe only - the diary counters come from stats_diary_counters()
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.recipe_id IS NOT NULL THEN
+            -- Row may already be gone (recipe deleted -> ON DELETE SET NULL)
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int,
+                last_cooked = CASE
+                    WHEN last_cooked IS DISTINCT FROM OLD.date THEN last_cooked
+                    -- Latest entry removed/moved: index lookup on diary_entries.recipe_id
+                    ELSE (SELECT max(date) FROM diary_entries WHERE recipe_id = OLD.recipe_id)
+                END
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count, last_cooked)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int, NEW.date)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count,
+                last_cooked = GREATEST(recipe_stats.last_cooked, EXCLUDED.last_cooked);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_diary ON diary_entries;
+CREATE TRIGGER trg_stats_diary
+    AFTER INSERT OR DELETE OR UPDATE OF date, recipe_id, rating ON diary_entries
+    FOR EACH ROW EXECUTE FUNCTION stats_diary_trigger();
+
+CREATE OR REPLACE FUNCTION stats_diary_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        WITH changes AS (SELECT 1 AS sign, * FROM new_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('diary', 'total'),
+            ('diary_by_month', to_char(c.date, 'YYYY-MM'))
+        ) AS k(scope, key)
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    ELSIF TG_OP = 'DELETE' THEN
+        WITH changes AS (SELECT -1 AS sign, * FROM old_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('diary', 'total'),
+            ('diary_by_month', to_char(c.date, 'YYYY-MM'))
+        ) AS k(scope, key)
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    ELSE
+        WITH changes AS (SELECT 1 AS sign, * FROM new_rows UNION ALL SELECT -1 AS sign, * FROM old_rows)
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('diary', 'total'),
+            ('diary_by_month', to_char(c.date, 'YYYY-MM'))
+        ) AS k(scope, key)
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_insert ON diary_entries;
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_update ON diary_entries;
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_delete ON diary_entries;
+CREATE TRIGGER trg_stats_diary_counters_insert AFTER INSERT ON diary_entries
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_diary_counters();
+CREATE TRIGGER trg_stats_diary_counters_update AFTER UPDATE ON diary_entries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_diary_counters();
+CREATE TRIGGER trg_stats_diary_counters_delete AFTER DELETE ON diary_entries
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_diary_counters();
+"""
+
+FOLD_SQL = """WITH folded AS (
+    DELETE FROM stats_counter_deltas RETURNING scope, key, value
+)
+INSERT INTO stats_counters (scope, key, value)
+SELECT scope, key, sum(value) FROM folded GROUP BY scope, key
+ON CONFLICT (scope, key) DO UPDATE SET value = stats_counters.value + EXCLUDED.value;
+"""
+
+PREVIOUS_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_insert ON recipes;
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_update ON recipes;
+DROP TRIGGER IF EXISTS trg_stats_recipes_counters_delete ON recipes;
+DROP FUNCTION IF EXISTS stats_recipes_counters();
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_insert ON diary_entries;
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_update ON diary_entries;
+DROP TRIGGER IF EXISTS trg_stats_diary_counters_delete ON diary_entries;
+DROP FUNCTION IF EXISTS stats_diary_counters();
+CREATE OR REPLACE FUNCTION stats_bump(p_scope TEXT, p_key TEXT, p_delta BIGINT) RETURNS void AS $$
+BEGIN
+    IF p_delta = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO stats_counters (scope, key, value) VALUES (p_scope, p_key, p_delta)
+    ON CONFLICT (scope, key) DO UPDATE SET value = stats_counters.value + EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql;
+CREATE OR REPLACE FUNCTION stats_recipes_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM stats_bump('recipes', 'total', -1);
+        END IF;
+        IF OLD.image IS NOT NULL THEN
+            PERFORM stats_bump('recipes', 'with_images', -1);
+        END IF;
+        PERFORM stats_bump('recipes_by_user', COALESCE(OLD.user_id::text, 'none'), -1);
+        PERFORM stats_bump('recipes_by_source', recipe_source(OLD.notes_metadata, OLD.auto_imported), -1);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM stats_bump('recipes', 'total', 1);
+        END IF;
+        IF NEW.image IS NOT NULL THEN
+            PERFORM stats_bump('recipes', 'with_images', 1);
+        END IF;
+        PERFORM stats_bump('recipes_by_user', COALESCE(NEW.user_id::text, 'none'), 1);
+        PERFORM stats_bump('recipes_by_source', recipe_source(NEW.notes_metadata, NEW.auto_imported), 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_recipes ON recipes;
+CREATE TRIGGER trg_stats_recipes
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, image, auto_imported, notes_metadata ON recipes
+    FOR EACH ROW EXECUTE FUNCTION stats_recipes_trigger();
+CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM stats_bump('diary', 'total', -1);
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM stats_bump('diary', 'total', 1);
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(OLD.date, 'YYYY-MM'), -1);
+        IF OLD.recipe_id IS NOT NULL THEN
+            -- Row may already be gone (recipe deleted -> ON DELETE SET NULL)
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int,
+                last_cooked = CASE
+                    WHEN last_cooked IS DISTINCT FROM OLD.date THEN last_cooked
+                    -- Latest entry removed/moved: index lookup on diary_entries.recipe_id
+                    ELSE (SELECT max(date) FROM diary_entries WHERE recipe_id = OLD.recipe_id)
+                END
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM stats_bump('diary_by_month', to_char(NEW.date, 'YYYY-MM'), 1);
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count, last_cooked)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int, NEW.date)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count,
+                last_cooked = GREATEST(recipe_stats.last_cooked, EXCLUDED.last_cooked);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS trg_stats_diary ON diary_entries;
+CREATE TRIGGER trg_stats_diary
+    AFTER INSERT OR DELETE OR UPDATE OF date, recipe_id, rating ON diary_entries
+    FOR EACH ROW EXECUTE FUNCTION stats_diary_trigger();
+"""
+
+
+def upgrade() -> None:
+    """
+    Create stats_counter_deltas (idempotent) and replace the counter triggers
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+
+    if 'stats_counter_deltas' not in inspector.get_table_names():
+        op.create_table(
+            'stats_counter_deltas',
+            sa.Column('id', sa.BigInteger(), primary_key=True),
+            sa.Column('scope', sa.String(64), nullable=False),
+            sa.Column('key', sa.String(255), nullable=False),
+            sa.Column('value', sa.BigInteger(), nullable=False)
+        )
+
+    # Counters are unchanged - the new triggers only add deltas from now on
+    op.execute(RECIPES_TRIGGER_SQL)
+    op.execute(DIARY_TRIGGER_SQL)
+    op.execute("DROP FUNCTION IF EXISTS stats_bump(TEXT, TEXT, BIGINT)")
+
+
+def downgrade() -> None:
+    """
+    Fold pending deltas, restore the row-level triggers and drop stats_counter_deltas
+    """
+    op.execute("LOCK TABLE recipes, diary_entries IN SHARE MODE")
+    op.execute(FOLD_SQL)
+    op.execute(PREVIOUS_TRIGGER_SQL)
+    op.drop_table('stats_counter_deltas')
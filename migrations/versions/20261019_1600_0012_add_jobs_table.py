@@ -0,0 +1,54 @@
+"""Add jobs table for background jobs
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 16:00:00.000000
+
+Changes:
+- New table jobs: background job records (background_jobs.py) used to live in
+  the memory of the gunicorn worker that created them, so polling
+  /api/jobs/<id> failed whenever another worker answered
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create jobs table (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+
+    if 'jobs' not in inspector.get_table_names():
+        op.create_table(
+            'jobs',
+            sa.Column('id', sa.String(36), primary_key=True),
+            sa.Column('job_type', sa.String(64), nullable=False),
+            sa.Column('status', sa.String(16), nullable=False),
+            sa.Column('params', postgresql.JSONB(), nullable=True),
+            sa.Column('result', postgresql.JSONB(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('progress', postgresql.JSONB(), nullable=True),
+            sa.Column('profile_url', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True)
+        )
+        op.create_index('idx_jobs_created_at', 'jobs', ['created_at'])
+
+
+def downgrade() -> None:
+    """
+    Drop jobs table
+    """
+    op.drop_index('idx_jobs_created_at', 'jobs')
+    op.drop_table('jobs')
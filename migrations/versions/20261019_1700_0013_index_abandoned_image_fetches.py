@@ -0,0 +1,45 @@
+"""Index unfinished image fetches by age
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 17:00:00.000000
+
+Changes:
+- media_fetcher.py claims images ('pending' -> 'fetching') and periodically
+  resumes those untouched for a while: the partial index on
+  image_status = 'pending' is replaced by one on updated_at covering both states
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Replace idx_recipes_image_pending (idempotent)
+    """
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    indexes = [idx['name'] for idx in inspector.get_indexes('recipes')]
+
+    if 'idx_recipes_image_unfinished' not in indexes:
+        op.create_index('idx_recipes_image_unfinished', 'recipes', ['updated_at'],
+                        postgresql_where=sa.text("image_status IN ('pending', 'fetching')"))
+    if 'idx_recipes_image_pending' in indexes:
+        op.drop_index('idx_recipes_image_pending', 'recipes')
+
+
+def downgrade() -> None:
+    """
+    Restore idx_recipes_image_pending, claimed images become pending again
+    """
+    op.execute("UPDATE recipes SET image_status = 'pending' WHERE image_status = 'fetching'")
+    op.create_index('idx_recipes_image_pending', 'recipes', ['id'],
+                    postgresql_where=sa.text("image_status = 'pending'"))
+    op.drop_index('idx_recipes_image_unfinished', 'recipes')
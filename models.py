@@ -2,9 +2,16 @@
 SQLAlchemy Database Models for Rezept-Tagebuch
 """
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import validates
+from datetime import datetime, timezone
 
-db = SQLAlchemy()
+from notes_parser import parse_notes
+from ingredients import parse_ingredients
+from db_routing import RoutingSession
+
+# RoutingSession sends @replica_read queries to a read replica (see db_routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -26,7 +33,7 @@ class User(db.Model):
             'email': self.email,
             'name': self.name,
             'avatar_color': self.avatar_color,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 
@@ -36,6 +43,10 @@ class Recipe(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.Text, nullable=False)
     image = db.Column(db.Text)
+    # Imported images are fetched after the INSERT (see media_fetcher.py)
+    image_source_url = db.Column(db.Text)
+    image_status = db.Column(db.Text)  # pending | fetching | ready | failed, NULL = not imported
+    image_attempts = db.Column(db.Integer, default=0)
     notes = db.Column(db.Text)
     duration = db.Column(db.Float)
     rating = db.Column(db.Integer)
@@ -45,16 +56,39 @@ class Recipe(db.Model):
     erstellt_am = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Structured notes, parsed at write time from notes (see notes_parser.py)
+    notes_steps = db.Column(JSONB)
+    notes_ingredients = db.Column(JSONB)
+    notes_metadata = db.Column(JSONB)
 
     # Relationships
     user = db.relationship('User', back_populates='recipes')
     diary_entries = db.relationship('DiaryEntry', back_populates='recipe', lazy='dynamic')
+    ingredient_rows = db.relationship('RecipeIngredient', back_populates='recipe',
+                                      cascade='all, delete-orphan', passive_deletes=True,
+                                      order_by='RecipeIngredient.position')
+
+    @validates('notes')
+    def _parse_notes(self, key, notes):
+        """Keep the structured columns in sync whenever notes are assigned"""
+        self.apply_parsed_notes(parse_notes(notes))
+        return notes
+
+    def apply_parsed_notes(self, parsed):
+        self.notes_steps = parsed['steps'] if parsed else None
+        self.notes_ingredients = parsed['ingredients'] if parsed else None
+        self.notes_metadata = parsed['metadata'] if parsed else None
+        self.ingredient_rows = [
+            RecipeIngredient(position=position, **ingredient)
+            for position, ingredient in enumerate(parse_ingredients(parsed['ingredients'] if parsed else []))
+        ]
 
     def to_dict(self):
         return {
             'id': self.id,
             'title': self.title,
             'image': self.image,
+            'image_status': self.image_status,
             'notes': self.notes,
             'duration': self.duration,
             'rating': self.rating,
@@ -64,12 +98,78 @@ class Recipe(db.Model):
             'user_avatar_color': self.user.avatar_color if self.user else None,
             'is_system': self.is_system,
             'auto_imported': self.auto_imported,
-            'erstellt_am': self.erstellt_am.isoformat() + 'Z' if self.erstellt_am else None,
-            'created_at': self.created_at.isoformat() + 'Z' if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() + 'Z' if self.updated_at else None
+            'erstellt_am': self.erstellt_am.replace(tzinfo=timezone.utc) if self.erstellt_am else None,
+            'created_at': self.created_at.replace(tzinfo=timezone.utc) if self.created_at else None,
+            'updated_at': self.updated_at.replace(tzinfo=timezone.utc) if self.updated_at else None
+        }
+
+
+class RecipeIngredient(db.Model):
+    """One ingredient line of a recipe, normalized for lookups by name"""
+    __tablename__ = 'recipe_ingredients'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    quantity = db.Column(db.Float)
+    unit = db.Column(db.String(32))
+    name = db.Column(db.String(255), nullable=False)  # normalized (ingredients.normalize_name)
+    raw = db.Column(db.Text)
+
+    # Relationships
+    recipe = db.relationship('Recipe', back_populates='ingredient_rows')
+
+    __table_args__ = (
+        # (name, recipe_id): "which recipes use X" is an index-only scan
+        db.Index('idx_recipe_ingredients_name_recipe', 'name', 'recipe_id'),
+        db.Index('idx_recipe_ingredients_recipe_id', 'recipe_id'),
+    )
+
+    def to_dict(self):
+        return {
+            'quantity': self.quantity,
+            'unit': self.unit,
+            'name': self.name,
+            'raw': self.raw
         }
 
 
+class StatsCounter(db.Model):
+    """Precomputed counter, maintained by triggers (see stats.py)"""
+    __tablename__ = 'stats_counters'
+
+    scope = db.Column(db.String(64), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class StatsCounterDelta(db.Model):
+    """Pending counter change, folded into stats_counters (see stats.py)"""
+    __tablename__ = 'stats_counter_deltas'
+
+    # No unique key on (scope, key): concurrent writers append without waiting
+    id = db.Column(db.BigInteger, primary_key=True)
+    scope = db.Column(db.String(64), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    value = db.Column(db.BigInteger, nullable=False)
+
+
+class RecipeStats(db.Model):
+    """Per-recipe diary aggregates, maintained by triggers (see stats.py)"""
+    __tablename__ = 'recipe_stats'
+
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), primary_key=True)
+    cook_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    last_cooked = db.Column(db.Date)
+
+    __table_args__ = (
+        db.Index('idx_recipe_stats_cook_count', 'cook_count'),
+        db.Index('idx_recipe_stats_last_cooked', 'last_cooked'),
+    )
+
+
 class Todo(db.Model):
     __tablename__ = 'todos'
 
@@ -91,8 +191,8 @@ class Todo(db.Model):
             'priority': self.priority,
             'completed': self.completed,
             'user_id': self.user_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 
@@ -119,11 +219,32 @@ class DiaryEntry(db.Model):
             'id': self.id,
             'recipe_id': self.recipe_id,
             'dish_name': self.dish_name,
-            'date': self.date.isoformat() if self.date else None,
+            'date': self.date,
             'notes': self.notes,
             'images': self.images,
             'rating': self.rating,
             'user_id': self.user_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
+
+
+class Job(db.Model):
+    """Background job (see background_jobs.py) - shared by all workers, so any of them can answer a poll"""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.String(36), primary_key=True)
+    job_type = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(16), nullable=False)
+    params = db.Column(JSONB)
+    result = db.Column(JSONB)
+    error = db.Column(db.Text)
+    progress = db.Column(JSONB)
+    profile_url = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_jobs_created_at', 'created_at'),
+    )
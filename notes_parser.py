@@ -0,0 +1,126 @@
+"""
+Server-side Recipe Notes Parser
+
+Python port of parseRecipeNotes() from index.html, driven by the same
+config/shared/recipe-format-config.json patterns. Runs once at write time
+(see Recipe.notes validator in models.py) instead of on every render.
+The patterns come from the config registry, so an edited config applies to
+the next save without a restart - just like the next page load in the browser.
+
+Result:
+    {
+        'steps': ['Ofen vorheizen.', ...],          # SCHRITT/Step/"1." headers removed
+        'ingredients': ['500g Mehl', ...],          # bullets removed
+        'metadata': {
+            'lines': ['🌍 Quelle: TheMealDB', ...], # as displayed
+            'source': 'TheMealDB', 'url': ..., ...  # known fields, if present
+            'other': [...]                          # text before the first section
+        }
+    }
+"""
+
+import re
+
+from config_registry import get_config
+
+INGREDIENTS_HEADER = re.compile(r'^Zutaten:\s*$', re.IGNORECASE)
+STEP_PREFIX = re.compile(r'^(SCHRITT\s+\d+[\s:]*|Step\s+\d+[\s:]*|\d+\.\s*)', re.IGNORECASE)
+BULLET_PREFIX = re.compile(r'^[-•*]\s*')
+METADATA_FIELD = re.compile(r'^\W*\s*([A-Za-zÄÖÜäöüß]+):\s*(.+)$')
+
+# Footer labels (German) -> metadata keys
+METADATA_KEYS = {
+    'Quelle': 'source',
+    'Original': 'original',
+    'URL': 'url',
+    'Kategorie': 'category',
+    'Region': 'region',
+    'Portionen': 'servings',
+    'Methode': 'method',
+}
+
+# (format config, compiled regexes) - recompiled when the registry reloads the file
+_compiled = (None, None)
+
+
+def _load_patterns():
+    """Step and metadata regexes of the current format config"""
+    global _compiled
+    config = get_config('recipe_format')
+    compiled_config, patterns = _compiled
+    if config is not compiled_config:
+        step_regex = config.get('steps', {}).get('regex')
+        patterns = (
+            re.compile(step_regex) if step_regex else None,
+            [re.compile(p) for p in config.get('metadata', {}).get('patterns', [])]
+        )
+        _compiled = (config, patterns)
+    return patterns
+
+
+def parse_notes(notes):
+    """
+    Split free-text recipe notes into steps, ingredients and metadata
+
+    Returns:
+        dict (see module docstring) or None if notes are empty
+    """
+    if not notes:
+        return None
+
+    step_regex, metadata_regexes = _load_patterns()
+
+    steps, ingredients, metadata_lines, other = [], [], [], []
+    current_section = None
+    current_step = []
+
+    def flush_step():
+        if current_section == 'steps' and current_step:
+            steps.append(' '.join(current_step))
+        current_step.clear()
+
+    for line in notes.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        if step_regex and step_regex.search(line):
+            flush_step()
+            current_section = 'steps'
+            current_step.append(line)
+            continue
+
+        if INGREDIENTS_HEADER.match(line):
+            flush_step()
+            current_section = 'ingredients'
+            continue
+
+        if any(regex.search(line) for regex in metadata_regexes):
+            flush_step()
+            current_section = 'metadata'
+            metadata_lines.append(line)
+            continue
+
+        if current_section == 'steps':
+            current_step.append(line)
+        elif current_section == 'ingredients':
+            if line.startswith(('-', '•', '*')):
+                ingredients.append(line)
+        elif current_section == 'metadata':
+            metadata_lines.append(line)
+        else:
+            other.append(line)
+
+    flush_step()
+
+    metadata = {'lines': metadata_lines, 'other': other}
+    for line in metadata_lines:
+        match = METADATA_FIELD.match(line)
+        if match and match.group(1) in METADATA_KEYS:
+            metadata[METADATA_KEYS[match.group(1)]] = match.group(2).strip()
+
+    return {
+        'steps': [STEP_PREFIX.sub('', step).strip() for step in steps],
+        'ingredients': [BULLET_PREFIX.sub('', ingredient) for ingredient in ingredients],
+        'metadata': metadata,
+    }
@@ -0,0 +1,103 @@
+"""
+SQL Query Profiler and N+1 Detector (opt-in: QUERY_PROFILER_ENABLED=true)
+
+Observes every SQL statement (shared cursor hook, see metrics.add_query_observer)
+and records per request:
+- number of statements and total DB time
+- statement fingerprints (literals/parameters replaced by ?) with counts
+
+The result goes into the Server-Timing response header (visible in the
+browser devtools "Timing" tab) and a one-line log per request:
+
+    Server-Timing: db;dur=12.4;desc="9 queries", db-repeat;desc="7x SELECT users...", app;dur=31.0
+
+A fingerprint running more than QUERY_PROFILER_REPEAT_THRESHOLD times in one
+request is almost always a lazy relationship in a loop (Recipe.user,
+DiaryEntry.recipe, Recipe.diary_entries) - it is logged as an N+1 warning.
+
+Usage:
+    from query_profiler import init_query_profiler
+    init_query_profiler(app)
+"""
+
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+from flask import g, has_request_context, request
+from config import QUERY_PROFILER_ENABLED, QUERY_PROFILER_REPEAT_THRESHOLD
+from metrics import add_query_observer
+
+WHITESPACE = re.compile(r'\s+')
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|:\w+|\?|__\[POSTCOMPILE_\w+\]')
+VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+LOGGED_STATEMENT_LENGTH = 160
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement):
+    """Statement shape: whitespace collapsed, literals and parameters replaced by ?"""
+    shape = WHITESPACE.sub(' ', statement).strip()
+    shape = STRING_LITERAL.sub('?', shape)
+    shape = PLACEHOLDER.sub('?', shape)
+    shape = NUMBER.sub('?', shape)
+    return VALUE_LIST.sub('(?)', shape)
+
+
+def _observe_query(statement, seconds):
+    if not has_request_context():
+        return
+    profile = g.get('query_profile')
+    if profile is None:
+        return
+    profile['count'] += 1
+    profile['seconds'] += seconds
+    profile['fingerprints'][fingerprint(statement)] += 1
+
+
+def _before_request():
+    g.query_profile = {'start': time.perf_counter(), 'count': 0, 'seconds': 0.0, 'fingerprints': Counter()}
+
+
+def _quote(text):
+    """Server-Timing desc value (quoted-string)"""
+    return '"' + text.replace('\\', '').replace('"', "'")[:60] + '"'
+
+
+def _after_request(response):
+    profile = g.pop('query_profile', None)
+    if profile is None:
+        return response
+
+    total_ms = (time.perf_counter() - profile['start']) * 1000
+    db_ms = profile['seconds'] * 1000
+    repeated = [(shape, count) for shape, count in profile['fingerprints'].most_common(3) if count > 1]
+
+    timings = [f'db;dur={db_ms:.1f};desc="{profile["count"]} queries"']
+    if repeated:
+        shape, count = repeated[0]
+        timings.append(f'db-repeat;desc={_quote(f"{count}x {shape}")}')
+    timings.append(f'app;dur={total_ms:.1f}')
+    existing = response.headers.get('Server-Timing')
+    response.headers['Server-Timing'] = ', '.join(([existing] if existing else []) + timings)
+
+    print(f"🔎 {request.method} {request.path}: {profile['count']} queries, "
+          f"db {db_ms:.1f}ms / total {total_ms:.1f}ms")
+    for shape, count in repeated:
+        if count > QUERY_PROFILER_REPEAT_THRESHOLD:
+            print(f"⚠️ N+1 suspect in {request.method} {request.path}: {count}x "
+                  f"{shape[:LOGGED_STATEMENT_LENGTH]}")
+    return response
+
+
+def init_query_profiler(app):
+    """Register the profiler hooks (no-op unless QUERY_PROFILER_ENABLED)"""
+    if not QUERY_PROFILER_ENABLED:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    add_query_observer(_observe_query)
+    print(f"🔎 Query profiler enabled (N+1 threshold: {QUERY_PROFILER_REPEAT_THRESHOLD})")
@@ -10,6 +10,10 @@ import json
 from html.parser import HTMLParser
 from html import unescape
 
+SCRAPER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
 
 class RecipeHTMLParser(HTMLParser):
     """Parse HTML and extract recipe-relevant content"""
@@ -222,6 +226,23 @@ def extract_recipe_from_text(html):
     }
 
 
+def fetch_recipe_html(url):
+    """
+    Download a recipe page
+
+    Args:
+        url (str): Recipe URL
+
+    Returns:
+        str: HTML content
+    """
+    import requests
+
+    response = requests.get(url, headers=SCRAPER_HEADERS, timeout=15)
+    response.raise_for_status()
+    return response.text
+
+
 def scrape_recipe_from_url(url, html_content=None):
     """
     Main function to scrape recipe from URL
@@ -233,15 +254,8 @@ def scrape_recipe_from_url(url, html_content=None):
     Returns:
         dict: Extracted recipe data
     """
-    import requests
-
     if not html_content:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        html_content = response.text
+        html_content = fetch_recipe_html(url)
 
     # Try Schema.org first
     recipe = extract_json_ld_recipe(html_content)
@@ -0,0 +1,220 @@
+"""
+Sampling CPU Profiler for slow requests and background jobs
+
+A single sampler thread wakes up every PROFILER_INTERVAL_MS and records the
+current Python stack of every registered thread (sys._current_frames()).
+Nothing is traced, so the profiled code runs at (almost) full speed and time
+spent waiting - DeepL/TheMealDB calls, image downloads, DB commits - shows up
+as the frames it waits in.
+
+- Requests (PROFILER_REQUESTS_ENABLED): every request is sampled, the profile
+  is only written if it took longer than PROFILER_SLOW_REQUEST_MS
+- Background jobs (PROFILER_JOBS_ENABLED): every job is profiled, the file is
+  linked from the job record (profile_url, see background_jobs.py)
+
+Files go to PROFILER_DIR in speedscope JSON (open in https://www.speedscope.app)
+or collapsed-stack format (flamegraph.pl, speedscope), see PROFILER_FORMAT.
+Only the newest PROFILER_MAX_FILES are kept.
+
+Usage:
+    with ProfileSession('job-themealdb_import') as session:
+        ...
+    filename = session.save()
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request
+
+from config import (
+    PROFILER_REQUESTS_ENABLED, PROFILER_JOBS_ENABLED, PROFILER_DIR, PROFILER_FORMAT,
+    PROFILER_INTERVAL_MS, PROFILER_SLOW_REQUEST_MS, PROFILER_MAX_FILES
+)
+
+MAX_STACK_DEPTH = 128
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack(frame):
+    """Root-to-leaf tuple of frame labels"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class _Sampler:
+    """One background thread sampling all registered threads"""
+
+    def __init__(self):
+        self._targets = {}  # thread ident -> Counter(stack -> samples)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, ident):
+        with self._lock:
+            self._targets[ident] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cpu-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self, ident):
+        with self._lock:
+            return self._targets.pop(ident, Counter())
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        interval = PROFILER_INTERVAL_MS / 1000
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if not self._targets:
+                    continue
+                frames = sys._current_frames()
+                for ident, stacks in self._targets.items():
+                    frame = frames.get(ident)
+                    if frame is not None and ident != own_ident:
+                        stacks[_stack(frame)] += 1
+
+
+_sampler = _Sampler()
+
+
+def _prune(directory):
+    """Keep only the newest PROFILER_MAX_FILES profiles"""
+    files = sorted(
+        (entry for entry in os.scandir(directory) if entry.is_file()),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in files[PROFILER_MAX_FILES:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _speedscope(name, stacks, interval_ms):
+    frame_index = {}
+    frames = []
+    samples = []
+    weights = []
+    for stack, count in stacks.items():
+        sample = []
+        for label in stack:
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({'name': label})
+            sample.append(frame_index[label])
+        samples.append(sample)
+        weights.append(count * interval_ms)
+    return {
+        '$schema': SPEEDSCOPE_SCHEMA,
+        'name': name,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+
+class ProfileSession:
+    """Samples the calling thread between start() and stop()"""
+
+    def __init__(self, name):
+        self.name = name
+        self.stacks = Counter()
+        self.started = None
+        self.duration = 0.0
+        self._ident = None
+
+    def start(self):
+        self._ident = threading.get_ident()
+        self.started = time.perf_counter()
+        _sampler.start(self._ident)
+        return self
+
+    def stop(self):
+        if self._ident is not None:
+            self.stacks = _sampler.stop(self._ident)
+            self.duration = time.perf_counter() - self.started
+            self._ident = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def save(self):
+        """Write the profile to PROFILER_DIR - returns the file name (None without samples)"""
+        if not self.stacks:
+            return None
+        os.makedirs(PROFILER_DIR, exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        base = UNSAFE_FILENAME_CHARS.sub('_', f"{stamp}-{self.name}")[:150]
+
+        if PROFILER_FORMAT == 'collapsed':
+            filename = base + '.collapsed.txt'
+            content = ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.items())
+        else:
+            filename = base + '.speedscope.json'
+            content = json.dumps(_speedscope(self.name, self.stacks, PROFILER_INTERVAL_MS))
+
+        with open(os.path.join(PROFILER_DIR, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+        _prune(PROFILER_DIR)
+        return filename
+
+
+def profile_url(filename):
+    return f'/api/profiles/{filename}' if filename else None
+
+
+# ============================================================================
+# Request hooks
+# ============================================================================
+
+def _before_request():
+    g.cpu_profile = ProfileSession(f"{request.method}-{request.path}").start()
+
+
+def _teardown_request(exc):
+    session = g.pop('cpu_profile', None)
+    if session is None:
+        return
+    session.stop()
+    if session.duration * 1000 >= PROFILER_SLOW_REQUEST_MS:
+        filename = session.save()
+        print(f"🐢 Slow request {request.method} {request.path} ({session.duration * 1000:.0f}ms) "
+              f"- CPU profile: {filename}")
+
+
+def init_profiler(app):
+    """Sample requests and write profiles of slow ones (no-op unless enabled)"""
+    if PROFILER_REQUESTS_ENABLED:
+        app.before_request(_before_request)
+        app.teardown_request(_teardown_request)
+    if PROFILER_REQUESTS_ENABLED or PROFILER_JOBS_ENABLED:
+        print(f"⏱️ CPU profiler enabled (requests: {PROFILER_REQUESTS_ENABLED}, jobs: {PROFILER_JOBS_ENABLED}, "
+              f"dir: {PROFILER_DIR})")
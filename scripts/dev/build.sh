@@ -8,7 +8,10 @@ PROJECT_ROOT="$SCRIPT_DIR/../.."
 cd "$PROJECT_ROOT"
 
 echo "🔨 Building Dev Image..."
-podman build -t seaser-rezept-tagebuch:dev -f container/Containerfile .
+podman build \
+    --build-arg GIT_SHA=$(git rev-parse HEAD 2>/dev/null) \
+    --build-arg BUILD_TIME=$(date -u +%Y-%m-%dT%H:%M:%SZ) \
+    -t seaser-rezept-tagebuch:dev -f container/Containerfile .
 
 echo "🔄 Restarting Dev Container..."
 podman stop seaser-rezept-tagebuch-dev 2>/dev/null || true
@@ -65,7 +65,7 @@ echo ""
 
 # 4. Trigger daily import
 echo "4️⃣  Triggering daily import from TheMealDB..."
-IMPORT_RESPONSE=$(curl -s -X POST "$API_URL/recipes/daily-import")
+IMPORT_RESPONSE=$(curl -s -X POST "$API_URL/recipes/daily-import?wait=60")
 
 if echo "$IMPORT_RESPONSE" | grep -q '"success"' && echo "$IMPORT_RESPONSE" | grep -q 'true'; then
     test_pass "Daily import API call succeeded"
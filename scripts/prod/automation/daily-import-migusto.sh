@@ -10,10 +10,45 @@
 set -e
 
 # Configuration
+# Import runs as job: 202 + job_id, polled below
 BASE_URL="http://localhost:8000/rezept-tagebuch/api/recipes/import-migusto-batch"
 CLEANUP_URL="http://localhost:8000/rezept-tagebuch/api/recipes/cleanup-old-imports"
+JOBS_URL="http://localhost:8000/rezept-tagebuch/api/jobs"
+POLL_WAIT=5
+JOB_TIMEOUT=600
 CONFIG_FILE="/home/gabor/easer_projekte/rezept-tagebuch/config/migusto-import-config.json"
 
+# Poll the job until it is finished - writes the job record to $2
+# (short server-side wait per poll, so no web worker is pinned for long)
+wait_for_job() {
+    local job_id="$1" job_file="$2"
+    local deadline=$((SECONDS + JOB_TIMEOUT))
+    while [ $SECONDS -lt $deadline ]; do
+        poll_code=$(curl -s -o "$job_file" -w "%{http_code}" "${JOBS_URL}/${job_id}?wait=${POLL_WAIT}")
+        if [ "$poll_code" != "200" ]; then
+            echo "❌ Job $job_id: poll failed with HTTP $poll_code"
+            return 1
+        fi
+        if ! grep -q '"completed_at":null' "$job_file"; then
+            return 0
+        fi
+        echo "⏳ Job $job_id still running..."
+    done
+    echo "❌ Job $job_id not finished after ${JOB_TIMEOUT}s"
+    return 1
+}
+
+# HTTP status the import would have answered with synchronously
+job_http_code() {
+    local job_file="$1"
+    if grep -q '"status":"failed"' "$job_file"; then
+        echo 500
+    else
+        status_code=$(grep -o '"status_code":[0-9]*' "$job_file" | head -1 | cut -d':' -f2)
+        echo "${status_code:-200}"
+    fi
+}
+
 # Available presets (from config)
 PRESETS=("vegetarische_pasta_familie" "vegane_hauptgerichte" "schnelle_familiengerichte")
 
@@ -37,6 +72,12 @@ http_code=$(curl -s -o /tmp/migusto-import-response.json -w "%{http_code}" \
     -H "Content-Type: application/json" \
     -d "$REQUEST_BODY")
 
+if [ "$http_code" = "202" ]; then
+    job_id=$(grep -o '"job_id":"[^"]*"' /tmp/migusto-import-response.json | cut -d'"' -f4)
+    wait_for_job "$job_id" /tmp/migusto-import-response.json || exit 1
+    http_code=$(job_http_code /tmp/migusto-import-response.json)
+fi
+
 if [ "$http_code" = "200" ]; then
     imported_count=$(cat /tmp/migusto-import-response.json | grep -o '"imported":[0-9]*' | cut -d':' -f2)
 
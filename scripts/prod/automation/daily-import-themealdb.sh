@@ -15,12 +15,46 @@ MAX_ATTEMPTS=10
 RETRY_DELAY=2
 BASE_URL="http://localhost:8000/rezept-tagebuch/api/recipes/daily-import"
 CLEANUP_URL="http://localhost:8000/rezept-tagebuch/api/recipes/cleanup-old-imports"
+JOBS_URL="http://localhost:8000/rezept-tagebuch/api/jobs"
+POLL_WAIT=5
+JOB_TIMEOUT=300
+
+# Poll the job until it is finished - writes the job record to $2
+# (short server-side wait per poll, so no web worker is pinned for long)
+wait_for_job() {
+    local job_id="$1" job_file="$2"
+    local deadline=$((SECONDS + JOB_TIMEOUT))
+    while [ $SECONDS -lt $deadline ]; do
+        poll_code=$(curl -s -o "$job_file" -w "%{http_code}" "${JOBS_URL}/${job_id}?wait=${POLL_WAIT}")
+        if [ "$poll_code" != "200" ]; then
+            echo "❌ Job $job_id: poll failed with HTTP $poll_code"
+            return 1
+        fi
+        if ! grep -q '"completed_at":null' "$job_file"; then
+            return 0
+        fi
+        echo "⏳ Job $job_id still running..."
+    done
+    echo "❌ Job $job_id not finished after ${JOB_TIMEOUT}s"
+    return 1
+}
+
+# HTTP status the import would have answered with synchronously
+job_http_code() {
+    local job_file="$1"
+    if grep -q '"status":"failed"' "$job_file"; then
+        echo 500
+    else
+        status_code=$(grep -o '"status_code":[0-9]*' "$job_file" | head -1 | cut -d':' -f2)
+        echo "${status_code:-200}"
+    fi
+}
 
 # Parse arguments
 STRATEGY="${1:-by_category}"
 VALUE="${2:-Vegetarian}"
 
-# Build API URL
+# Build API URL (import runs as job: 202 + job_id, polled below)
 if [ -n "$VALUE" ] && [ "$VALUE" != "none" ]; then
     API_URL="${BASE_URL}?strategy=${STRATEGY}&value=${VALUE}"
 else
@@ -36,6 +70,12 @@ for attempt in $(seq 1 $MAX_ATTEMPTS); do
     # Make request and capture HTTP status code
     http_code=$(curl -s -o /tmp/import-response.json -w "%{http_code}" -X POST "$API_URL")
 
+    if [ "$http_code" = "202" ]; then
+        job_id=$(grep -o '"job_id":"[^"]*"' /tmp/import-response.json | cut -d'"' -f4)
+        wait_for_job "$job_id" /tmp/import-response.json || exit 1
+        http_code=$(job_http_code /tmp/import-response.json)
+    fi
+
     if [ "$http_code" = "200" ]; then
         echo "✅ Success! Meat-free recipe imported."
         recipe_title=$(cat /tmp/import-response.json | grep -o '"title":"[^"]*"' | head -1 | cut -d'"' -f4)
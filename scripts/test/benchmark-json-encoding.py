@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON encoding cost of the recipe catalog (GET /api/recipes)
+
+Compares the response encoding step of jsonify() for N recipes:
+
+  BEFORE: timestamps pre-formatted as ISO strings + Flask DefaultJSONProvider (stdlib json)
+  AFTER:  native datetimes + json_provider.FastJSONProvider (orjson if installed)
+
+Only the encoding is measured (row serialization: see benchmark-serializers.py).
+
+Usage:
+    python scripts/test/benchmark-json-encoding.py [--rows 2000] [--repeat 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import serializers  # noqa: E402
+from json_provider import FastJSONProvider  # noqa: E402
+from serializers import RECIPE  # noqa: E402
+
+NOTES = (
+    "SCHRITT 1\n\nOfen auf 200 Grad vorheizen und ein Blech mit Backpapier belegen.\n\n"
+    "SCHRITT 2\n\nGemüse waschen, klein schneiden und mit Olivenöl marinieren.\n\n"
+    "SCHRITT 3\n\nAlles 25 Minuten backen, mit Kräutern bestreuen und servieren.\n\n"
+    "Zutaten:\n- 500g Kartoffeln\n- 2 EL Olivenöl\n- 1 Prise Salz\n- 200g Feta\n\n"
+    "─────────────────────────\n🌍 Quelle: TheMealDB\n📖 Original: Roasted Vegetables\n"
+    "🏷️ Kategorie: Vegetarian\n🌎 Region: Greek\n🤖 Übersetzt mit DeepL"
+)
+
+
+def build_rows(rows):
+    now = datetime(2025, 11, 10, 21, 0, 0, 123456)
+    return [
+        (i, f'Rezept {i}', f'{i}.jpg', NOTES, 0.5, 4, 1, 'Natalie', 'natalie@seaser.local',
+         '#FFB6C1', False, True, now - timedelta(minutes=i), now - timedelta(minutes=i), now)
+        for i in range(rows)
+    ]
+
+
+def preformatted(recipes):
+    """What Recipe.to_dict() used to return: ISO strings built in Python"""
+    result = []
+    for recipe in recipes:
+        data = dict(recipe)
+        for key in ('erstellt_am', 'created_at', 'updated_at'):
+            data[key] = data[key].replace(tzinfo=None).isoformat() + 'Z'
+        result.append(data)
+    return result
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    default_app = Flask('before')
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app = Flask('after')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    recipes = RECIPE.many(build_rows(args.rows))
+
+    def before():
+        with default_app.app_context():
+            return default_app.json.response(preformatted(recipes)).get_data()
+
+    def after():
+        with fast_app.app_context():
+            return fast_app.json.response(recipes).get_data()
+
+    # Same document (key order and escaping may differ)
+    assert serializers.loads(before()) == serializers.loads(after())
+
+    t_before = timed(before, args.repeat)
+    t_after = timed(after, args.repeat)
+    size = len(after())
+
+    print(f"Encoding {args.rows} recipes ({size / 1024:.0f} KB, best of {args.repeat}, "
+          f"JSON backend: {serializers.JSON_BACKEND})")
+    print(f"  before (ISO strings + DefaultJSONProvider): {t_before * 1000:8.1f}ms")
+    print(f"  after  (datetimes + FastJSONProvider):      {t_after * 1000:8.1f}ms")
+    print(f"  speedup: {t_before / t_after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Serializing 10k rows - model.to_dict() vs. serializers.RowSerializer
+
+Measures the pure Python serialization cost (no database) for the
+recipe catalog and the diary list:
+
+  BEFORE: ORM instances -> to_dict() (+ recipe_title/recipe_image + json.loads images)
+  AFTER:  row tuples    -> RowSerializer.many()
+
+The BEFORE numbers are a lower bound: in production every Recipe.to_dict()
+additionally triggers a lazy SELECT for recipe.user (N+1), which is not
+part of this benchmark.
+
+Usage:
+    python scripts/test/benchmark-serializers.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from models import User, Recipe, DiaryEntry  # noqa: E402
+import serializers  # noqa: E402
+from serializers import RECIPE, DIARY_ENTRY  # noqa: E402
+
+NOTES = (
+    "SCHRITT 1\n\nOfen auf 200 Grad vorheizen.\n\n"
+    "SCHRITT 2\n\nGemüse waschen und klein schneiden.\n\n"
+    "Zutaten:\n- 500g Mehl\n- 2 TL Salz\n- 1 Prise Zucker\n\n"
+    "─────────────────────────\n🌍 Quelle: TheMealDB\n🤖 Übersetzt mit DeepL"
+)
+
+
+def build_data(rows):
+    now = datetime(2025, 11, 10, 21, 0, 0, 123456)
+    user = User(id=1, email='natalie@seaser.local', name='Natalie', avatar_color='#FFB6C1', created_at=now)
+
+    recipes, recipe_rows = [], []
+    entries, entry_rows = [], []
+    for i in range(rows):
+        ts = now - timedelta(minutes=i)
+        recipe = Recipe(id=i, title=f'Rezept {i}', image=f'{i}.jpg', notes=NOTES, duration=0.5,
+                        rating=4, user_id=1, is_system=False, auto_imported=True,
+                        erstellt_am=ts, created_at=ts, updated_at=ts)
+        recipe.user = user
+        recipes.append(recipe)
+        recipe_rows.append((i, f'Rezept {i}', f'{i}.jpg', NOTES, 0.5, 4, 1, 'Natalie',
+                            'natalie@seaser.local', '#FFB6C1', False, True, ts, ts, ts))
+
+        images = json.dumps([f'{i}-a.jpg', f'{i}-b.jpg'])
+        entry = DiaryEntry(id=i, recipe_id=i, dish_name=None, date=date(2025, 11, 10), notes='Lecker',
+                           images=images, rating=5, user_id=1, created_at=ts, updated_at=ts)
+        entry.recipe = recipe
+        entries.append(entry)
+        entry_rows.append((i, i, None, date(2025, 11, 10), 'Lecker', images, 5, 1, ts, ts,
+                           f'Rezept {i}', f'{i}.jpg'))
+
+    return recipes, recipe_rows, entries, entry_rows
+
+
+def diary_before(entries):
+    """The code path the diary endpoints used before the serializer layer"""
+    result = []
+    for entry in entries:
+        entry_dict = entry.to_dict()
+        if entry.recipe:
+            entry_dict['recipe_title'] = entry.recipe.title
+            entry_dict['recipe_image'] = entry.recipe.image
+        else:
+            entry_dict['recipe_title'] = None
+            entry_dict['recipe_image'] = None
+        if entry_dict['images']:
+            try:
+                entry_dict['images'] = json.loads(entry_dict['images'])
+            except Exception:
+                entry_dict['images'] = []
+        else:
+            entry_dict['images'] = []
+        result.append(entry_dict)
+    return result
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    recipes, recipe_rows, entries, entry_rows = build_data(args.rows)
+
+    # Same shapes before and after
+    assert [r.to_dict() for r in recipes[:3]] == RECIPE.many(recipe_rows[:3])
+    assert diary_before(entries[:3]) == DIARY_ENTRY.many(entry_rows[:3])
+
+    cases = [
+        ('recipes  dict ', lambda: [r.to_dict() for r in recipes], lambda: RECIPE.many(recipe_rows)),
+        ('recipes  +json', lambda: serializers.dumps([r.to_dict() for r in recipes]),
+         lambda: serializers.dumps(RECIPE.many(recipe_rows))),
+        ('diary    dict ', lambda: diary_before(entries), lambda: DIARY_ENTRY.many(entry_rows)),
+        ('diary    +json', lambda: serializers.dumps(diary_before(entries)),
+         lambda: serializers.dumps(DIARY_ENTRY.many(entry_rows))),
+    ]
+
+    print(f"Serializing {args.rows} rows (best of {args.repeat}, JSON backend: {serializers.JSON_BACKEND})")
+    print(f"{'case':<16}{'before':>12}{'after':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        t_before = timed(before, args.repeat)
+        t_after = timed(after, args.repeat)
+        print(f"{name:<16}{t_before * 1000:>10.1f}ms{t_after * 1000:>10.1f}ms{t_before / t_after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -32,7 +32,10 @@ fi
 
 echo ""
 echo "🔨 Building Test Image from Working Directory..."
-podman build -t seaser-rezept-tagebuch:test -f container/Containerfile .
+podman build \
+    --build-arg GIT_SHA=$(git rev-parse HEAD 2>/dev/null) \
+    --build-arg BUILD_TIME=$(date -u +%Y-%m-%dT%H:%M:%SZ) \
+    -t seaser-rezept-tagebuch:test -f container/Containerfile .
 
 echo ""
 echo "🔄 Stopping existing Test Container..."
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Load test: do slow upstream imports starve the CRUD endpoints?
+
+Runs two client groups against a running container for --duration seconds:
+
+  slow: --slow-clients loop POST --slow-path (default: daily-import with
+        wait=60, i.e. the client waits on TheMealDB, DeepL and an image
+        download - creates recipes!)
+  fast: --fast-clients loop GET --fast-path (default: recipe catalog)
+
+and prints request count, errors, throughput and latency percentiles per
+group. Run it once per SERVER_MODE against the TEST container and compare:
+
+    SERVER_MODE=wsgi  -> python scripts/test/loadtest-server-modes.py --label wsgi --save wsgi.json
+    SERVER_MODE=asgi  -> python scripts/test/loadtest-server-modes.py --label asgi --save asgi.json
+    python scripts/test/loadtest-server-modes.py --compare wsgi.json asgi.json
+
+With 4 sync workers and >= 4 slow clients the fast group queues behind the
+imports; in asgi mode its latency should stay close to the idle baseline
+(--slow-clients 0).
+
+Usage:
+    python scripts/test/loadtest-server-modes.py [--base-url URL] [--duration 30]
+        [--slow-clients 8] [--fast-clients 4] [--auth user:password]
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import requests
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-p * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def client_loop(session, method, url, deadline, latencies, errors, lock):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=120)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+
+
+def run_group(method, url, clients, deadline, auth):
+    latencies, errors, lock = [], [], threading.Lock()
+    threads = []
+    for _ in range(clients):
+        session = requests.Session()
+        session.auth = auth
+        thread = threading.Thread(target=client_loop,
+                                  args=(session, method, url, deadline, latencies, errors, lock), daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads, latencies, errors
+
+
+def summarize(latencies, errors, duration):
+    values = sorted(latencies)
+    ms = lambda value: round(value * 1000, 1) if value is not None else None
+    return {
+        'requests': len(values),
+        'errors': len(errors),
+        'rps': round(len(values) / duration, 2),
+        'p50_ms': ms(percentile(values, 50)),
+        'p95_ms': ms(percentile(values, 95)),
+        'p99_ms': ms(percentile(values, 99)),
+        'max_ms': ms(values[-1] if values else None),
+    }
+
+
+def print_table(results):
+    columns = ['requests', 'errors', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+    print(f"{'run':<12} {'group':<6} " + ' '.join(f'{c:>9}' for c in columns))
+    for result in results:
+        for group in ('fast', 'slow'):
+            stats = result.get(group)
+            if stats:
+                print(f"{result['label']:<12} {group:<6} " + ' '.join(f'{str(stats[c]):>9}' for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8001')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--slow-clients', type=int, default=8)
+    parser.add_argument('--fast-clients', type=int, default=4)
+    parser.add_argument('--slow-path', default='/api/recipes/daily-import?strategy=by_category&value=Vegetarian&wait=60')
+    parser.add_argument('--fast-path', default='/api/recipes')
+    parser.add_argument('--auth', help='user:password for basic auth (nginx proxy)')
+    parser.add_argument('--label', default='run')
+    parser.add_argument('--save', help='write the result as JSON')
+    parser.add_argument('--compare', nargs='+', metavar='JSON', help='print saved results side by side')
+    args = parser.parse_args()
+
+    if args.compare:
+        results = []
+        for path in args.compare:
+            with open(path) as f:
+                results.append(json.load(f))
+        print_table(results)
+        return
+
+    auth = tuple(args.auth.split(':', 1)) if args.auth else None
+    base = args.base_url.rstrip('/')
+    deadline = time.monotonic() + args.duration
+
+    print(f"⚡ {args.duration:.0f}s against {base}: {args.slow_clients} slow clients "
+          f"(POST {args.slow_path}), {args.fast_clients} fast clients (GET {args.fast_path})")
+
+    slow_threads, slow_latencies, slow_errors = run_group('POST', base + args.slow_path, args.slow_clients,
+                                                          deadline, auth)
+    fast_threads, fast_latencies, fast_errors = run_group('GET', base + args.fast_path, args.fast_clients,
+                                                          deadline, auth)
+    for thread in slow_threads + fast_threads:
+        thread.join()
+
+    result = {
+        'label': args.label,
+        'base_url': base,
+        'duration_s': args.duration,
+        'slow_clients': args.slow_clients,
+        'fast_clients': args.fast_clients,
+        'fast': summarize(fast_latencies, fast_errors, args.duration),
+        'slow': summarize(slow_latencies, slow_errors, args.duration) if args.slow_clients else None,
+    }
+    print_table([result])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Saved to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Serializer layer for API responses
+
+Central column-to-key mappings for every JSON shape the API returns.
+Endpoints select plain row tuples (no ORM instances, no lazy relationship
+loads) and convert them in one batch with a precompiled RowSerializer.
+
+Datetimes stay datetime objects until JSON encoding (see json_provider.py).
+
+Optional orjson backend: if orjson is installed it is used for dumps/loads,
+otherwise the stdlib json module is used. Output is identical.
+"""
+
+import json
+import uuid
+from datetime import datetime, date, timedelta, timezone
+from decimal import Decimal
+
+from models import db, User, Recipe, RecipeStats, Todo, DiaryEntry
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+# ============================================================================
+# JSON backend
+# ============================================================================
+
+def _default(obj):
+    """Types neither backend encodes natively (datetime/date for stdlib json)"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is not None and obj.utcoffset() == timedelta(0):
+            return obj.replace(tzinfo=None).isoformat() + 'Z'
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    JSON_BACKEND = 'json'
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    loads = json.loads
+
+
+# ============================================================================
+# Value converters (must accept None)
+# ============================================================================
+
+def _utc(value):
+    """Recipe timestamps are UTC and get a 'Z' suffix from the JSON encoder (frontend timezone fix)"""
+    return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+def _images(value):
+    """diary_entries.images is a JSON array stored as text"""
+    if not value:
+        return []
+    try:
+        return loads(value)
+    except ValueError:
+        return []
+
+
+# ============================================================================
+# RowSerializer
+# ============================================================================
+
+class RowSerializer:
+    """
+    Converts row tuples into dicts using a fixed column-to-key mapping
+
+    Args:
+        fields: Sequence of (key, column, converter) - converter may be None
+        select_from: Entity the query starts from
+        joins: Sequence of (entity, onclause) for LEFT OUTER JOINs
+    """
+
+    def __init__(self, fields, select_from, joins=()):
+        self.keys = tuple(key for key, _, _ in fields)
+        self.columns = tuple(column for _, column, _ in fields)
+        self.converters = tuple((key, conv) for key, _, conv in fields if conv is not None)
+        self.select_from = select_from
+        self.joins = tuple(joins)
+
+    def query(self):
+        """Base query selecting exactly the mapped columns"""
+        query = db.session.query(*self.columns).select_from(self.select_from)
+        for entity, onclause in self.joins:
+            query = query.outerjoin(entity, onclause)
+        return query
+
+    def one(self, row):
+        """Serialize a single row tuple"""
+        data = dict(zip(self.keys, row))
+        for key, conv in self.converters:
+            data[key] = conv(data[key])
+        return data
+
+    def many(self, rows):
+        """Serialize an iterable of row tuples (batch, no per-row method lookups)"""
+        keys = self.keys
+        converters = self.converters
+        result = []
+        append = result.append
+        for row in rows:
+            data = dict(zip(keys, row))
+            for key, conv in converters:
+                data[key] = conv(data[key])
+            append(data)
+        return result
+
+    def get(self, pk_column, pk):
+        """Fetch and serialize a single row by primary key (None if not found)"""
+        row = self.query().filter(pk_column == pk).first()
+        return self.one(row) if row is not None else None
+
+
+# ============================================================================
+# Mappings (same shapes as the models' to_dict())
+# ============================================================================
+
+USER = RowSerializer([
+    ('id', User.id, None),
+    ('email', User.email, None),
+    ('name', User.name, None),
+    ('avatar_color', User.avatar_color, None),
+    ('created_at', User.created_at, None),
+], select_from=User)
+
+_RECIPE_FIELDS = [
+    ('id', Recipe.id, None),
+    ('title', Recipe.title, None),
+    ('image', Recipe.image, None),
+    ('image_status', Recipe.image_status, None),
+    ('notes', Recipe.notes, None),
+    ('duration', Recipe.duration, None),
+    ('rating', Recipe.rating, None),
+    ('user_id', Recipe.user_id, None),
+    ('user_name', User.name, None),
+    ('user_email', User.email, None),
+    ('user_avatar_color', User.avatar_color, None),
+    ('is_system', Recipe.is_system, None),
+    ('auto_imported', Recipe.auto_imported, None),
+    ('erstellt_am', Recipe.erstellt_am, _utc),
+    ('created_at', Recipe.created_at, _utc),
+    ('updated_at', Recipe.updated_at, _utc),
+]
+_RECIPE_JOINS = [(User, Recipe.user_id == User.id)]
+
+# Catalog list (default shape)
+RECIPE = RowSerializer(_RECIPE_FIELDS, select_from=Recipe, joins=_RECIPE_JOINS)
+
+# Single recipe: + pre-parsed notes sections
+RECIPE_DETAIL = RowSerializer(_RECIPE_FIELDS + [
+    ('steps', Recipe.notes_steps, None),
+    ('ingredients', Recipe.notes_ingredients, None),
+    ('metadata', Recipe.notes_metadata, None),
+], select_from=Recipe, joins=_RECIPE_JOINS)
+
+# Diary aggregates per recipe (trigger-maintained, see stats.py)
+RECIPE_STATS_JOIN = (RecipeStats, RecipeStats.recipe_id == Recipe.id)
+RECIPE_AVG_RATING = RecipeStats.rating_sum * 1.0 / db.func.nullif(RecipeStats.rating_count, 0)
+
+# Catalog list with ?view=summary: no long notes text, + cook count / avg rating
+RECIPE_SUMMARY = RowSerializer(
+    [field for field in _RECIPE_FIELDS if field[0] != 'notes'] + [
+        ('metadata', Recipe.notes_metadata, None),
+        ('cook_count', db.func.coalesce(RecipeStats.cook_count, 0), None),
+        ('avg_rating', db.func.round(RECIPE_AVG_RATING, 2), None),
+        ('last_cooked', RecipeStats.last_cooked, None),
+    ], select_from=Recipe, joins=_RECIPE_JOINS + [RECIPE_STATS_JOIN])
+
+TODO = RowSerializer([
+    ('id', Todo.id, None),
+    ('text', Todo.text, None),
+    ('priority', Todo.priority, None),
+    ('completed', Todo.completed, None),
+    ('user_id', Todo.user_id, None),
+    ('created_at', Todo.created_at, None),
+    ('updated_at', Todo.updated_at, None),
+], select_from=Todo)
+
+DIARY_ENTRY = RowSerializer([
+    ('id', DiaryEntry.id, None),
+    ('recipe_id', DiaryEntry.recipe_id, None),
+    ('dish_name', DiaryEntry.dish_name, None),
+    ('date', DiaryEntry.date, None),
+    ('notes', DiaryEntry.notes, None),
+    ('images', DiaryEntry.images, _images),
+    ('rating', DiaryEntry.rating, None),
+    ('user_id', DiaryEntry.user_id, None),
+    ('created_at', DiaryEntry.created_at, None),
+    ('updated_at', DiaryEntry.updated_at, None),
+    ('recipe_title', Recipe.title, None),
+    ('recipe_image', Recipe.image, None),
+], select_from=DiaryEntry, joins=[(Recipe, DiaryEntry.recipe_id == Recipe.id)])
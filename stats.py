@@ -0,0 +1,303 @@
+"""
+Precomputed Statistics (incrementally maintained by PostgreSQL triggers)
+
+Every write to recipes / diary_entries records its effect in small summary
+tables in the same transaction, so the dashboard reads a handful of rows
+instead of counting the full history:
+
+    stats_counters (scope, key) -> value
+        recipes            total | with_images
+        recipes_by_user    <user_id> | none
+        recipes_by_source  TheMealDB | Migusto | ... | Eigene | Import
+        diary              total
+        diary_by_month     YYYY-MM
+
+    recipe_stats (recipe_id) -> cook_count, rating_sum, rating_count, last_cooked
+
+Counters are global rows (every recipe insert touches ('recipes', 'total')),
+so writers never update them directly: statement-level triggers aggregate
+the transition tables (one row per changed key and statement, also for COPY
+and bulk DELETE) and append them to stats_counter_deltas, which has no
+unique key and therefore no row locks to wait for. Readers add the pending
+deltas to stats_counters; fold_stats_deltas() moves them over in a short
+transaction of its own (every STATS_FOLD_INTERVAL seconds per worker, and
+in rebuild_stats).
+
+recipe_stats rows belong to one recipe and are still updated per row.
+
+Triggers catch every write path (ORM, Core bulk inserts, CLI backfills,
+psql). The trigger DDL is installed by migrations 0007/0008/0011; init_db()
+installs it for databases created with db.create_all().
+`flask --app app rebuild-stats` recomputes everything from the base tables.
+"""
+
+import threading
+import time
+
+from config import STATS_FOLD_INTERVAL
+from models import db, User, Recipe, StatsCounter, StatsCounterDelta, RecipeStats
+
+TOP_RECIPES_LIMIT = 10
+
+# Recipe source: "Quelle:" footer parsed into notes_metadata, else manual/import
+SOURCE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION recipe_source(metadata JSONB, auto_imported BOOLEAN) RETURNS TEXT AS $$
+    SELECT COALESCE(NULLIF(metadata->>'source', ''),
+                    CASE WHEN auto_imported THEN 'Import' ELSE 'Eigene' END)
+$$ LANGUAGE sql IMMUTABLE;
+"""
+
+# changes: (sign, row) for every row of the statement - +1 new, -1 old.
+# An UPDATE contributes both, unchanged keys cancel out (HAVING).
+RECIPE_DELTAS_SQL = """
+        WITH changes AS ({changes})
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('recipes', 'total'),
+            ('recipes', CASE WHEN c.image IS NOT NULL THEN 'with_images' END),
+            ('recipes_by_user', COALESCE(c.user_id::text, 'none')),
+            ('recipes_by_source', recipe_source(c.notes_metadata, c.auto_imported))
+        ) AS k(scope, key)
+        WHERE k.key IS NOT NULL
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;"""
+
+DIARY_DELTAS_SQL = """
+        WITH changes AS ({changes})
+        INSERT INTO stats_counter_deltas (scope, key, value)
+        SELECT k.scope, k.key, sum(c.sign)
+        FROM changes c
+        CROSS JOIN LATERAL (VALUES
+            ('diary', 'total'),
+            ('diary_by_month', to_char(c.date, 'YYYY-MM'))
+        ) AS k(scope, key)
+        GROUP BY k.scope, k.key
+        HAVING sum(c.sign) <> 0;"""
+
+NEW_ROWS = "SELECT 1 AS sign, * FROM new_rows"
+OLD_ROWS = "SELECT -1 AS sign, * FROM old_rows"
+
+
+def _statement_trigger_sql(table, function, deltas_sql):
+    """Trigger function + one AFTER ... FOR EACH STATEMENT trigger per operation
+
+    Transition tables are only allowed on single-event triggers without a
+    column list, hence three triggers sharing one function.
+    """
+    return f"""
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{deltas_sql.format(changes=NEW_ROWS)}
+    ELSIF TG_OP = 'DELETE' THEN{deltas_sql.format(changes=OLD_ROWS)}
+    ELSE{deltas_sql.format(changes=NEW_ROWS + ' UNION ALL ' + OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_{function}_insert ON {table};
+DROP TRIGGER IF EXISTS trg_{function}_update ON {table};
+DROP TRIGGER IF EXISTS trg_{function}_delete ON {table};
+CREATE TRIGGER trg_{function}_insert AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+CREATE TRIGGER trg_{function}_update AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+CREATE TRIGGER trg_{function}_delete AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+"""
+
+
+RECIPES_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS trg_stats_recipes ON recipes;
+""" + _statement_trigger_sql('recipes', 'stats_recipes_counters', RECIPE_DELTAS_SQL)
+
+DIARY_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION stats_diary_trigger() RETURNS trigger AS $$
+BEGIN
+    -- Per recipe only - the diary counters come from stats_diary_counters()
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.recipe_id IS NOT NULL THEN
+            -- Row may already be gone (recipe deleted -> ON DELETE SET NULL)
+            UPDATE recipe_stats SET
+                cook_count = cook_count - 1,
+                rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+                rating_count = rating_count - (OLD.rating IS NOT NULL)::int,
+                last_cooked = CASE
+                    WHEN last_cooked IS DISTINCT FROM OLD.date THEN last_cooked
+                    -- Latest entry removed/moved: index lookup on diary_entries.recipe_id
+                    ELSE (SELECT max(date) FROM diary_entries WHERE recipe_id = OLD.recipe_id)
+                END
+            WHERE recipe_id = OLD.recipe_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.recipe_id IS NOT NULL THEN
+            INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count, last_cooked)
+            VALUES (NEW.recipe_id, 1, COALESCE(NEW.rating, 0), (NEW.rating IS NOT NULL)::int, NEW.date)
+            ON CONFLICT (recipe_id) DO UPDATE SET
+                cook_count = recipe_stats.cook_count + 1,
+                rating_sum = recipe_stats.rating_sum + EXCLUDED.rating_sum,
+                rating_count = recipe_stats.rating_count + EXCLUDED.rating_count,
+                last_cooked = GREATEST(recipe_stats.last_cooked, EXCLUDED.last_cooked);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_stats_diary ON diary_entries;
+CREATE TRIGGER trg_stats_diary
+    AFTER INSERT OR DELETE OR UPDATE OF date, recipe_id, rating ON diary_entries
+    FOR EACH ROW EXECUTE FUNCTION stats_diary_trigger();
+""" + _statement_trigger_sql('diary_entries', 'stats_diary_counters', DIARY_DELTAS_SQL)
+
+# Pending deltas -> stats_counters. Concurrent folds are safe: a delta row
+# deleted by another fold is skipped once that transaction commits.
+FOLD_SQL = """
+WITH folded AS (
+    DELETE FROM stats_counter_deltas RETURNING scope, key, value
+)
+INSERT INTO stats_counters (scope, key, value)
+SELECT scope, key, sum(value) FROM folded GROUP BY scope, key
+ON CONFLICT (scope, key) DO UPDATE SET value = stats_counters.value + EXCLUDED.value;
+"""
+
+# Recompute from scratch (writers are blocked for the duration)
+REBUILD_SQL = """
+LOCK TABLE recipes, diary_entries IN SHARE MODE;
+
+DELETE FROM stats_counters;
+DELETE FROM stats_counter_deltas;
+DELETE FROM recipe_stats;
+
+INSERT INTO stats_counters (scope, key, value)
+          SELECT 'recipes', 'total', count(*) FROM recipes
+UNION ALL SELECT 'recipes', 'with_images', count(*) FROM recipes WHERE image IS NOT NULL
+UNION ALL SELECT 'recipes_by_user', COALESCE(user_id::text, 'none'), count(*) FROM recipes GROUP BY 2
+UNION ALL SELECT 'recipes_by_source', recipe_source(notes_metadata, auto_imported), count(*) FROM recipes GROUP BY 2
+UNION ALL SELECT 'diary', 'total', count(*) FROM diary_entries
+UNION ALL SELECT 'diary_by_month', to_char(date, 'YYYY-MM'), count(*) FROM diary_entries GROUP BY 2;
+
+INSERT INTO recipe_stats (recipe_id, cook_count, rating_sum, rating_count, last_cooked)
+SELECT recipe_id, count(*), COALESCE(sum(rating), 0), count(rating), max(date)
+FROM diary_entries
+WHERE recipe_id IS NOT NULL
+GROUP BY recipe_id;
+"""
+
+
+def install_stats_triggers():
+    """Install trigger functions + triggers and fill the tables (PostgreSQL only)"""
+    if db.engine.dialect.name != 'postgresql':
+        print("⚠️ Statistics triggers require PostgreSQL - skipped")
+        return
+    with db.engine.begin() as conn:
+        for sql in (SOURCE_FUNCTION_SQL, RECIPES_TRIGGER_SQL, DIARY_TRIGGER_SQL, REBUILD_SQL):
+            conn.exec_driver_sql(sql)
+
+
+def rebuild_stats():
+    """Recompute all counters from recipes / diary_entries"""
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(REBUILD_SQL)
+
+
+def fold_stats_deltas():
+    """Move pending deltas into stats_counters (PostgreSQL only)"""
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(FOLD_SQL)
+
+
+def _fold_forever(app):
+    while True:
+        time.sleep(STATS_FOLD_INTERVAL)
+        try:
+            with app.app_context():
+                fold_stats_deltas()
+        except Exception as e:
+            print(f"⚠️ Stats fold failed: {e}")
+
+
+_folder_started = False
+
+
+def init_stats(app):
+    """Start the thread folding counter deltas (once per process, PostgreSQL only)"""
+    global _folder_started
+    if _folder_started or STATS_FOLD_INTERVAL <= 0 or not app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        return
+    _folder_started = True
+    threading.Thread(target=_fold_forever, args=(app,), name='stats-fold', daemon=True).start()
+
+
+def _counters():
+    """(scope, key, value) with the pending deltas added"""
+    rows = db.union_all(
+        db.select(StatsCounter.scope, StatsCounter.key, StatsCounter.value),
+        db.select(StatsCounterDelta.scope, StatsCounterDelta.key, StatsCounterDelta.value)
+    ).subquery()
+    return db.session.execute(
+        db.select(rows.c.scope, rows.c.key, db.cast(db.func.sum(rows.c.value), db.BigInteger)).group_by(rows.c.scope, rows.c.key)
+    )
+
+
+def _top_recipes(order_by, *criteria):
+    query = db.session.query(
+        RecipeStats.recipe_id, Recipe.title, RecipeStats.cook_count,
+        RecipeStats.rating_sum, RecipeStats.rating_count, RecipeStats.last_cooked
+    ).join(Recipe, Recipe.id == RecipeStats.recipe_id)
+    if criteria:
+        query = query.filter(*criteria)
+    return [
+        {
+            'recipe_id': recipe_id,
+            'title': title,
+            'cook_count': cook_count,
+            'avg_rating': round(rating_sum / rating_count, 2) if rating_count else None,
+            'rating_count': rating_count,
+            'last_cooked': last_cooked
+        }
+        for recipe_id, title, cook_count, rating_sum, rating_count, last_cooked
+        in query.order_by(*order_by).limit(TOP_RECIPES_LIMIT)
+    ]
+
+
+def load_dashboard():
+    """Dashboard statistics from the summary tables (no scans of recipes/diary)"""
+    counters = {}
+    for scope, key, value in _counters():
+        if value:
+            counters.setdefault(scope, {})[key] = value
+
+    user_names = dict(db.session.query(User.id, User.name))
+    recipes_per_user = [
+        {
+            'user_id': int(key) if key != 'none' else None,
+            'name': user_names.get(int(key)) if key != 'none' else None,
+            'count': value
+        }
+        for key, value in sorted(counters.get('recipes_by_user', {}).items(), key=lambda item: -item[1])
+    ]
+
+    avg_rating = (RecipeStats.rating_sum * 1.0 / RecipeStats.rating_count)
+
+    return {
+        'total_recipes': counters.get('recipes', {}).get('total', 0),
+        'recipes_with_images': counters.get('recipes', {}).get('with_images', 0),
+        'recipes_per_user': recipes_per_user,
+        'recipes_per_source': counters.get('recipes_by_source', {}),
+        'total_diary_entries': counters.get('diary', {}).get('total', 0),
+        'diary_entries_per_month': dict(sorted(counters.get('diary_by_month', {}).items())),
+        'most_cooked': _top_recipes(
+            (RecipeStats.cook_count.desc(), RecipeStats.recipe_id.desc()),
+            RecipeStats.cook_count > 0
+        ),
+        'top_rated': _top_recipes(
+            (avg_rating.desc(), RecipeStats.rating_count.desc(), RecipeStats.recipe_id.desc()),
+            RecipeStats.rating_count > 0
+        ),
+    }
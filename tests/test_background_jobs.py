@@ -0,0 +1,127 @@
+"""
+Background Job Tests
+
+Tests:
+- Enqueued imports answer 202 with a poll_url, the job is pollable from any worker
+- ?wait= returns the finished result (200) with job_id
+- Client errors are answered before a job is created
+- Jobs abandoned by a dead worker end up failed instead of running forever
+
+No external services: the URL import points at a closed local port (fails
+fast), the cleanup only touches recipes older than 100 years. The abandoned
+job is written directly through background_jobs bound to a minimal app on
+the test database (same settings as test_media_fetcher.py).
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import background_jobs
+from config import JOB_STALE_AFTER_SECONDS
+from models import db, Job
+
+UNREACHABLE_URL = "http://127.0.0.1:9/rezept"
+
+
+@pytest.mark.integration
+class TestBackgroundJobs:
+    """Test job-based import endpoints and GET /api/jobs/<id>"""
+
+    def test_import_returns_202_with_poll_url(self, api_client):
+        """Without wait the import is only enqueued"""
+        response = api_client.post("/recipes/import-migusto", json={"url": UNREACHABLE_URL})
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] in ("pending", "running")
+        assert data["poll_url"] == f"/api/jobs/{data['job_id']}"
+
+    def test_job_is_pollable_from_every_worker(self, api_client):
+        """The job store is shared - repeated polls never hit an unknown job"""
+        job_id = api_client.post("/recipes/import-migusto", json={"url": UNREACHABLE_URL}).json()["job_id"]
+
+        for _ in range(12):
+            response = api_client.get(f"/jobs/{job_id}")
+            assert response.status_code == 200
+            assert response.json()["job_id"] == job_id
+
+        job = api_client.get(f"/jobs/{job_id}", params={"wait": 10}).json()
+        assert job["status"] == "failed"
+        assert job["completed_at"] is not None
+
+    def test_wait_returns_result_with_job_id(self, api_client):
+        """A job finishing within ?wait= answers 200 with its result"""
+        response = api_client.post("/recipes/cleanup-old-imports", params={"wait": 10}, json={"days": 36500})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["job_id"]
+        assert data["deleted_count"] == 0
+        assert api_client.get(f"/jobs/{data['job_id']}").json()["status"] == "completed"
+
+    def test_unknown_preset_rejected_before_enqueue(self, api_client):
+        """Unknown presets are a 400 without a job"""
+        newest_before = api_client.get("/jobs", params={"limit": 1}).json()["jobs"]
+
+        response = api_client.post("/recipes/import-migusto-batch", json={"preset": "gibt_es_nicht"})
+
+        assert response.status_code == 400
+        assert "job_id" not in response.json()
+        assert api_client.get("/jobs", params={"limit": 1}).json()["jobs"] == newest_before
+
+    def test_unknown_job_returns_404(self, api_client):
+        """Polling a job that never existed"""
+        response = api_client.get("/jobs/00000000-0000-0000-0000-000000000000")
+
+        assert response.status_code == 404
+
+
+@pytest.fixture(scope="module")
+def jobs_app():
+    """background_jobs bound to a minimal app on the test database"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://{}:{}@{}/{}".format(
+        os.getenv("POSTGRES_USER", "postgres"),
+        os.getenv("POSTGRES_PASSWORD", "test"),
+        os.getenv("POSTGRES_HOST", "seaser-postgres-test"),
+        os.getenv("POSTGRES_DB", "rezepte_test"),
+    )
+    db.init_app(app)
+    previous_app = background_jobs._app
+    background_jobs.init_background_jobs(app)
+    yield app
+    background_jobs._app = previous_app
+
+
+@pytest.mark.unit
+def test_progress_without_job_is_skipped(monkeypatch):
+    """Inline runs (dry-run cleanup) pass job_id None - no UPDATE jobs ... WHERE id IS NULL"""
+    def must_not_write(statement):
+        raise AssertionError("progress written without a job")
+    monkeypatch.setattr(background_jobs, "_write", must_not_write)
+
+    background_jobs.update_job_progress(None, 1, 2, "Dry run")
+
+
+@pytest.mark.integration
+def test_abandoned_job_is_failed_when_read(jobs_app, api_client):
+    """A running job whose worker died is reported failed, also to the cron polls"""
+    job_id = str(uuid.uuid4())
+    started_at = datetime.utcnow() - timedelta(seconds=JOB_STALE_AFTER_SECONDS + 60)
+    background_jobs._write(db.insert(Job).values(
+        id=job_id, job_type="migusto_import", status=background_jobs.STATUS_RUNNING,
+        params={}, created_at=started_at, started_at=started_at,
+        progress={"current": 0, "total": 1, "message": "Importing"}
+    ))
+    try:
+        job = api_client.get(f"/jobs/{job_id}", params={"wait": 5}).json()
+
+        assert job["status"] == "failed"
+        assert "abandoned" in job["error"]
+        assert job["completed_at"] is not None
+        assert background_jobs.get_job(job_id)["status"] == "failed"
+    finally:
+        background_jobs._write(db.delete(Job).where(Job.id == job_id))
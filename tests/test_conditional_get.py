@@ -0,0 +1,60 @@
+"""
+Tests for Conditional GET (ETag / If-None-Match)
+
+Tests:
+- Catalog, diary and todo lists return a weak ETag
+- Unchanged lists answer If-None-Match with 304 Not Modified
+- Writes change the ETag
+"""
+import pytest
+
+
+@pytest.mark.integration
+class TestConditionalGet:
+    """Test weak ETags on list endpoints"""
+
+    @pytest.mark.parametrize("endpoint", ["/recipes", "/diary?user_id=1", "/todos"])
+    def test_list_returns_weak_etag(self, api_client, endpoint):
+        """List endpoints return a weak ETag and require revalidation"""
+        response = api_client.get(endpoint)
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('W/"')
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    @pytest.mark.parametrize("endpoint", ["/recipes", "/diary?user_id=1", "/todos"])
+    def test_unchanged_list_returns_304(self, api_client, endpoint):
+        """Matching If-None-Match returns 304 without body"""
+        etag = api_client.get(endpoint).headers["ETag"]
+
+        response = api_client.get(endpoint, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_recipe_create_changes_etag(self, api_client, cleanup_test_recipes, sample_recipe_data):
+        """Creating a recipe invalidates the catalog ETag"""
+        etag = api_client.get("/recipes").headers["ETag"]
+
+        create_response = api_client.post("/recipes", json=sample_recipe_data)
+        cleanup_test_recipes(create_response.json()["id"])
+
+        response = api_client.get("/recipes", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_diary_update_changes_etag(self, api_client, cleanup_test_diary_entries, sample_diary_entry_data):
+        """Updating a diary entry invalidates the diary ETag of that user"""
+        create_response = api_client.post("/diary", json=sample_diary_entry_data)
+        entry_id = create_response.json()["id"]
+        cleanup_test_diary_entries.append(entry_id)
+
+        endpoint = f"/diary?user_id={sample_diary_entry_data['user_id']}"
+        etag = api_client.get(endpoint).headers["ETag"]
+
+        api_client.put(f"/diary/{entry_id}", json={"notes": "Geändert für ETag-Test"})
+
+        response = api_client.get(endpoint, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -9,6 +9,7 @@ Tests:
 - Update Diary Entry (PUT /api/diary/<id>)
 - Delete Diary Entry (DELETE /api/diary/<id>)
 - List Diary Entries (GET /api/diary)
+- Bulk Create (POST /api/diary/bulk)
 """
 import pytest
 
@@ -224,3 +225,27 @@ class TestDiarySearch:
         # Should find our entry
         found = any(entry["id"] == entry_id for entry in data)
         assert found, f"Diary entry {entry_id} not found in search results"
+
+
+class TestDiaryBulk:
+    """Test POST /api/diary/bulk"""
+
+    def test_bulk_create_with_per_item_errors(self, api_client, cleanup_test_diary_entries, sample_diary_entry_data):
+        """Valid entries are created in order, invalid ones reported by index"""
+        response = api_client.post("/diary/bulk", json={"entries": [
+            sample_diary_entry_data,
+            {**sample_diary_entry_data, "date": "kein Datum"},
+            {**sample_diary_entry_data, "recipe_id": 999999},
+            {**sample_diary_entry_data, "dish_name": "Test Gericht Bulk 2"},
+        ]})
+
+        assert response.status_code == 207
+        data = response.json()
+        cleanup_test_diary_entries.extend(item["id"] for item in data["created"])
+
+        assert [item["index"] for item in data["created"]] == [0, 3]
+        assert [error["index"] for error in data["errors"]] == [1, 2]
+
+        entry = api_client.get(f"/diary/{data['created'][1]['id']}").json()
+        assert entry["dish_name"] == "Test Gericht Bulk 2"
+        assert entry["date"] == sample_diary_entry_data["date"]
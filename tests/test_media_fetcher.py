@@ -0,0 +1,253 @@
+"""
+Media Fetch Stage Tests (media_fetcher.py)
+
+Tests:
+- process_image: magic bytes, resize to MEDIA_MAX_IMAGE_SIZE, GIFs untouched
+- download_image: size limit and transient/permanent error classification
+- Status transitions against the test database:
+  pending -> fetching -> ready / failed, released for a retry, claims of
+  abandoned images
+
+The download is replaced by a stub - no network needed. The transition
+tests bind media_fetcher to a minimal Flask app on the test database
+(same connection settings as test_query_plans.py).
+"""
+import os
+import queue
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+import requests
+from flask import Flask
+
+import media_fetcher
+from media_fetcher import MediaError, process_image, download_image
+from config import MEDIA_MAX_IMAGE_BYTES, MEDIA_MAX_IMAGE_SIZE
+from models import db, Recipe, User
+
+Image = pytest.importorskip("PIL.Image")
+
+IMAGE_URL = "https://images.example/test.jpg"
+
+
+def make_image(size, image_format):
+    output = BytesIO()
+    Image.new("RGB", size, (200, 80, 40)).save(output, image_format)
+    return output.getvalue()
+
+
+class FakeResponse:
+    """Just enough of requests.Response for download_image"""
+
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+@pytest.mark.unit
+class TestProcessImage:
+    """Validation and resizing of downloaded bytes"""
+
+    def test_rejects_non_images(self):
+        with pytest.raises(MediaError) as error:
+            process_image(b"<html>Not found</html>")
+        assert error.value.transient is False
+
+    def test_rejects_truncated_image(self):
+        with pytest.raises(MediaError):
+            process_image(make_image((50, 50), "PNG")[:40])
+
+    def test_small_image_unchanged(self):
+        data = make_image((100, 60), "JPEG")
+
+        assert process_image(data) == (data, "jpg")
+
+    def test_large_image_resized(self):
+        data, ext = process_image(make_image((MEDIA_MAX_IMAGE_SIZE * 2, 100), "PNG"))
+
+        assert ext == "png"
+        with Image.open(BytesIO(data)) as image:
+            assert max(image.size) == MEDIA_MAX_IMAGE_SIZE
+
+    def test_gif_kept_as_is(self):
+        data = make_image((MEDIA_MAX_IMAGE_SIZE * 2, 10), "GIF")
+
+        assert process_image(data) == (data, "gif")
+
+
+@pytest.mark.unit
+class TestDownloadErrors:
+    """Which failures are worth a retry"""
+
+    @pytest.mark.parametrize("status_code, transient", [
+        (404, False), (403, False), (408, True), (429, True), (500, True), (503, True),
+    ])
+    def test_http_status_classification(self, monkeypatch, status_code, transient):
+        monkeypatch.setattr(media_fetcher.requests, "get", lambda *a, **kw: FakeResponse(status_code))
+
+        with pytest.raises(MediaError) as error:
+            download_image(IMAGE_URL)
+        assert error.value.transient is transient
+
+    def test_connection_error_is_transient(self, monkeypatch):
+        def refuse(*args, **kwargs):
+            raise requests.ConnectionError("connection refused")
+        monkeypatch.setattr(media_fetcher.requests, "get", refuse)
+
+        with pytest.raises(MediaError) as error:
+            download_image(IMAGE_URL)
+        assert error.value.transient is True
+
+    def test_declared_size_over_limit(self, monkeypatch):
+        response = FakeResponse(headers={"Content-Length": str(MEDIA_MAX_IMAGE_BYTES + 1)})
+        monkeypatch.setattr(media_fetcher.requests, "get", lambda *a, **kw: response)
+
+        with pytest.raises(MediaError) as error:
+            download_image(IMAGE_URL)
+        assert error.value.transient is False
+
+    def test_streamed_size_over_limit(self, monkeypatch):
+        # No Content-Length: the limit applies while reading
+        response = FakeResponse(body=b"\xff\xd8\xff" + b"0" * MEDIA_MAX_IMAGE_BYTES)
+        monkeypatch.setattr(media_fetcher.requests, "get", lambda *a, **kw: response)
+
+        with pytest.raises(MediaError) as error:
+            download_image(IMAGE_URL)
+        assert error.value.transient is False
+
+
+@pytest.fixture(scope="module")
+def fetcher_app():
+    """media_fetcher bound to a minimal app on the test database"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://{}:{}@{}/{}".format(
+        os.getenv("POSTGRES_USER", "postgres"),
+        os.getenv("POSTGRES_PASSWORD", "test"),
+        os.getenv("POSTGRES_HOST", "seaser-postgres-test"),
+        os.getenv("POSTGRES_DB", "rezepte_test"),
+    )
+    db.init_app(app)
+    previous_app = media_fetcher._app
+    media_fetcher._app = app
+    yield app
+    media_fetcher._app = previous_app
+
+
+@pytest.fixture
+def pending_recipe(fetcher_app):
+    """A committed recipe waiting for its image (deleted afterwards)"""
+    with fetcher_app.app_context():
+        recipe = Recipe(title="Test Rezept pytest Bild", user_id=db.session.query(db.func.min(User.id)).scalar(),
+                        **media_fetcher.pending_image(IMAGE_URL))
+        db.session.add(recipe)
+        db.session.commit()
+        recipe_id = recipe.id
+
+    def state():
+        with fetcher_app.app_context():
+            recipe = db.session.get(Recipe, recipe_id)
+            return recipe.image_status, recipe.image_attempts, recipe.image
+
+    yield recipe_id, state
+
+    with fetcher_app.app_context():
+        db.session.execute(db.delete(Recipe).where(Recipe.id == recipe_id))
+        db.session.commit()
+
+
+def stub_download(monkeypatch, outcome):
+    """download_image returning a file name or raising outcome"""
+    def download(image_url):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    monkeypatch.setattr(media_fetcher, "download_image", download)
+
+
+@pytest.mark.integration
+class TestImageStatusTransitions:
+    """pending -> fetching -> ready / failed"""
+
+    def test_success_attaches_image(self, monkeypatch, pending_recipe):
+        recipe_id, state = pending_recipe
+        stub_download(monkeypatch, "stub.jpg")
+
+        media_fetcher._fetch(recipe_id, IMAGE_URL, 1)
+
+        assert state() == ("ready", 1, "stub.jpg")
+
+    def test_permanent_error_fails(self, monkeypatch, pending_recipe):
+        recipe_id, state = pending_recipe
+        stub_download(monkeypatch, MediaError("HTTP 404"))
+
+        media_fetcher._fetch(recipe_id, IMAGE_URL, 1)
+
+        assert state() == ("failed", 1, None)
+
+    def test_transient_error_releases_for_retry(self, monkeypatch, pending_recipe):
+        recipe_id, state = pending_recipe
+        stub_download(monkeypatch, MediaError("HTTP 503", transient=True))
+        retries = []
+
+        class NoTimer:
+            def __init__(self, delay, func, args):
+                retries.append((delay, args))
+                self.daemon = False
+
+            def start(self):
+                pass
+        monkeypatch.setattr(media_fetcher.threading, "Timer", NoTimer)
+
+        media_fetcher._fetch(recipe_id, IMAGE_URL, 1)
+
+        assert state() == ("pending", 1, None)
+        assert retries == [(media_fetcher.MEDIA_FETCH_BACKOFF_SECONDS, (recipe_id, IMAGE_URL, 2))]
+
+    def test_last_attempt_fails(self, monkeypatch, pending_recipe):
+        recipe_id, state = pending_recipe
+        stub_download(monkeypatch, MediaError("timeout", transient=True))
+        attempts = media_fetcher.MEDIA_FETCH_MAX_ATTEMPTS
+
+        media_fetcher._fetch(recipe_id, IMAGE_URL, attempts)
+
+        assert state() == ("failed", attempts, None)
+
+    def test_claimed_image_is_not_fetched_twice(self, monkeypatch, pending_recipe):
+        recipe_id, state = pending_recipe
+        assert media_fetcher._update_image(recipe_id, "pending", image_status="fetching")
+
+        def must_not_download(image_url):
+            raise AssertionError("downloaded an image claimed by another process")
+        monkeypatch.setattr(media_fetcher, "download_image", must_not_download)
+
+        media_fetcher._fetch(recipe_id, IMAGE_URL, 1)
+
+        assert state() == ("fetching", 0, None)
+
+    def test_abandoned_images_claimed_once(self, monkeypatch, fetcher_app, pending_recipe):
+        recipe_id, state = pending_recipe
+        monkeypatch.setattr(media_fetcher, "_queue", queue.Queue())
+        with fetcher_app.app_context():
+            db.session.execute(db.update(Recipe).where(Recipe.id == recipe_id).values(
+                updated_at=datetime.utcnow() - timedelta(seconds=media_fetcher.CLAIM_TIMEOUT_SECONDS + 60)
+            ))
+            db.session.commit()
+
+        media_fetcher._resume_abandoned()
+        media_fetcher._resume_abandoned()
+
+        claimed = [media_fetcher._queue.get_nowait() for _ in range(media_fetcher._queue.qsize())]
+        assert [item for item in claimed if item[0] == recipe_id] == [(recipe_id, IMAGE_URL, 1, True)]
+        assert state()[0] == "fetching"
@@ -0,0 +1,26 @@
+"""
+Tests for the Prometheus endpoint (/metrics)
+
+Tests:
+- Requests show up in per-route counters and latency histograms
+"""
+import pytest
+
+
+@pytest.mark.integration
+class TestMetrics:
+    """Test request instrumentation"""
+
+    def test_route_metrics_exposed(self, api_client, api_base_url):
+        """A recipe list request is counted under its URL rule"""
+        api_client.get("/recipes")
+
+        # /metrics lives outside /api
+        response = api_client.session.get(api_base_url.rsplit("/api", 1)[0] + "/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{endpoint="/api/recipes",method="GET",status="200"}' in body
+        assert "http_request_duration_seconds_bucket" in body
+        assert "http_request_db_queries_sum" in body
@@ -17,7 +17,7 @@ from datetime import datetime
 # When running from host: http://localhost:8001
 import os
 BASE_URL = os.getenv('TEST_BASE_URL', 'http://localhost:80')
-TIMEOUT = 10  # Request timeout
+TIMEOUT = 10  # Seconds the endpoints wait for the import job (?wait=)
 PERFORMANCE_THRESHOLD_SECONDS = 3.0  # Max acceptable time
 
 
@@ -42,9 +42,10 @@ def test_themealdb_import_performance():
         f"{BASE_URL}/api/recipes/daily-import",
         params={
             'strategy': 'by_category',
-            'value': 'Vegetarian'
+            'value': 'Vegetarian',
+            'wait': TIMEOUT
         },
-        timeout=TIMEOUT
+        timeout=TIMEOUT + 5
     )
 
     elapsed_time = time.time() - start_time
@@ -100,9 +101,10 @@ def test_themealdb_import_performance_multiple():
                 f"{BASE_URL}/api/recipes/daily-import",
                 params={
                     'strategy': 'by_category',
-                    'value': category
+                    'value': category,
+                    'wait': TIMEOUT
                 },
-                timeout=TIMEOUT
+                timeout=TIMEOUT + 5
             )
 
             elapsed_time = time.time() - start_time
@@ -165,7 +167,8 @@ def test_migusto_import_performance():
             'preset': 'vegetarische_pasta_familie',
             'max_recipes': 1  # Import only 1 recipe for performance test
         },
-        timeout=TIMEOUT
+        params={'wait': TIMEOUT},
+        timeout=TIMEOUT + 5
     )
 
     elapsed_time = time.time() - start_time
@@ -206,7 +209,8 @@ def test_migusto_import_performance_batch():
             'preset': 'schnelle_familiengerichte',
             'max_recipes': max_recipes
         },
-        timeout=30  # Longer timeout for batch
+        params={'wait': 30},
+        timeout=35  # Longer timeout for batch
     )
 
     elapsed_time = time.time() - start_time
@@ -0,0 +1,155 @@
+"""
+Query Plan Regression Tests
+
+Runs EXPLAIN for the hot queries against a seeded dataset and fails when the
+filtered table is read with a sequential scan (missing/unused index).
+
+- Seed data is inserted inside a transaction that is rolled back afterwards
+- ANALYZE runs inside the same transaction, so the planner sees realistic sizes
+- Only the driving table of each query is checked; small join partners
+  (users, a handful of rows) are legitimately read with a Seq Scan
+
+The queries mirror the SQL the endpoints issue (see app.py / import_workers.py),
+with the same predicates and limits. GET /api/recipes without search returns
+every recipe (no LIMIT), so a Seq Scan is the right plan there and it is not
+checked.
+"""
+
+import os
+from datetime import date, timedelta
+
+import psycopg2
+import pytest
+
+SEED_RECIPES = 20000
+SEED_DIARY_ENTRIES = 20000
+SEED_USERS = 20
+
+
+@pytest.fixture(scope="module")
+def seeded_cursor(verify_container_running):
+    """Cursor in a transaction with seeded recipes/diary entries (rolled back at the end)"""
+    conn = psycopg2.connect(
+        host=os.getenv('POSTGRES_HOST', 'seaser-postgres-test'),
+        database=os.getenv('POSTGRES_DB', 'rezepte_test'),
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'test')
+    )
+    cur = conn.cursor()
+
+    cur.execute("""
+        INSERT INTO users (email, name)
+        SELECT 'plan-test-' || i || '@seaser.local', 'Plan Test ' || i
+        FROM generate_series(1, %s) AS i
+    """, (SEED_USERS,))
+
+    # ~5% old auto-imports (the rest are regular or recent recipes)
+    cur.execute("""
+        INSERT INTO recipes (title, notes, user_id, auto_imported, erstellt_am, created_at, updated_at)
+        SELECT
+            'Plan Rezept ' || i || CASE WHEN i %% 50 = 0 THEN ' Tomate' ELSE '' END,
+            'SCHRITT 1' || chr(10) || 'Schritt ' || i || chr(10) || 'Zutaten:' || chr(10) || '- 100 g Zutat' || (i %% 500),
+            (SELECT min(id) FROM users WHERE email LIKE 'plan-test-%%') + (i %% %s),
+            i %% 20 = 0,
+            now() - (i %% 365) * interval '1 day',
+            now() - (i %% 365) * interval '1 day',
+            now()
+        FROM generate_series(1, %s) AS i
+    """, (SEED_USERS, SEED_RECIPES))
+
+    cur.execute("""
+        INSERT INTO recipe_ingredients (recipe_id, position, quantity, unit, name, raw)
+        SELECT r.id, 0, 100, 'g', 'zutat' || (r.id % 500), '100 g Zutat'
+        FROM recipes r WHERE r.title LIKE 'Plan Rezept %'
+    """)
+
+    cur.execute("""
+        INSERT INTO diary_entries (recipe_id, user_id, date, dish_name, rating, created_at, updated_at)
+        SELECT
+            (SELECT min(id) FROM recipes WHERE title LIKE 'Plan Rezept %%') + (i %% %s),
+            (SELECT min(id) FROM users WHERE email LIKE 'plan-test-%%') + (i %% %s),
+            current_date - (i %% 730),
+            'Plan Gericht ' || i,
+            1 + i %% 5,
+            now(),
+            now()
+        FROM generate_series(1, %s) AS i
+    """, (SEED_RECIPES // 4, SEED_USERS, SEED_DIARY_ENTRIES))
+
+    cur.execute("ANALYZE users, recipes, recipe_ingredients, diary_entries")
+
+    cur.execute("SELECT min(id) FROM users WHERE email LIKE 'plan-test-%'")
+    user_id = cur.fetchone()[0]
+
+    yield cur, user_id
+
+    conn.rollback()
+    cur.close()
+    conn.close()
+
+
+def seq_scanned_relations(cur, sql, params=None):
+    """Relations read with a Seq Scan in the plan of sql"""
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0][0]['Plan']
+
+    relations = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            relations.append(node.get('Relation Name'))
+        nodes.extend(node.get('Plans', []))
+    return relations
+
+
+@pytest.mark.integration
+@pytest.mark.migration
+class TestQueryPlans:
+    """Hot queries must not fall back to sequential scans"""
+
+    def test_diary_list(self, seeded_cursor):
+        """GET /api/diary?user_id=: idx_diary_entries_user_date"""
+        cur, user_id = seeded_cursor
+        relations = seq_scanned_relations(cur, """
+            SELECT diary_entries.id, recipes.title
+            FROM diary_entries LEFT OUTER JOIN recipes ON diary_entries.recipe_id = recipes.id
+            WHERE diary_entries.user_id = %s
+            ORDER BY diary_entries.date DESC, diary_entries.created_at DESC
+        """, (user_id,))
+        assert 'diary_entries' not in relations
+
+    def test_cleanup_old_imports(self, seeded_cursor):
+        """Cleanup batch: partial index idx_recipes_auto_imported_erstellt_am"""
+        cur, _ = seeded_cursor
+        # Default cutoff and batch size of cleanup_old_imports_worker
+        cutoff_date = date.today() - timedelta(days=7)
+        relations = seq_scanned_relations(cur, """
+            SELECT recipes.id FROM recipes
+            WHERE recipes.auto_imported = true
+              AND recipes.erstellt_am < %s
+              AND NOT EXISTS (SELECT 1 FROM diary_entries WHERE diary_entries.recipe_id = recipes.id)
+            ORDER BY recipes.id
+            LIMIT 200
+            FOR UPDATE SKIP LOCKED
+        """, (cutoff_date,))
+        assert 'recipes' not in relations
+
+    def test_recipe_search(self, seeded_cursor):
+        """GET /api/recipes?search=: trigram indexes on title/notes"""
+        cur, _ = seeded_cursor
+        relations = seq_scanned_relations(cur, """
+            SELECT recipes.id FROM recipes
+            WHERE recipes.title ILIKE %s OR recipes.notes ILIKE %s
+            ORDER BY recipes.created_at DESC
+        """, ('%Tomate%', '%Tomate%'))
+        assert 'recipes' not in relations
+
+    def test_recipes_by_ingredients(self, seeded_cursor):
+        """GET /api/recipes/by-ingredients: idx_recipe_ingredients_name_recipe"""
+        cur, _ = seeded_cursor
+        relations = seq_scanned_relations(cur, """
+            SELECT recipe_id FROM recipe_ingredients
+            WHERE name IN ('zutat1', 'zutat2', 'zutat3')
+        """)
+        assert 'recipe_ingredients' not in relations
@@ -8,6 +8,7 @@ Tests:
 - Delete Recipe (DELETE /api/recipes/<id>)
 - List Recipes (GET /api/recipes)
 - Search Recipes (GET /api/recipes/search)
+- Bulk Create (POST /api/recipes/bulk)
 """
 import pytest
 
@@ -230,3 +231,126 @@ class TestRecipeParser:
         assert "SCHRITT 1" in data["notes"]
         assert "SCHRITT 2" in data["notes"]
         assert "Zutaten:" in data["notes"]
+
+    def test_recipe_notes_parsed_on_write(self, api_client, cleanup_test_recipes, sample_recipe_data):
+        """Test notes are parsed into steps/ingredients/metadata when saved"""
+        test_data = sample_recipe_data.copy()
+        test_data["title"] = "Parser Test Rezept"
+        test_data["notes"] = "SCHRITT 1\n\nMehl und Salz mischen.\n\nSCHRITT 2\n\nWasser hinzufügen.\n\nZutaten:\n- 500g Mehl\n- 2 TL Salz\n\n🌍 Quelle: TheMealDB"
+
+        create_response = api_client.post("/recipes", json=test_data)
+        recipe_id = create_response.json()["id"]
+        cleanup_test_recipes(recipe_id)
+
+        data = api_client.get(f"/recipes/{recipe_id}").json()
+
+        assert data["steps"] == ["Mehl und Salz mischen.", "Wasser hinzufügen."]
+        assert data["ingredients"] == ["500g Mehl", "2 TL Salz"]
+        assert data["metadata"]["source"] == "TheMealDB"
+
+    def test_recipe_summary_view_omits_notes(self, api_client):
+        """Test ?view=summary returns the catalog without notes"""
+        response = api_client.get("/recipes?view=summary")
+
+        assert response.status_code == 200
+        for recipe in response.json():
+            assert "notes" not in recipe
+            assert "metadata" in recipe
+
+
+@pytest.mark.integration
+class TestRecipesByIngredients:
+    """Test "what can I cook" ranking by ingredients"""
+
+    def test_rank_by_ingredient_coverage(self, api_client, cleanup_test_recipes, sample_recipe_data):
+        """Recipes using more of the given ingredients rank first"""
+        recipes = {
+            "Zutaten Test Voll": ["250 g Testmehl", "3 Testeier", "500 ml Testmilch"],
+            "Zutaten Test Halb": ["500g Testmehl", "300ml Wasser"],
+        }
+        for title, ingredients in recipes.items():
+            test_data = sample_recipe_data.copy()
+            test_data["title"] = title
+            test_data["notes"] = "Zutaten:\n" + "\n".join(f"- {line}" for line in ingredients)
+            cleanup_test_recipes(api_client.post("/recipes", json=test_data).json()["id"])
+
+        response = api_client.get("/recipes/by-ingredients?ingredients=Testmehl,Testeier,Testmilch")
+
+        assert response.status_code == 200
+        data = response.json()
+        titles = [recipe["title"] for recipe in data]
+        assert titles.index("Zutaten Test Voll") < titles.index("Zutaten Test Halb")
+        assert data[0]["matched_ingredients"] == ["testeier", "testmehl", "testmilch"]
+        assert data[0]["coverage"] == 1.0
+
+    def test_ingredients_required(self, api_client):
+        """Missing ingredients parameter returns 400"""
+        response = api_client.get("/recipes/by-ingredients")
+
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestCleanupOldImports:
+    """Test batched cleanup of old auto-imported recipes"""
+
+    def test_cleanup_dry_run_returns_counts(self, api_client):
+        """dry_run only counts and deletes nothing"""
+        before = api_client.get("/stats").json()["total_recipes"]
+
+        response = api_client.post("/recipes/cleanup-old-imports", json={"dry_run": True})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dry_run"] is True
+        assert data["would_delete"] >= 0
+        assert api_client.get("/stats").json()["total_recipes"] == before
+
+    def test_cleanup_runs_as_job(self, api_client):
+        """Cleanup returns a pollable job"""
+        response = api_client.post("/recipes/cleanup-old-imports", json={"days": 36500})
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert api_client.get(f"/jobs/{job_id}").status_code == 200
+
+    def test_cleanup_rejects_invalid_numbers(self, api_client):
+        """Non-numeric days/batch_size are a client error, not a 500"""
+        for body in ({"days": "abc"}, {"batch_size": "ten"}, {"days": -1}):
+            response = api_client.post("/recipes/cleanup-old-imports", json=body)
+
+            assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestRecipesBulk:
+    """Test POST /api/recipes/bulk"""
+
+    def test_bulk_create_with_per_item_errors(self, api_client, cleanup_test_recipes, sample_recipe_data):
+        """Valid items are created in order, invalid ones reported by index"""
+        response = api_client.post("/recipes/bulk", json={"recipes": [
+            sample_recipe_data,
+            {"title": "", "user_id": 1},
+            {**sample_recipe_data, "user_id": 999999},
+            {**sample_recipe_data, "title": "Test Rezept pytest Bulk 2"},
+        ]})
+
+        assert response.status_code == 207
+        data = response.json()
+        for item in data["created"]:
+            cleanup_test_recipes(item["id"])
+
+        assert [item["index"] for item in data["created"]] == [0, 3]
+        assert [(error["index"], error["error"]) for error in data["errors"]] == [
+            (1, "title is required"), (2, "User not found")
+        ]
+
+        # Parsed notes / ingredients are filled despite the bulk INSERT
+        recipe = api_client.get(f"/recipes/{data['created'][0]['id']}").json()
+        assert recipe["ingredients"] == ["500g Mehl", "2 TL Salz"]
+
+    def test_bulk_create_empty_list(self, api_client):
+        """Empty payload returns 400"""
+        response = api_client.post("/recipes/bulk", json={"recipes": []})
+
+        assert response.status_code == 400
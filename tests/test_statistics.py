@@ -0,0 +1,88 @@
+"""
+Tests for precomputed statistics (/api/stats)
+
+Tests:
+- Recipe counters follow creates and deletes
+- Diary entries update cook count and average rating of the linked recipe
+- Diary entries are counted per month
+"""
+import pytest
+
+
+@pytest.mark.integration
+class TestStatistics:
+    """Test trigger-maintained statistics"""
+
+    def test_recipe_counters_follow_writes(self, api_client, sample_recipe_data):
+        """Creating and deleting a recipe changes total_recipes by one"""
+        before = api_client.get("/stats").json()["total_recipes"]
+
+        recipe_id = api_client.post("/recipes", json=sample_recipe_data).json()["id"]
+        assert api_client.get("/stats").json()["total_recipes"] == before + 1
+
+        api_client.delete(f"/recipes/{recipe_id}?user_id={sample_recipe_data['user_id']}")
+        assert api_client.get("/stats").json()["total_recipes"] == before
+
+    def test_diary_entries_update_recipe_aggregates(self, api_client, cleanup_test_recipes,
+                                                     cleanup_test_diary_entries, sample_recipe_data,
+                                                     sample_diary_entry_data):
+        """Cooking a recipe twice with ratings 5 and 4 shows up in most_cooked"""
+        recipe_id = api_client.post("/recipes", json=sample_recipe_data).json()["id"]
+        cleanup_test_recipes(recipe_id)
+
+        for rating in (5, 4, 5):
+            entry = dict(sample_diary_entry_data, recipe_id=recipe_id, rating=rating)
+            cleanup_test_diary_entries.append(api_client.post("/diary", json=entry).json()["id"])
+        api_client.delete(f"/diary/{cleanup_test_diary_entries.pop()}")
+
+        stats = api_client.get("/stats").json()
+        cooked = {recipe["recipe_id"]: recipe for recipe in stats["most_cooked"]}
+
+        assert cooked[recipe_id]["cook_count"] == 2
+        assert cooked[recipe_id]["avg_rating"] == 4.5
+
+    def test_diary_entries_per_month(self, api_client, cleanup_test_diary_entries, sample_diary_entry_data):
+        """A new diary entry is counted in its month"""
+        month = sample_diary_entry_data["date"][:7]
+        before = api_client.get("/stats").json()["diary_entries_per_month"].get(month, 0)
+
+        cleanup_test_diary_entries.append(api_client.post("/diary", json=sample_diary_entry_data).json()["id"])
+
+        assert api_client.get("/stats").json()["diary_entries_per_month"][month] == before + 1
+
+
+@pytest.mark.integration
+class TestRecipeSorting:
+    """Test ?sort= on the recipe list (backed by recipe_stats)"""
+
+    def test_sort_most_cooked(self, api_client, cleanup_test_recipes, cleanup_test_diary_entries,
+                              sample_recipe_data, sample_diary_entry_data):
+        """A freshly cooked recipe is listed before a never cooked one, with aggregates"""
+        cooked_id = api_client.post("/recipes", json=sample_recipe_data).json()["id"]
+        uncooked_id = api_client.post("/recipes", json=sample_recipe_data).json()["id"]
+        cleanup_test_recipes(cooked_id)
+        cleanup_test_recipes(uncooked_id)
+
+        entry = dict(sample_diary_entry_data, recipe_id=cooked_id, rating=5)
+        cleanup_test_diary_entries.append(api_client.post("/diary", json=entry).json()["id"])
+
+        response = api_client.get("/recipes?view=summary&sort=most_cooked")
+        assert response.status_code == 200
+
+        recipes = response.json()
+        ids = [recipe["id"] for recipe in recipes]
+        assert ids.index(cooked_id) < ids.index(uncooked_id)
+
+        cooked = recipes[ids.index(cooked_id)]
+        assert cooked["cook_count"] == 1
+        assert cooked["avg_rating"] == 5
+        assert cooked["last_cooked"] == sample_diary_entry_data["date"]
+
+    @pytest.mark.parametrize("sort", ["most_cooked", "top_rated", "recently_cooked"])
+    def test_sort_options(self, api_client, sort):
+        """All sort options are accepted"""
+        assert api_client.get(f"/recipes?sort={sort}").status_code == 200
+
+    def test_invalid_sort_rejected(self, api_client):
+        """Unknown sort option returns 400"""
+        assert api_client.get("/recipes?sort=random").status_code == 400
@@ -0,0 +1,274 @@
+"""
+TheMealDB + DeepL helpers for the daily import
+
+Request building and response handling are plain functions, so the sync
+import (requests, app.py) and the async one (httpx, asgi.py) share them:
+
+    url = strategy_url(strategy, value)          -> GET, then
+    meal, lookup_url = pick_meal(data)           -> GET lookup_url if needed
+    texts = translation_texts(meal)
+    form, positions = deepl_form(texts)          -> POST DEEPL_API_URL, then
+    translations = merge_translations(texts, positions, result)
+    title_de, notes = build_notes(meal, translations)
+"""
+
+import os
+import random
+import re
+
+import requests
+
+from config_registry import get_config
+
+DEEPL_API_KEY = os.getenv('DEEPL_API_KEY', '')
+DEEPL_API_URL = 'https://api-free.deepl.com/v2/translate'
+
+MEAT_CATEGORIES = ['Beef', 'Chicken', 'Lamb', 'Pork', 'Goat', 'Seafood']
+
+
+# ============================================================================
+# TheMealDB
+# ============================================================================
+
+def strategy_url(strategy='random', value=None):
+    """
+    API URL for an import strategy
+
+    Args:
+        strategy: Import strategy (random, by_category, by_area, by_ingredient, etc.)
+        value: Value for the strategy filter (e.g., "Italian" for by_area)
+
+    Returns:
+        str: TheMealDB URL or None if the strategy needs a value and has none
+    """
+    config = get_config('themealdb')
+    api_base = config['api_base_url']
+
+    # Get strategy config
+    strategies = config['strategies']
+    strategy_config = strategies.get(strategy)
+
+    if not strategy_config:
+        print(f"Warning: Unknown strategy '{strategy}', falling back to random")
+        strategy = 'random'
+        strategy_config = strategies.get('random', {
+            'endpoint': 'random.php',
+            'requires_parameter': False
+        })
+
+    endpoint = strategy_config.get('endpoint')
+    requires_param = strategy_config.get('requires_parameter', False)
+
+    # Build URL
+    url = f"{api_base}/{endpoint}"
+
+    if requires_param:
+        param_key = strategy_config.get('parameter_key')
+
+        # If no value provided, use default or random from available values
+        if not value:
+            default_values = strategy_config.get('default_values', [])
+            available_values = strategy_config.get('available_values', [])
+
+            if default_values:
+                value = random.choice(default_values)
+            elif available_values:
+                value = random.choice(available_values)
+            else:
+                print(f"Error: Strategy '{strategy}' requires a value but none provided")
+                return None
+
+        url = f"{url}?{param_key}={value}"
+        print(f"🔍 TheMealDB Import: strategy={strategy}, {param_key}={value}")
+    else:
+        print(f"🔍 TheMealDB Import: strategy={strategy}")
+
+    return url
+
+
+def pick_meal(data):
+    """
+    (meal, None) for full results, (None, lookup_url) for filter.php results,
+    (None, None) if nothing was found
+    """
+    if not data.get('meals'):
+        return None, None
+
+    meals = data['meals']
+
+    # Already have full recipe (from random.php or search.php)
+    if 'strInstructions' in meals[0]:
+        return meals[0], None
+
+    # Abbreviated results (from filter.php) - pick one and fetch full details
+    meal_id = random.choice(meals)['idMeal']
+    print(f"📖 Fetching full recipe details for ID {meal_id}")
+    api_base = get_config('themealdb')['api_base_url']
+    return None, f"{api_base}/lookup.php?i={meal_id}"
+
+
+def rejected_category(meal):
+    """Category if the meal contains meat/seafood (only vegetarian imports allowed)"""
+    category = meal.get('strCategory', '')
+    return category if category in MEAT_CATEGORIES else None
+
+
+def fetch_recipe_from_themealdb(strategy='random', value=None):
+    """
+    Fetch recipe from TheMealDB using specified strategy
+
+    Returns:
+        dict: Recipe data from TheMealDB or None if error
+    """
+    url = strategy_url(strategy, value)
+    if not url:
+        return None
+
+    try:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        meal, lookup_url = pick_meal(response.json())
+
+        if lookup_url:
+            detail_response = requests.get(lookup_url, timeout=10)
+            detail_response.raise_for_status()
+            meal, _ = pick_meal(detail_response.json())
+
+        if not meal:
+            print(f"No recipes found for {strategy}={value}")
+        return meal
+
+    except Exception as e:
+        print(f"Error fetching from TheMealDB: {e}")
+        return None
+
+
+# ============================================================================
+# DeepL
+# ============================================================================
+
+def translation_texts(meal):
+    """[title, instructions, ingredient1, ingredient2, ...] in English"""
+    ingredients_en = []
+    for i in range(1, 21):
+        ingredient = (meal.get(f'strIngredient{i}') or '').strip()
+        measure = (meal.get(f'strMeasure{i}') or '').strip()
+        if ingredient:
+            ingredients_en.append(f"{measure} {ingredient}".strip())
+
+    return [meal.get('strMeal', 'Imported Recipe'), meal.get('strInstructions', '')] + ingredients_en
+
+
+def deepl_form(texts):
+    """
+    Form data for one batch DeepL request - DeepL accepts multiple 'text' parameters
+
+    Returns:
+        (form, positions): positions of the non-empty texts, (None, None) if nothing to translate
+    """
+    positions = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not DEEPL_API_KEY or not positions:
+        return None, None
+
+    form = {
+        'auth_key': DEEPL_API_KEY,
+        'source_lang': 'EN',
+        'target_lang': 'DE',
+        'text': [texts[i] for i in positions],
+    }
+    return form, positions
+
+
+def merge_translations(texts, positions, result):
+    """Put translations back at their original positions (originals on mismatch)"""
+    translations = result.get('translations') if isinstance(result, dict) else None
+    if not translations or len(translations) != len(positions):
+        print(f"DeepL batch translation failed: {result}")
+        return list(texts)
+
+    translated = list(texts)
+    for position, translation in zip(positions, translations):
+        translated[position] = translation['text']
+    return translated
+
+
+def translate_to_german(text):
+    """Translate text from English to German using DeepL API (single text)"""
+    return translate_batch_to_german([text])[0] if text else text
+
+
+def translate_batch_to_german(texts):
+    """
+    Translate multiple texts in one DeepL API call (OPTIMIZED)
+
+    Args:
+        texts: List of strings to translate
+
+    Returns:
+        List of translated strings (same order as input)
+        Falls back to original texts on error
+    """
+    if not DEEPL_API_KEY:
+        print("Warning: No DeepL API key configured, skipping translation")
+        return list(texts)
+
+    form, positions = deepl_form(texts)
+    if form is None:
+        return list(texts)
+
+    try:
+        # Batch translation with longer timeout (more data)
+        response = requests.post(DEEPL_API_URL, data=form, timeout=30)
+        response.raise_for_status()
+        return merge_translations(texts, positions, response.json())
+
+    except Exception as e:
+        print(f"DeepL batch translation error: {e}")
+        return list(texts)  # Fallback to original
+
+
+# ============================================================================
+# Recipe notes
+# ============================================================================
+
+def build_notes(meal, translations):
+    """
+    German title and notes in the SCHRITT format (see notes_parser.py)
+
+    Args:
+        meal: TheMealDB meal
+        translations: translation_texts(meal), translated
+
+    Returns:
+        (translated_title, notes)
+    """
+    original_title = meal.get('strMeal', 'Imported Recipe')
+    translated_title = translations[0]
+    translated_instructions = translations[1] or ''
+    ingredients_de = translations[2:]
+
+    instruction_text = translated_instructions.replace('\r\n', '\n').strip()
+
+    # Check if already formatted (contains "SCHRITT X" or "Step X")
+    if re.search(r'(SCHRITT\s+\d+|Step\s+\d+)', instruction_text, re.IGNORECASE):
+        formatted_instructions = instruction_text
+    else:
+        # Not formatted - split by newlines and add SCHRITT markers
+        lines = [line.strip() for line in instruction_text.split('\n') if line.strip()]
+        formatted_instructions = "\n\n".join(
+            f"SCHRITT {step_num}\n\n{line}" for step_num, line in enumerate(lines, 1)
+        )
+
+    notes = formatted_instructions + "\n\n"
+    if ingredients_de:
+        notes += "Zutaten:\n" + "\n".join(f"- {ing}" for ing in ingredients_de)
+
+    # Add source info (bilingual)
+    notes += f"\n\n─────────────────────────"
+    notes += f"\n🌍 Quelle: TheMealDB"
+    notes += f"\n📖 Original: {original_title}"
+    notes += f"\n🏷️ Kategorie: {meal.get('strCategory', '')}"
+    notes += f"\n🌎 Region: {meal.get('strArea', 'N/A')}"
+    notes += f"\n🤖 Übersetzt mit DeepL"
+
+    return translated_title, notes